@@ -1,23 +1,28 @@
-import iolib, datasets, tools
+import tools
 from tools.tools import add_constant, categorical
+from tools.lazyimport import LazyModule
 import regression
-from .regression.linear_model import OLS, GLS, WLS, GLSAR
+from .regression.linear_model import OLS, GLS, WLS, GLSAR, MultiOLS
 from .genmod.generalized_linear_model import GLM
 from .genmod import families
 import robust
 from .robust.robust_linear_model import RLM
 from .discrete.discrete_model import Poisson, Logit, Probit, MNLogit
-from .tsa import api as tsa
-from .nonparametric import api as nonparametric
-import distributions
 from __init__ import test
 from . import version
 from info import __doc__
 from graphics.gofplots import qqplot, qqplot_2samples, qqline, ProbPlot
-from .graphics import api as graphics
-from .stats import api as stats
-from .emplike import api as emplike
 
+# namespaces that are not needed by the models above are imported on first
+# attribute access, see examples/ex_import_timing.py
+iolib = LazyModule('statsmodels.iolib')
+datasets = LazyModule('statsmodels.datasets')
+tsa = LazyModule('statsmodels.tsa.api')
+nonparametric = LazyModule('statsmodels.nonparametric.api')
+distributions = LazyModule('statsmodels.distributions')
+graphics = LazyModule('statsmodels.graphics.api')
+stats = LazyModule('statsmodels.stats.api')
+emplike = LazyModule('statsmodels.emplike.api')
 
 import os
 
@@ -4,6 +4,7 @@ results, and doing data cleaning
 """
 
 import numpy as np
+from scipy import sparse
 from pandas import DataFrame, Series, TimeSeries, isnull
 from statsmodels.tools.decorators import (resettable_cache,
                 cache_readonly, cache_writable)
@@ -57,6 +58,9 @@ class ModelData(object):
     appropriate form
     """
     def __init__(self, endog, exog=None, missing='none', **kwargs):
+        if missing != 'none' and sparse.issparse(exog):
+            raise NotImplementedError("missing='%s' is not available for "
+                                      "sparse exog" % missing)
         if missing != 'none':
             arrays, nan_idx = self._handle_missing(endog, exog, missing,
                                                        **kwargs)
@@ -216,11 +220,14 @@ class ModelData(object):
     def _get_xarr(self, exog):
         if data_util._is_structured_ndarray(exog):
             exog = data_util.struct_to_ndarray(exog)
+        if sparse.issparse(exog):
+            # keep it sparse, rows are sliced and scaled in CSR format
+            return sparse.csr_matrix(exog, dtype=np.float64)
         return np.asarray(exog)
 
     def _check_integrity(self):
         if self.exog is not None:
-            if len(self.exog) != len(self.endog):
+            if self.exog.shape[0] != len(self.endog):
                 raise ValueError("endog and exog matrices are different sizes")
 
     def wrap_output(self, obj, how='columns'):
@@ -333,7 +340,11 @@ def _make_endog_names(endog):
     return ynames
 
 def _make_exog_names(exog):
-    exog_var = exog.var(0)
+    if sparse.issparse(exog):
+        exog_var = np.asarray(exog.multiply(exog).mean(0) -
+                              np.square(exog.mean(0))).ravel()
+    else:
+        exog_var = exog.var(0)
     if (exog_var == 0).any():
         # assumes one constant in first or last position
         # avoid exception if more than one constant
@@ -361,6 +372,8 @@ def handle_data(endog, exog, missing='none', **kwargs):
         klass = PandasData
     elif data_util._is_using_patsy(endog, exog):
         klass = PatsyData
+    elif data_util._is_using_sparse(endog, exog):
+        klass = ModelData
     # keep this check last
     elif data_util._is_using_ndarray(endog, exog):
         klass = ModelData
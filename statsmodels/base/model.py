@@ -7,6 +7,7 @@ from statsmodels.tools.decorators import (resettable_cache,
                                                   cache_readonly)
 import statsmodels.base.wrapper as wrap
 from statsmodels.tools.numdiff import approx_fprime
+from statsmodels.tools import sparsetools
 from statsmodels.formula import handle_formula_data
 
 
@@ -324,10 +325,10 @@ class LikelihoodModel(Model):
         elif cov_params_func:
             Hinv = cov_params_func(self, xopt, retvals)
         elif method == 'newton' and full_output:
-            Hinv = np.linalg.inv(-retvals['Hessian']) / nobs
+            Hinv = sparsetools.inv_cross_product(-retvals['Hessian']) / nobs
         else:
             try:
-                Hinv = np.linalg.inv(-1 * self.hessian(xopt))
+                Hinv = sparsetools.inv_cross_product(-1 * self.hessian(xopt))
             except:
                 #might want custom warning ResultsWarning? NumericalWarning?
                 from warnings import warn
@@ -364,8 +365,8 @@ def _fit_mle_newton(f, score, start_params, fargs, kwargs, disp=True,
             oldparams) > tol)):
         H = hess(newparams)
         oldparams = newparams
-        newparams = oldparams - np.dot(np.linalg.inv(H),
-                score(oldparams))
+        # H is sparse if the model has a sparse exog
+        newparams = oldparams - sparsetools.solve(H, score(oldparams))
         if retall:
             history.append(newparams)
         if callback is not None:
@@ -946,7 +947,8 @@ class LikelihoodModelResults(Results):
 
     @cache_readonly
     def bse(self):
-        return np.sqrt(np.diag(self.cov_params()))
+        # diagonal avoids forming an InverseCrossProduct cov_params
+        return np.sqrt(self.cov_params().diagonal())
 
     def t(self, column=None):
         """
@@ -1044,6 +1046,10 @@ class LikelihoodModelResults(Results):
         If no argument is specified returns the covariance matrix of a model
         (scale)*(X.T X)^(-1)
 
+        For a model with a sparse exog this is a
+        statsmodels.tools.sparsetools.InverseCrossProduct, which computes
+        the entries it is indexed with, but not the full inverse.
+
         If contrast is specified it pre and post-multiplies as follows
         (scale) * r_matrix (X.T X)^(-1) r_matrix.T
 
@@ -1093,7 +1099,10 @@ class LikelihoodModelResults(Results):
                 other = r_matrix
             else:
                 other = np.asarray(other)
-            tmp = dot_fun(r_matrix, dot_fun(cov_p, np.transpose(other)))
+            if isinstance(cov_p, sparsetools.InverseCrossProduct):
+                tmp = dot_fun(r_matrix, cov_p.dot(np.transpose(other)))
+            else:
+                tmp = dot_fun(r_matrix, dot_fun(cov_p, np.transpose(other)))
             return tmp
         else:  #if r_matrix is None and column is None:
             return cov_p
@@ -1411,7 +1420,7 @@ class LikelihoodModelResults(Results):
     def llf(self):
         return self.model.loglike(self.params)
 
-    def save(self, fname, remove_data=False):
+    def save(self, fname, remove_data=False, format='pickle'):
         '''
         save a pickle of this instance
 
@@ -1424,6 +1433,12 @@ class LikelihoodModelResults(Results):
             If True, then all arrays with length nobs are set to None before
             pickling. See the remove_data method.
             In some cases not all arrays will be set to None.
+        format : {'pickle', 'compact'}
+            'pickle' (default) pickles the instance. 'compact' stores the
+            parameters, scalar results and the model without its data
+            arrays separately from the other arrays, which are memory-mapped
+            or read when first accessed after loading. See
+            statsmodels.iolib.smresults.
 
         Notes
         -----
@@ -1432,12 +1447,17 @@ class LikelihoodModelResults(Results):
 
         '''
 
-        from statsmodels.iolib.smpickle import save_pickle
-
         if remove_data:
             self.remove_data()
 
-        save_pickle(self, fname)
+        if format == 'compact':
+            from statsmodels.iolib.smresults import save_results
+            save_results(self, fname)
+        elif format == 'pickle':
+            from statsmodels.iolib.smpickle import save_pickle
+            save_pickle(self, fname)
+        else:
+            raise ValueError("format %s not understood" % format)
 
     @classmethod
     def load(cls, fname):
@@ -1448,6 +1468,7 @@ class LikelihoodModelResults(Results):
         ----------
         fname : string or filehandle
             fname can be a string to a file path or filename, or a filehandle.
+            Files in the compact format are recognized.
 
         Returns
         -------
@@ -1455,6 +1476,9 @@ class LikelihoodModelResults(Results):
 
         '''
 
+        from statsmodels.iolib.smresults import is_results_file, load_results
+        if is_results_file(fname):
+            return load_results(fname)
         from statsmodels.iolib.smpickle import load_pickle
         return load_pickle(fname)
 
@@ -1629,6 +1653,9 @@ class ResultMixin(object):
         std : array
             standard deviation of parameter estimates over bootstrap
             replications
+        results : array
+            parameter estimates of all replications, nan for replications
+            that failed
 
         Notes
         -----
@@ -1637,28 +1664,18 @@ class ResultMixin(object):
         original endog and exog, and therefore is only correct if observations
         are independently distributed.
 
-        This will be moved to apply only to models with independently
-        distributed observations.
+        The replications use the estimated params as start_params. See
+        `statsmodels.stats.bootstrap.bootstrap` for other bootstrap methods,
+        confidence intervals and parallel replications.
         '''
-        results = []
-        print self.model.__class__
-        hascloneattr = True if hasattr(self, 'cloneattr') else False
-        for i in xrange(nrep):
-            rvsind = np.random.randint(self.nobs - 1, size=self.nobs)
-            #this needs to set startparam and get other defining attributes
-            #need a clone method on model
-            fitmod = self.model.__class__(self.endog[rvsind],
-                                          self.exog[rvsind, :])
-            if hascloneattr:
-                for attr in self.model.cloneattr:
-                    setattr(fitmod, attr, getattr(self.model, attr))
-
-            fitres = fitmod.fit(method=method, disp=disp)
-            results.append(fitres.params)
-        results = np.array(results)
+        from statsmodels.stats.bootstrap import bootstrap
+        bs = bootstrap(self, nrep=nrep, method='pairs',
+                       seed=np.random.randint(np.iinfo(np.int32).max),
+                       fit_kwds=dict(method=method, disp=disp))
+        results = bs.params
         if store:
             self.bootstrap_results = results
-        return results.mean(0), results.std(0), results
+        return bs.mean, bs.params_valid.std(0), results
 
     def get_nlfun(self, fun):
         #I think this is supposed to get the delta method that is currently
@@ -10,7 +10,8 @@ import pickle, StringIO
 import numpy as np
 import statsmodels.api as sm
 
-from numpy.testing import assert_, assert_almost_equal, assert_equal
+from numpy.testing import (assert_, assert_almost_equal, assert_equal,
+                           assert_raises)
 
 from nose import SkipTest
 import platform
@@ -123,6 +124,70 @@ class RemoveDataPickle(object):
         after = sorted(res_unpickled._cache.keys())
         assert_(before == after, msg='not equal %r and %r' % (before, after))
 
+    def test_save_compact(self):
+        import os, tempfile
+        from statsmodels.iolib import smresults
+        results = self.results
+        pred1 = results.predict(self.xf, **self.predict_kwds)
+        #create some cached attributes
+        results.summary()
+        #containers and strings keep their type
+        extra = {'extra_tuple' : (1, 2.5), 'extra_list' : [1, 'a'],
+                 'extra_dict' : {1 : 'a'}, 'extra_str' : 'abc',
+                 'extra_unicode' : u'abc', 'extra_none' : None}
+        results._results.__dict__.update(extra)
+
+        fd, fname = tempfile.mkstemp(suffix='.smres')
+        os.close(fd)
+        results.save(fname, format='compact')
+        res = results.__class__.load(fname)
+        assert_(type(res) is type(results))
+        assert_(type(res._results) is type(results._results))
+        assert_(res.model.exog is None)
+        assert_(results.model.exog is not None)
+        assert_equal(res.params, results.params)
+        assert_equal(res.cov_params(), results.cov_params())
+        assert_equal(res.predict(self.xf, **self.predict_kwds), pred1)
+        for name, value in extra.iteritems():
+            loaded = getattr(res._results, name)
+            assert_(type(loaded) is type(value), msg=name)
+            assert_equal(loaded, value)
+
+        #cached arrays are only read when they are accessed
+        cache = res._results._cache
+        lazy = cache._lazy.keys()
+        assert_('bse' in lazy)
+        assert_equal(sorted(cache.keys()),
+                     sorted(k for k, v in results._results._cache.items()
+                            if v is not None))
+        for key in lazy:
+            assert_equal(cache[key], results._results._cache[key])
+        assert_(not cache._lazy)
+        assert_equal(res.bse, results.bse)
+
+        #the same from a filehandle
+        fh = open(fname, 'rb')
+        res2 = results.__class__.load(fh)
+        fh.close()
+        assert_equal(res2.bse, results.bse)
+        assert_equal(res2.params, results.params)
+        del res, res2, cache
+        try:
+            os.remove(fname)
+        except (OSError, IOError):
+            pass
+
+        #files from a newer format version are refused
+        from statsmodels.compatnp.py3k import BytesIO
+        fh = BytesIO()
+        smresults.FORMAT_VERSION += 1
+        try:
+            results.save(fh, format='compact')
+        finally:
+            smresults.FORMAT_VERSION -= 1
+        fh.seek(0, 0)
+        assert_raises(ValueError, results.__class__.load, fh)
+
 
 class TestRemoveDataPickleOLS(RemoveDataPickle):
 
@@ -202,3 +267,4 @@ if __name__ == '__main__':
         tt.test_remove_data_pickle()
         tt.test_remove_data_docstring()
         tt.test_pickle_wrapper()
+        tt.test_save_compact()
@@ -48,7 +48,7 @@ class ResultsWrapper(object):
         #print 'unpickling wrapper', dict_
         self.__dict__.update(dict_)
 
-    def save(self, fname, remove_data=False):
+    def save(self, fname, remove_data=False, format='pickle'):
         '''save a pickle of this instance
 
         Parameters
@@ -60,17 +60,28 @@ class ResultsWrapper(object):
             If True, then all arrays with length nobs are set to None before
             pickling. See the remove_data method.
             In some cases not all arrays will be set to None.
+        format : {'pickle', 'compact'}
+            'pickle' (default) pickles the instance. 'compact' uses the
+            format of statsmodels.iolib.smresults.
 
         '''
-        from statsmodels.iolib.smpickle import save_pickle
-
         if remove_data:
             self.remove_data()
 
-        save_pickle(self, fname)
+        if format == 'compact':
+            from statsmodels.iolib.smresults import save_results
+            save_results(self, fname)
+        elif format == 'pickle':
+            from statsmodels.iolib.smpickle import save_pickle
+            save_pickle(self, fname)
+        else:
+            raise ValueError("format %s not understood" % format)
 
     @classmethod
     def load(cls, fname):
+        from statsmodels.iolib.smresults import is_results_file, load_results
+        if is_results_file(fname):
+            return load_results(fname)
         from statsmodels.iolib.smpickle import load_pickle
         return load_pickle(fname)
 
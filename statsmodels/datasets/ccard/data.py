@@ -52,6 +52,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/ccard.csv', 'rb'), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/ccard.csv', delimiter=",",
             names=True, dtype=float)
     return data
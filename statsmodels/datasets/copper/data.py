@@ -57,7 +57,7 @@ def load():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/copper.csv', 'rb'), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/copper.csv', delimiter=",",
                       names=True, dtype=float, usecols=(1,2,3,4,5,6))
     return data
 
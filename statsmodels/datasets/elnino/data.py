@@ -38,6 +38,7 @@ from numpy import recfromtxt, column_stack, array
 from pandas import DataFrame
 
 from statsmodels.tools import Dataset
+from statsmodels.tools import datautils as du
 from os.path import dirname, abspath
 
 
@@ -68,6 +69,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/elnino.csv', 'rb'), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/elnino.csv', delimiter=",",
                       names=True, dtype=float)
     return data
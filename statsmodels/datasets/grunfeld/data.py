@@ -85,6 +85,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/grunfeld.csv','rb'), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/grunfeld.csv', delimiter=",",
             names=True, dtype="f8,f8,f8,a17,f8")
     return data
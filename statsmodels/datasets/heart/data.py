@@ -59,6 +59,6 @@ def load_pandas():
 def _get_data():
     filepath = dirname(abspath(__file__))
     ##### EDIT THE FOLLOWING TO POINT TO DatasetName.csv #####
-    data = np.recfromtxt(open(filepath + '/heart.csv', 'rb'),
+    data = du.cached_recfromtxt(filepath + '/heart.csv',
             delimiter=",", names = True, dtype=float)
     return data
@@ -68,6 +68,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath+'/longley.csv',"rb"), delimiter=",",
+    data = du.cached_recfromtxt(filepath+'/longley.csv', delimiter=",",
                       names=True, dtype=float, usecols=(1,2,3,4,5,6,7))
     return data
@@ -57,6 +57,7 @@ from numpy import recfromtxt, column_stack, array
 from pandas import DataFrame
 
 from statsmodels.tools import Dataset
+from statsmodels.tools import datautils as du
 from os.path import dirname, abspath
 
 def load():
@@ -84,6 +85,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/macrodata.csv', 'rb'), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/macrodata.csv', delimiter=",",
                       names=True, dtype=float)
     return data
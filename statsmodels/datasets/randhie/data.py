@@ -83,5 +83,5 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(PATH, "rb"), delimiter=",", names=True, dtype=float)
+    data = du.cached_recfromtxt(PATH, delimiter=",", names=True, dtype=float)
     return data
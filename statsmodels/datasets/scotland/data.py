@@ -79,6 +79,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = np.recfromtxt(open(filepath + '/scotvote.csv',"rb"), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/scotvote.csv', delimiter=",",
                          names=True, dtype=float, usecols=(1,2,3,4,5,6,7,8))
     return data
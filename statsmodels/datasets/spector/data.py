@@ -62,6 +62,6 @@ def load_pandas():
 def _get_data():
     filepath = dirname(abspath(__file__))
 ##### EDIT THE FOLLOWING TO POINT TO DatasetName.csv #####
-    data = np.recfromtxt(open(filepath + '/spector.csv',"rb"), delimiter=" ",
+    data = du.cached_recfromtxt(filepath + '/spector.csv', delimiter=" ",
                          names=True, dtype=float, usecols=(1,2,3,4))
     return data
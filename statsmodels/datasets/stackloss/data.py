@@ -59,6 +59,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/stackloss.csv',"rb"), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/stackloss.csv', delimiter=",",
             names=True, dtype=float)
     return data
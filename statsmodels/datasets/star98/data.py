@@ -91,7 +91,7 @@ def _get_data():
             "PCTCHRT","PCTYRRND","PERMINTE_AVYRSEXP","PERMINTE_AVSAL",
             "AVYRSEXP_AVSAL","PERSPEN_PTRATIO","PERSPEN_PCTAF","PTRATIO_PCTAF",
             "PERMINTE_AVYRSEXP_AVSAL","PERSPEN_PTRATIO_PCTAF"]
-    data = recfromtxt(open(filepath + '/star98.csv',"rb"), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/star98.csv', delimiter=",",
             names=names, skip_header=1, dtype=float)
 
     # careful now
@@ -80,6 +80,6 @@ def load_pandas():
 def _get_data():
     filepath = dirname(abspath(__file__))
     ##### EDIT THE FOLLOWING TO POINT TO DatasetName.csv #####
-    data = np.recfromtxt(open(filepath + '/statecrime.csv', 'rb'),
+    data = du.cached_recfromtxt(filepath + '/statecrime.csv',
             delimiter=",", names=True, dtype=None)
     return data
@@ -65,6 +65,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/strikes.csv', 'rb'), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/strikes.csv', delimiter=",",
             names=True, dtype=float)
     return data
@@ -30,6 +30,7 @@ from numpy import recfromtxt, column_stack, array
 from pandas import Series, DataFrame
 
 from statsmodels.tools import Dataset
+from statsmodels.tools import datautils as du
 from os.path import dirname, abspath
 
 def load():
@@ -64,6 +65,6 @@ def load_pandas():
 
 def _get_data():
     filepath = dirname(abspath(__file__))
-    data = recfromtxt(open(filepath + '/sunspots.csv', 'rb'), delimiter=",",
+    data = du.cached_recfromtxt(filepath + '/sunspots.csv', delimiter=",",
             names=True, dtype=float)
     return data
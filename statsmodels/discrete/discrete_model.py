@@ -22,6 +22,7 @@ import numpy as np
 from scipy.special import gammaln
 from scipy import stats, special, optimize # opt just for nbin
 import statsmodels.tools.tools as tools
+from statsmodels.tools import sparsetools
 from statsmodels.tools.decorators import (resettable_cache,
         cache_readonly)
 from statsmodels.regression.linear_model import OLS
@@ -64,8 +65,9 @@ class DiscreteModel(base.LikelihoodModel):
         statsmodels.model.LikelihoodModel.__init__
         and should contain any preprocessing that needs to be done for a model.
         """
-        self.df_model = float(tools.rank(self.exog) - 1) # assumes constant
-        self.df_resid = float(self.exog.shape[0] - tools.rank(self.exog))
+        rank = sparsetools.rank(self.exog)
+        self.df_model = float(rank - 1) # assumes constant
+        self.df_resid = float(self.exog.shape[0] - rank)
 
     def cdf(self, X):
         """
@@ -81,7 +83,7 @@ class DiscreteModel(base.LikelihoodModel):
 
     def _check_perfect_pred(self, params):
         endog = self.endog
-        fittedvalues = self.cdf(np.dot(self.exog, params))
+        fittedvalues = self.cdf(sparsetools.dot(self.exog, params))
         if (self.raise_on_perfect_prediction and
                 np.allclose(fittedvalues - endog, 0)):
             msg = "Perfect separation detected, results not available"
@@ -293,9 +295,9 @@ class BinaryModel(DiscreteModel):
         if exog is None:
             exog = self.exog
         if not linear:
-            return self.cdf(np.dot(exog, params))
+            return self.cdf(sparsetools.dot(exog, params))
         else:
-            return np.dot(exog, params)
+            return sparsetools.dot(exog, params)
 
     def fit(self, start_params=None, method='newton', maxiter=35,
             full_output=1, disp=1, callback=None, **kwargs):
@@ -606,9 +608,10 @@ class CountModel(DiscreteModel):
                 offset = 0
 
         if not linear:
-            return np.exp(np.dot(exog, params) + exposure + offset) # not cdf
+            return np.exp(sparsetools.dot(exog, params) + exposure +
+                          offset) # not cdf
         else:
-            return np.dot(exog, params) + exposure + offset
+            return sparsetools.dot(exog, params) + exposure + offset
             return super(CountModel, self).predict(params, exog, linear)
 
     def _derivative_predict(self, params, exog=None, transform='dydx'):
@@ -787,7 +790,7 @@ class Poisson(CountModel):
         """
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
-        XB = np.dot(self.exog, params) + offset + exposure
+        XB = sparsetools.dot(self.exog, params) + offset + exposure
         endog = self.endog
         #np.sum(stats.poisson.logpmf(endog, np.exp(XB)))
         return np.sum(-np.exp(XB) +  endog*XB - gammaln(endog+1))
@@ -811,7 +814,7 @@ class Poisson(CountModel):
         """
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
-        XB = np.dot(self.exog, params) + offset + exposure
+        XB = sparsetools.dot(self.exog, params) + offset + exposure
         endog = self.endog
         #np.sum(stats.poisson.logpmf(endog, np.exp(XB)))
         return -np.exp(XB) +  endog*XB - gammaln(endog+1)
@@ -842,8 +845,8 @@ class Poisson(CountModel):
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
         X = self.exog
-        L = np.exp(np.dot(X,params) + offset + exposure)
-        return np.dot(self.endog - L, X)
+        L = np.exp(sparsetools.dot(X,params) + offset + exposure)
+        return sparsetools.tdot(X, self.endog - L)
 
     def jac(self, params):
         """
@@ -869,8 +872,8 @@ class Poisson(CountModel):
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
         X = self.exog
-        L = np.exp(np.dot(X,params) + offset + exposure)
-        return (self.endog - L)[:,None] * X
+        L = np.exp(sparsetools.dot(X,params) + offset + exposure)
+        return sparsetools.scale_rows(X, self.endog - L)
 
     def hessian(self, params):
         """
@@ -884,6 +887,7 @@ class Poisson(CountModel):
         Returns
         -------
         The Hessian matrix evaluated at params
+        A sparse matrix in CSC format if exog is sparse.
 
         Notes
         -----
@@ -897,8 +901,8 @@ class Poisson(CountModel):
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
         X = self.exog
-        L = np.exp(np.dot(X,params) + exposure + offset)
-        return -np.dot(L*X.T, X)
+        L = np.exp(sparsetools.dot(X,params) + exposure + offset)
+        return -sparsetools.cross_product(X, L)
 
 class NbReg(DiscreteModel):
     pass
@@ -985,7 +989,7 @@ class Logit(BinaryModel):
         """
         q = 2*self.endog - 1
         X = self.exog
-        return np.sum(np.log(self.cdf(q*np.dot(X,params))))
+        return np.sum(np.log(self.cdf(q*sparsetools.dot(X,params))))
 
     def loglikeobs(self, params):
         """
@@ -1009,7 +1013,7 @@ class Logit(BinaryModel):
         """
         q = 2*self.endog - 1
         X = self.exog
-        return np.log(self.cdf(q*np.dot(X,params)))
+        return np.log(self.cdf(q*sparsetools.dot(X,params)))
 
     def score(self, params):
         """
@@ -1031,8 +1035,8 @@ class Logit(BinaryModel):
 
         y = self.endog
         X = self.exog
-        L = self.cdf(np.dot(X,params))
-        return np.dot(y - L,X)
+        L = self.cdf(sparsetools.dot(X,params))
+        return sparsetools.tdot(X, y - L)
 
     def jac(self, params):
         """
@@ -1056,8 +1060,8 @@ class Logit(BinaryModel):
 
         y = self.endog
         X = self.exog
-        L = self.cdf(np.dot(X, params))
-        return (y - L)[:,None] * X
+        L = self.cdf(sparsetools.dot(X, params))
+        return sparsetools.scale_rows(X, y - L)
 
     def hessian(self, params):
         """
@@ -1071,14 +1075,15 @@ class Logit(BinaryModel):
         Returns
         -------
         The Hessian evaluated at `params`
+        A sparse matrix in CSC format if exog is sparse.
 
         Notes
         -----
         .. math:: \\frac{\\partial^{2}\\ln L}{\\partial\\beta\\partial\\beta^{\\prime}}=-\\sum_{i}\\Lambda_{i}\\left(1-\\Lambda_{i}\\right)x_{i}x_{i}^{\\prime}
         """
         X = self.exog
-        L = self.cdf(np.dot(X,params))
-        return -np.dot(L*(1-L)*X.T,X)
+        L = self.cdf(sparsetools.dot(X,params))
+        return -sparsetools.cross_product(X, L*(1-L))
 
 class Probit(BinaryModel):
     __doc__ = """
@@ -1783,8 +1788,6 @@ class DiscreteResults(base.LikelihoodModelResults):
         #These are the deviance residuals
         M = 1
         p = model.predict(self.params)
-        Y_0 = np.where(exog==0)
-        Y_M = np.where(exog == M)
         res = np.zeros_like(endog)
         res = -(1-endog)*np.sqrt(2*M*np.abs(np.log(1-p))) + \
                 endog*np.sqrt(2*M*np.abs(np.log(p)))
@@ -1792,7 +1795,7 @@ class DiscreteResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def fittedvalues(self):
-        return np.dot(self.model.exog, self.params)
+        return sparsetools.dot(self.model.exog, self.params)
 
     @cache_readonly
     def aic(self):
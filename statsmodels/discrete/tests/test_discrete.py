@@ -968,6 +968,30 @@ def test_isdummy():
     count_ind = _isdummy(X)
     assert_equal(count_ind, [4, 6])
 
+def test_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(987125)
+    nobs = 300
+    groups = np.random.randint(0, 10, size=nobs)
+    x = np.random.normal(size=nobs)
+    exog = sparse.hstack((sparse.csr_matrix(x[:,None]),
+                          dummy_sparse(groups))).tocsr()
+    linpred = .5 * x + .05 * groups - .2
+    endog_binary = (np.random.uniform(size=nobs) <
+                    1 / (1 + np.exp(-linpred))).astype(float)
+    endog_count = np.random.poisson(np.exp(linpred))
+    for model, endog in [(Logit, endog_binary), (Poisson, endog_count)]:
+        res1 = model(endog, exog).fit(disp=0)
+        res2 = model(endog, exog.toarray()).fit(disp=0)
+        assert_(sparse.issparse(res1.model.hessian(res1.params)))
+        assert_almost_equal(res1.params, res2.params, 10)
+        assert_almost_equal(res1.bse, res2.bse, 10)
+        assert_almost_equal(res1.llf, res2.llf, 10)
+        assert_almost_equal(res1.llnull, res2.llnull, 10)
+        assert_almost_equal(res1.predict(exog[:5]),
+                            res2.predict(exog[:5].toarray()), 10)
+
 
 if __name__ == "__main__":
     import nose
@@ -29,7 +29,8 @@ Statistics. 14:3, 643-656.
 """
 
 import numpy as np
-from statsmodels.api import OLS, WLS, add_constant
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.tools.tools import add_constant
 #from elregress import ElReg
 from scipy import optimize
 from scipy.stats import chi2
@@ -0,0 +1,46 @@
+"""Import time of statsmodels.api and of the subpackages
+
+Every import is timed in a new interpreter, the minimum over a few runs is
+reported. The last column lists the heavy optional dependencies that are
+loaded by the import.
+"""
+
+import sys
+import subprocess
+
+modules = ['statsmodels.api',
+           'statsmodels.regression.linear_model',
+           'statsmodels.genmod.generalized_linear_model',
+           'statsmodels.discrete.discrete_model',
+           'statsmodels.formula.api',
+           'statsmodels.tsa.api',
+           'statsmodels.stats.api',
+           'statsmodels.graphics.api',
+           'statsmodels.nonparametric.api',
+           'statsmodels.emplike.api',
+           'statsmodels.iolib',
+           'statsmodels.datasets']
+optional = ['patsy', 'matplotlib']
+n_rep = 5
+
+code = """
+import sys, time
+t0 = time.time()
+import %s
+t1 = time.time() - t0
+print t1, ','.join(m for m in %r if m in sys.modules)
+"""
+
+# numpy, scipy and pandas are imported by every subpackage
+base = "import numpy, scipy.stats, scipy.optimize, pandas\n"
+
+print "%-45s %10s   %s" % ('module', 'time (s)', 'optional imports')
+for mod in modules:
+    times = []
+    for i in range(n_rep):
+        proc = subprocess.Popen([sys.executable, '-c',
+                                 base + code % (mod, optional)],
+                                stdout=subprocess.PIPE)
+        out = proc.communicate()[0].split()
+        times.append(float(out[0]))
+    print "%-45s %10.4f   %s" % (mod, min(times), ' '.join(out[1:]))
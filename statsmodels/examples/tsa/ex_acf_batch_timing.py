@@ -0,0 +1,35 @@
+"""Timing of acf, pacf and Ljung-Box for many series
+
+Compares one call with a 2d array, nobs x nseries, against a loop over the
+series. The 2d call uses the fft autocovariances of all columns and one
+Levinson-Durbin recursion for the pacf of all columns.
+"""
+
+from time import time
+import numpy as np
+from statsmodels.tsa.stattools import acf, pacf
+
+
+def loop(x, nlags):
+    for xi in x.T:
+        acf(xi, nlags=nlags, qstat=True, alpha=.05, fft=True)
+        pacf(xi, nlags=nlags, method='ldb', alpha=.05)
+
+
+def batch(x, nlags):
+    acf(x, nlags=nlags, qstat=True, alpha=.05, fft=True)
+    pacf(x, nlags=nlags, method='ldb', alpha=.05)
+
+
+np.random.seed(12345)
+nobs, nlags = 500, 40
+print("%8s %12s %12s" % ('nseries', 'loop (s)', '2d (s)'))
+for nseries in [10, 100, 1000, 10000]:
+    x = np.random.randn(nobs, nseries).cumsum(0)
+    t0 = time()
+    loop(x, nlags)
+    t_loop = time() - t0
+    t0 = time()
+    batch(x, nlags)
+    t_batch = time() - t0
+    print("%8d %12.4f %12.4f" % (nseries, t_loop, t_batch))
@@ -0,0 +1,40 @@
+"""Memory of lag matrices for a long series and large maxlag
+
+lagmat with trim='both' and view=True returns a read-only strided view of
+the series, the copy needs (maxlag + 1) times the memory of the series.
+adfuller, AR and the ARMA start parameters use the view and only copy once
+when the regressors are stacked.
+"""
+
+from time import time
+import numpy as np
+from statsmodels.tsa.tsatools import lagmat
+
+
+def owned_bytes(arr):
+    # memory allocated for arr itself, zero for a view
+    if arr.flags.owndata:
+        return arr.nbytes
+    return 0
+
+
+nobs = 100000
+x = np.random.randn(nobs).cumsum()
+print("series: %.1f MB" % (x.nbytes / 1e6))
+print("%8s %14s %14s %12s %12s" % ('maxlag', 'copy (MB)', 'view (MB)',
+                                   'copy (s)', 'view (s)'))
+for maxlag in [10, 50, 100, 200]:
+    t0 = time()
+    lm_copy = lagmat(x, maxlag, trim='both')
+    t_copy = time() - t0
+    t0 = time()
+    lm_view = lagmat(x, maxlag, trim='both', view=True)
+    t_view = time() - t0
+    assert (lm_copy == lm_view).all()
+    print("%8d %14.1f %14.1f %12.4f %12.6f" % (maxlag,
+                                               owned_bytes(lm_copy) / 1e6,
+                                               owned_bytes(lm_view) / 1e6,
+                                               t_copy, t_view))
+    # matrix products work on the view directly
+    xtx = np.dot(lm_view.T, lm_view)
+    del lm_copy
@@ -0,0 +1,58 @@
+"""Timing of the stationary state covariance for increasing state dimension
+
+Compares solve_discrete_lyapunov with the solve of I - kron(T, T) that was
+used before to initialize the Kalman filter. The Kronecker version needs
+m**4 doubles, so it stops at m = 50.
+
+The transition matrix is the companion matrix of a seasonal AR model, as in
+ARMA with k_lags = m.
+"""
+
+from time import time
+import numpy as np
+from statsmodels.tsa.tsatools import solve_discrete_lyapunov
+
+
+def companion(m):
+    # (1 - .5 L)(1 - .8 L^s) with s = m - 1, padded to m lags
+    ar = np.zeros(m)
+    ar[0] = .5
+    ar[m - 2] += .8
+    ar[m - 1] -= .4
+    T = np.zeros((m, m))
+    T[:, 0] = ar
+    T[:-1, 1:] = np.eye(m - 1)
+    return T
+
+
+def time_it(func, *args):
+    n_rep = 1
+    while True:
+        t0 = time()
+        for i in range(n_rep):
+            res = func(*args)
+        t1 = time() - t0
+        if t1 > .2:
+            return res, t1 / n_rep
+        n_rep *= 4
+
+
+def kron_solve(T, Q):
+    m = T.shape[0]
+    P = np.linalg.solve(np.eye(m**2) - np.kron(T, T), Q.ravel('F'))
+    return P.reshape(m, m, order='F')
+
+
+print("%6s %14s %14s %12s" % ('m', 'doubling (s)', 'kron (s)', 'max diff'))
+for m in [4, 8, 13, 25, 50, 100, 200]:
+    T = companion(m)
+    R = np.zeros((m, 1))
+    R[0] = 1.
+    Q = np.dot(R, R.T)
+    P, t_lyap = time_it(solve_discrete_lyapunov, T, Q)
+    if m <= 50:
+        P_kron, t_kron = time_it(kron_solve, T, Q)
+        print("%6d %14.6f %14.6f %12.2e" % (m, t_lyap, t_kron,
+                                            np.abs(P - P_kron).max()))
+    else:
+        print("%6d %14.6f %14s %12s" % (m, t_lyap, '-', '-'))
@@ -1,5 +1,4 @@
 import statsmodels.tools.data as data_util
-from patsy import dmatrices
 
 # if users want to pass in a different formula framework, they can
 # add their handler here. how to do it interactively?
@@ -35,6 +34,9 @@ def handle_formula_data(Y, X, formula, depth=0):
     if isinstance(formula, tuple(formula_handler.keys())):
         return formula_handler[type(formula)]
 
+    # patsy is only imported when a formula is used
+    from patsy import dmatrices
+
     if X is not None:
         if data_util._is_using_pandas(Y, X):
             return dmatrices(formula, (Y, X), 2, return_type='dataframe')
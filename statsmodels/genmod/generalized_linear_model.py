@@ -19,8 +19,9 @@ McCullagh, P. and Nelder, J.A.  1989.  "Generalized Linear Models." 2nd ed.
 """
 
 import numpy as np
+from scipy import linalg
 import families
-from statsmodels.tools.tools import rank
+from statsmodels.tools import sparsetools
 from statsmodels.tools.decorators import (cache_readonly,
         resettable_cache)
 
@@ -37,6 +38,79 @@ def _check_convergence(criterion, iteration, tol, maxiter):
     return not ((np.fabs(criterion[iteration] - criterion[iteration-1]) > tol)
             and iteration <= maxiter)
 
+class _IRLSWorkspace(object):
+    """
+    Weighted least squares solver for the IRLS iterations.
+
+    The whitened design and response are written into arrays that are
+    allocated once, and the weighted normal equations are solved with a
+    Cholesky factorization of the equilibrated cross-product. If the
+    cross-product is ill-conditioned, the whitened least squares problem is
+    solved with lstsq instead.
+
+    A sparse exog is weighted in place of a copy with the same sparsity
+    structure, and the normal equations are solved with a sparse LU
+    factorization.
+    """
+    # reciprocal condition number of X'WX below which lstsq is used
+    rcond = 1e-8
+
+    def __init__(self, exog):
+        self.exog = exog
+        nobs, k_vars = exog.shape
+        self.is_sparse = sparsetools.issparse(exog)
+        if self.is_sparse:
+            self.wexog = exog.copy()
+            # row index of each stored element of the CSR matrix
+            self._rows = np.repeat(np.arange(nobs), np.diff(exog.indptr))
+        else:
+            self.wexog = np.empty((nobs, k_vars))
+        self.wendog = np.empty(nobs)
+        self.sqrt_weights = np.empty(nobs)
+        self._cho = None
+
+    def fit(self, endog, weights):
+        """
+        Returns the parameters of the weighted regression of endog on exog.
+        """
+        wexog, wendog = self.wexog, self.wendog
+        np.sqrt(weights, self.sqrt_weights)
+        np.multiply(endog, self.sqrt_weights, wendog)
+        if self.is_sparse:
+            np.multiply(self.exog.data, self.sqrt_weights[self._rows],
+                        wexog.data)
+            self._xtx = xtx = sparsetools.cross_product(wexog)
+            self._lu = sparsetools.factorize(xtx)
+            return self._lu.solve(sparsetools.tdot(wexog, wendog))
+        np.multiply(self.exog, self.sqrt_weights[:,None], wexog)
+
+        xtx = np.dot(wexog.T, wexog)
+        xty = np.dot(wexog.T, wendog)
+        col_scale = np.sqrt(np.diag(xtx))
+        self._cho = None
+        if np.all(col_scale > 0):
+            xtx /= np.outer(col_scale, col_scale)
+            eigvals = np.linalg.eigvalsh(xtx)
+            if eigvals[0] > self.rcond * eigvals[-1]:
+                self._col_scale = col_scale
+                self._cho = linalg.cho_factor(xtx, lower=True)
+                return linalg.cho_solve(self._cho, xty / col_scale) / col_scale
+        return np.linalg.lstsq(wexog, wendog)[0]
+
+    def normalized_cov_params(self):
+        """
+        inv(X'WX) for the weights of the last call to fit.
+        """
+        if self.is_sparse:
+            return sparsetools.inv_cross_product(self._xtx, self._lu)
+        if self._cho is not None:
+            col_scale = self._col_scale
+            inv_xtx = linalg.cho_solve(self._cho, np.eye(len(col_scale)))
+            return inv_xtx / np.outer(col_scale, col_scale)
+        pinv_wexog = np.linalg.pinv(self.wexog)
+        return np.dot(pinv_wexog, pinv_wexog.T)
+
+
 class GLM(base.LikelihoodModel):
     __doc__ = '''
     Generalized Linear Models class
@@ -208,12 +282,18 @@ class GLM(base.LikelihoodModel):
                         'params' : [np.inf],
                         'deviance' : [np.inf]}
 
-        self.pinv_wexog = np.linalg.pinv(self.exog)
-        self.normalized_cov_params = np.dot(self.pinv_wexog,
-                                        np.transpose(self.pinv_wexog))
+        if sparsetools.issparse(self.exog):
+            # not available without densifying exog
+            self.pinv_wexog = None
+            self.normalized_cov_params = None
+        else:
+            self.pinv_wexog = np.linalg.pinv(self.exog)
+            self.normalized_cov_params = np.dot(self.pinv_wexog,
+                                            np.transpose(self.pinv_wexog))
 
-        self.df_model = rank(self.exog)-1
-        self.df_resid = self.exog.shape[0] - rank(self.exog)
+        rank_ = sparsetools.rank(self.exog)
+        self.df_model = rank_-1
+        self.df_resid = self.exog.shape[0] - rank_
 
     def _check_inputs(self, family, offset, exposure, endog):
         if family is None:
@@ -253,11 +333,11 @@ class GLM(base.LikelihoodModel):
         """
         raise NotImplementedError
 
-    def _update_history(self, tmp_result, mu, history):
+    def _update_history(self, params, mu, history):
         """
         Helper method to update history during iterative fit.
         """
-        history['params'].append(tmp_result.params)
+        history['params'].append(params)
         history['deviance'].append(self.family.deviance(self.endog, mu))
         return history
 
@@ -335,12 +415,13 @@ class GLM(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
         if linear:
-            return np.dot(exog, params) + offset + exposure
+            return sparsetools.dot(exog, params) + offset + exposure
         else:
-            return self.family.fitted(np.dot(exog, params) + exposure + \
-                                                             offset)
+            return self.family.fitted(sparsetools.dot(exog, params) +
+                                      exposure + offset)
 
-    def fit(self, maxiter=100, method='IRLS', tol=1e-8, scale=None):
+    def fit(self, maxiter=100, method='IRLS', tol=1e-8, scale=None,
+            start_params=None):
         '''
         Fits a generalized linear model for a given family.
 
@@ -360,6 +441,17 @@ class GLM(base.LikelihoodModel):
             `dev` is the deviance divided by df_resid
         tol : float
             Convergence tolerance.  Default is 1e-8.
+        start_params : array-like, optional
+            Initial guess of the parameters, for example the estimates of
+            an earlier fit on similar data. If None, the iterations start
+            from the family's `starting_mu`.
+
+        Notes
+        -----
+        The weighted least squares problem of each iteration is solved in
+        arrays that are allocated once per fit. It uses a Cholesky
+        factorization of X'WX, or least squares on the weighted exog if X'WX
+        is ill-conditioned.
         '''
         endog = self.endog
         if endog.ndim > 1 and endog.shape[1] == 2:
@@ -385,9 +477,12 @@ class GLM(base.LikelihoodModel):
             offset = 0
         #TODO: would there ever be both and exposure and an offset?
 
-        mu = self.family.starting_mu(self.endog)
-        wlsexog = self.exog
-        eta = self.family.predict(mu)
+        if start_params is None:
+            mu = self.family.starting_mu(self.endog)
+            eta = self.family.predict(mu)
+        else:
+            eta = sparsetools.dot(self.exog, start_params) + offset
+            mu = self.family.fitted(eta)
         dev = self.family.deviance(self.endog, mu)
         if np.isnan(dev):
             raise ValueError("The first guess on the deviance function "
@@ -401,14 +496,15 @@ class GLM(base.LikelihoodModel):
         iteration = 0
         converged = 0
         criterion = history['deviance']
+        irls = _IRLSWorkspace(self.exog)
         while not converged:
             self.weights = data_weights*self.family.weights(mu)
             wlsendog = eta + self.family.link.deriv(mu) * (self.endog-mu) \
                 - offset
-            wls_results = lm.WLS(wlsendog, wlsexog, self.weights).fit()
-            eta = np.dot(self.exog, wls_results.params) + offset
+            params = irls.fit(wlsendog, self.weights)
+            eta = sparsetools.dot(self.exog, params) + offset
             mu = self.family.fitted(eta)
-            history = self._update_history(wls_results, mu, history)
+            history = self._update_history(params, mu, history)
             self.scale = self.estimate_scale(mu)
             iteration += 1
             if endog.squeeze().ndim == 1 and np.allclose(mu - endog, 0):
@@ -417,8 +513,8 @@ class GLM(base.LikelihoodModel):
             converged = _check_convergence(criterion, iteration, tol,
                                             maxiter)
         self.mu = mu
-        glm_results = GLMResults(self, wls_results.params,
-                                 wls_results.normalized_cov_params,
+        glm_results = GLMResults(self, params,
+                                 irls.normalized_cov_params(),
                                  self.scale)
         history['iteration'] = iteration
         glm_results.fit_history = history
@@ -569,16 +665,26 @@ class GLMResults(base.LikelihoodModelResults):
     def null(self):
         endog = self._endog
         model = self.model
-        exog = np.ones((len(endog), 1))
+        weights = self._data_weights
         if hasattr(model, 'offset'):
-            return GLM(endog, exog, offset=model.offset,
-                       family=self.family).fit().mu
+            offset = model.offset
         elif hasattr(model, 'exposure'):
-            return GLM(endog, exog, exposure=model.exposure,
-                    family=self.family).fit().mu
+            offset = model.exposure # already in logs
         else:
-            wls_model = lm.WLS(endog, exog, weights=self._data_weights)
-            return wls_model.fit().fittedvalues
+            # the mle of the constant only model is the weighted mean
+            mean = np.dot(weights, endog) / weights.sum()
+            return mean * np.ones(len(endog))
+
+        if (isinstance(self.family, families.Poisson) and
+                isinstance(self.family.link, families.links.Log)):
+            exp_offset = np.exp(offset)
+            return exp_offset * (np.dot(weights, endog) /
+                                 np.dot(weights, exp_offset))
+        exog = np.ones((len(endog), 1))
+        mean = np.dot(weights, endog) / weights.sum()
+        start_params = [self.family.predict(mean) - np.mean(offset)]
+        return GLM(endog, exog, offset=offset,
+                   family=self.family).fit(start_params=start_params).mu
 
     @cache_readonly
     def deviance(self):
@@ -593,7 +699,8 @@ class GLMResults(base.LikelihoodModelResults):
         _modelfamily = self.family
         if isinstance(_modelfamily, families.NegativeBinomial):
             val = _modelfamily.loglike(self.model.endog,
-                        fittedvalues = np.dot(self.model.exog,self.params))
+                        fittedvalues = sparsetools.dot(self.model.exog,
+                                                       self.params))
         else:
             val = _modelfamily.loglike(self._endog, self.mu,
                                     scale=self.scale)
@@ -506,6 +506,60 @@ def test_attribute_writable_resettable():
     glm_model2 = sm.GLM(endog, exog)
     assert_equal(glm_model2.family.link.power, 1.0)
 
+def test_start_params():
+    data = sm.datasets.scotland.load()
+    exog = add_constant(data.exog, prepend=True)
+    mod = GLM(data.endog, exog, family=sm.families.Gamma())
+    res1 = mod.fit()
+    res2 = mod.fit(start_params=res1.params)
+    assert_almost_equal(res2.params, res1.params, 8)
+    assert_almost_equal(res2.bse, res1.bse, 8)
+    assert_(res2.fit_history['iteration'] < res1.fit_history['iteration'])
+
+def test_null_deviance_offset():
+    data = sm.datasets.cpunish.load()
+    exog = add_constant(data.exog, prepend=True)
+    exposure = np.linspace(1, 5, len(data.endog))
+    res1 = GLM(data.endog, exog, family=sm.families.Poisson(),
+               exposure=exposure).fit()
+    res2 = GLM(data.endog, exog, family=sm.families.Poisson(),
+               offset=np.log(exposure)).fit()
+    null = GLM(data.endog, np.ones((len(data.endog), 1)),
+               family=sm.families.Poisson(), offset=np.log(exposure)).fit()
+    assert_almost_equal(res1.null, null.mu, 8)
+    assert_almost_equal(res1.null_deviance, null.deviance, 8)
+    assert_almost_equal(res2.null_deviance, null.deviance, 8)
+    # no closed form for Gamma
+    data = sm.datasets.scotland.load()
+    exog = add_constant(data.exog, prepend=True)
+    family = sm.families.Gamma(sm.families.links.log)
+    offset = np.linspace(-.5, .5, len(data.endog))
+    res3 = GLM(data.endog, exog, family=family, offset=offset).fit()
+    null = GLM(data.endog, np.ones((len(data.endog), 1)), family=family,
+               offset=offset).fit()
+    assert_almost_equal(res3.null_deviance, null.deviance, 8)
+def test_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(987125)
+    nobs = 300
+    groups = np.random.randint(0, 10, size=nobs)
+    x = np.random.normal(size=nobs)
+    exog = sparse.hstack((sparse.csr_matrix(x[:,None]),
+                          dummy_sparse(groups))).tocsr()
+    endog = np.random.poisson(np.exp(.2 * x + .05 * groups))
+    res1 = GLM(endog, exog, family=sm.families.Poisson()).fit()
+    res2 = GLM(endog, exog.toarray(), family=sm.families.Poisson()).fit()
+    assert_almost_equal(res1.params, res2.params, 10)
+    assert_almost_equal(res1.bse, res2.bse, 10)
+    assert_almost_equal(res1.deviance, res2.deviance, 8)
+    assert_almost_equal(res1.null_deviance, res2.null_deviance, 8)
+    assert_almost_equal(res1.llf, res2.llf, 8)
+    assert_equal(res1.df_resid, res2.df_resid)
+    assert_almost_equal(res1.model.predict(res1.params, exog[:5]),
+                        res2.model.predict(res2.params, exog[:5].toarray()))
+
+
 if __name__=="__main__":
     #run_module_suite()
     #taken from Fernando Perez:
@@ -1,6 +1,7 @@
 from foreign import StataReader, genfromdta, savetxt
 from table import SimpleTable, csv2st
 from smpickle import save_pickle, load_pickle
+from smresults import save_results, load_results
 
 from statsmodels import NoseWrapper as Tester
 test = Tester().test
@@ -29,6 +29,13 @@ PY3 = is_py3()
 
 _date_formats = ["%tc", "%tC", "%td", "%tw", "%tm", "%tq", "%th", "%ty"]
 
+# bytes of records decoded or encoded at a time by StataReader.data and
+# StataWriter.write_file
+_BLOCK_SIZE = 2**22
+
+# storage types of the numeric variables, byte is a signed char on disk
+_RECORD_TYPES = {'b' : 'i1', 'h' : 'i2', 'l' : 'i4', 'f' : 'f4', 'd' : 'f8'}
+
 def _datetime_to_stata_elapsed(date, fmt):
     """
     Convert from datetime to SIF. http://www.stata.com/help.cgi?datetime
@@ -67,6 +74,25 @@ def _datetime_to_stata_elapsed(date, fmt):
     else:
         raise ValueError("fmt %s not understood" % fmt)
 
+def _datetime_to_stata_elapsed_dates(dates, fmt):
+    """
+    Convert an array of datetimes to a float array of SIF dates.
+
+    Missing dates are returned as nan. Every distinct date is converted only
+    once.
+    """
+    dates = np.asarray(dates, dtype=object)
+    out = np.empty(dates.shape)
+    missing = isnull(dates)
+    out[missing] = np.nan
+    valid = ~missing
+    if valid.any():
+        uniq, inv = np.unique(dates[valid], return_inverse=True)
+        converted = np.array([_datetime_to_stata_elapsed(date, fmt)
+                              for date in uniq], dtype=float)
+        out[valid] = converted[inv]
+    return out
+
 def _stata_elapsed_date_to_datetime(date, fmt):
     """
     Convert from SIF to datetime. http://www.stata.com/help.cgi?datetime
@@ -147,6 +173,38 @@ def _stata_elapsed_date_to_datetime(date, fmt):
     else:
         raise ValueError("Date fmt %s not understood" % fmt)
 
+def _stata_elapsed_dates_to_datetime(dates, fmt, missing=None):
+    """
+    Convert an array of SIF dates to an object array of datetimes.
+
+    Parameters
+    ----------
+    dates : ndarray
+        Stata Internal Format dates
+    fmt : str
+        The format to convert to. See _stata_elapsed_date_to_datetime.
+    missing : ndarray of bool, optional
+        Entries that are True are copied unchanged instead of converted.
+
+    Notes
+    -----
+    Every distinct date is converted only once, dates in a column usually
+    repeat many times.
+    """
+    dates = np.asarray(dates)
+    out = np.empty(dates.shape, dtype=object)
+    if missing is None:
+        missing = np.zeros(dates.shape, dtype=bool)
+    out[missing] = dates[missing]
+    valid = ~missing
+    if valid.any():
+        uniq, inv = np.unique(dates[valid], return_inverse=True)
+        converted = np.empty(len(uniq), dtype=object)
+        converted[:] = [_stata_elapsed_date_to_datetime(date, fmt)
+                        for date in uniq]
+        out[valid] = converted[inv]
+    return out
+
 ### Helper classes for StataReader ###
 
 class _StataMissingValue(object):
@@ -397,6 +455,49 @@ class StataReader(object):
             for i in range(self._header['nobs']):
                 yield self._next()
 
+    def data(self, columns=None, missing_flt=-999., convert_dates=False,
+             chunksize=None):
+        """
+        Returns the dataset as a structured array.
+
+        The records are decoded in blocks with `np.frombuffer` and only the
+        requested variables are copied out of each block.
+
+        Parameters
+        ----------
+        columns : list of str or int, optional
+            Names or positions of the variables to return, in the requested
+            order. Default is all variables.
+        missing_flt : numeric
+            The value that replaces missing values in numeric variables.
+        convert_dates : bool
+            If True, variables with a Stata date format are converted to
+            datetime objects according to their format.
+        chunksize : int, optional
+            If given, return a generator that yields structured arrays of at
+            most `chunksize` observations instead of the full dataset.
+
+        Returns
+        -------
+        data : ndarray or generator
+            Structured array with one field per requested variable, or a
+            generator of such arrays if chunksize is given.
+
+        Notes
+        -----
+        Missing values are always replaced by `missing_flt`, the
+        missing_values option of the reader only applies to `dataset`.
+        Memory use is proportional to the number of requested variables
+        and observations.
+        """
+        cols = self._column_index(columns)
+        nobs = self._header['nobs']
+        if chunksize is None:
+            return self._read_rows(0, nobs, cols, missing_flt, convert_dates)
+        if chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        return self._iter_rows(cols, chunksize, missing_flt, convert_dates)
+
     ### Python special methods
 
     def __len__(self):
@@ -516,6 +617,105 @@ class StataReader(object):
         else:
             return self._col_sizes[k]
 
+    def _record_dtype(self):
+        """The dtype of one observation as it is stored in the file."""
+        byteorder = self._header['byteorder']
+        formats = []
+        for typ in self._header['typlist']:
+            if type(typ) is int:
+                formats.append('S%d' % typ)
+            else:
+                formats.append(byteorder + _RECORD_TYPES[typ])
+        return np.dtype({'names' : self._header['varlist'],
+                         'formats' : formats})
+
+    def _column_index(self, columns):
+        varlist = self._header['varlist']
+        if columns is None:
+            return range(len(varlist))
+        if isinstance(columns, (basestring, int)):
+            columns = [columns]
+        cols = []
+        for col in columns:
+            if isinstance(col, basestring):
+                if col not in varlist:
+                    raise ValueError("%s is not a variable in the dataset"
+                                     % col)
+                col = varlist.index(col)
+            elif not 0 <= col < len(varlist):
+                raise IndexError(col)
+            cols.append(col)
+        return cols
+
+    def _iter_rows(self, cols, chunksize, missing_flt, convert_dates):
+        nobs = self._header['nobs']
+        for start in xrange(0, nobs, chunksize):
+            yield self._read_rows(start, min(start + chunksize, nobs), cols,
+                                  missing_flt, convert_dates)
+
+    def _read_rows(self, start, stop, cols, missing_flt, convert_dates):
+        """Decode observations start to stop of the variables in cols."""
+        header = self._header
+        varlist = header['varlist']
+        typlist = header['typlist']
+        names = [varlist[i] for i in cols]
+        out = np.empty(stop - start, dtype=zip(names,
+                                    [header['dtyplist'][i] for i in cols]))
+
+        rec_dtype = self._record_dtype()
+        rowsize = rec_dtype.itemsize
+        step = max(_BLOCK_SIZE // rowsize, 1)
+        self._file.seek(self._data_location + start * rowsize)
+        for i in xrange(0, stop - start, step):
+            n = min(step, stop - start - i)
+            rec = np.frombuffer(self._file.read(n * rowsize),
+                                dtype=rec_dtype, count=n)
+            for name in names:
+                out[name][i:i+n] = rec[name]
+
+        null_byte = asbytes('\x00')
+        date_cols = []
+        for i, name in zip(cols, names):
+            col = out[name]
+            typ = typlist[i]
+            if type(typ) is int:
+                # trailing nulls are already dropped, cut at the first
+                # null terminator for the remaining ones. np.char.find
+                # does not find null bytes in older numpy, look at the
+                # bytes instead.
+                chars = np.ascontiguousarray(col).view(np.uint8)
+                chars = chars.reshape(len(col), col.dtype.itemsize)
+                later = np.maximum.accumulate(chars[:, ::-1] != 0,
+                                              axis=1)[:, ::-1]
+                inner = (chars[:, :-1] == 0) & later[:, 1:]
+                for j in np.nonzero(inner.any(1))[0]:
+                    col[j] = col[j][:col[j].index(null_byte)]
+                continue
+            nmin, nmax = self.MISSING_VALUES[typ]
+            missing = (col < nmin) | (col > nmax)
+            if convert_dates and header['fmtlist'][i] in _date_formats:
+                date_cols.append((name, header['fmtlist'][i], missing))
+            elif missing.any():
+                col[missing] = missing_flt
+
+        if date_cols:
+            dates = dict((name, (fmt, missing)) for name, fmt, missing
+                         in date_cols)
+            dtype = [(name, object) if name in dates else (name, dt)
+                     for name, dt in out.dtype.descr]
+            data = np.empty(len(out), dtype=dtype)
+            for name in names:
+                if name in dates:
+                    fmt, missing = dates[name]
+                    col = _stata_elapsed_dates_to_datetime(out[name], fmt,
+                                                           missing)
+                    col[missing] = missing_flt
+                    data[name] = col
+                else:
+                    data[name] = out[name]
+            out = data
+        return out
+
     def _unpack(self, fmt, byt):
         d = unpack(self._header['byteorder']+fmt, byt)[0]
         if fmt[-1] in self.MISSING_VALUES:
@@ -758,7 +958,6 @@ class StataWriter(object):
         self.nobs = len(data)
         self.nvar = len(data.dtype)
         self.data = data
-        self.datarows = iter(data)
         dtype = data.dtype
         descr = dtype.descr
         if dtype.names is None:
@@ -795,7 +994,6 @@ class StataWriter(object):
             data = data[:,None]
         self.nobs, self.nvar = data.shape
         self.data = data
-        self.datarows = iter(data)
         #TODO: this should be user settable
         dtype = data.dtype
         self.varlist = _default_names(self.nvar)
@@ -806,16 +1004,7 @@ class StataWriter(object):
     def _prepare_pandas(self, data):
         #NOTE: we might need a different API / class for pandas objects so
         # we can set different semantics - handle this with a PR to pandas.io
-        class DataFrameRowIter(object):
-            def __init__(self, data):
-                self.data = data
-
-            def __iter__(self):
-                for i, row in data.iterrows():
-                    yield row
-
         data = data.reset_index()
-        self.datarows = DataFrameRowIter(data)
         self.nobs, self.nvar = data.shape
         self.data = data
         self.varlist = data.columns.tolist()
@@ -841,10 +1030,7 @@ class StataWriter(object):
         self._write_variable_labels()
         # write 5 zeros for expansion fields
         self._file.write(_pad_bytes("", 5))
-        if self._convert_dates is None:
-            self._write_data_nodates()
-        else:
-            self._write_data_dates()
+        self._write_data()
         #self._write_value_labels()
 
     def _write_header(self, data_label=None, time_stamp=None):
@@ -910,49 +1096,74 @@ class StataWriter(object):
             for i in range(nvar):
                 self._file.write(_pad_bytes("", 81))
 
-    def _write_data_nodates(self):
-        data = self.datarows
-        byteorder = self._byteorder
-        TYPE_MAP = self.TYPE_MAP
-        typlist = self.typlist
-        for row in data:
-            #row = row.squeeze().tolist() # needed for structured arrays
-            for i,var in enumerate(row):
-                typ = ord(typlist[i])
-                if typ <= 244: # we've got a string
-                    if len(var) < typ:
-                        var = _pad_bytes(var, len(var) + 1)
-                    self._file.write(var)
-                else:
-                    self._file.write(pack(byteorder+TYPE_MAP[typ], var))
+    def _record_dtype(self):
+        """The dtype of one observation as it is written to the file."""
+        formats = []
+        for typ in self.typlist:
+            typ = ord(typ)
+            if typ <= 244: # we've got a string
+                formats.append('S%d' % typ)
+            else:
+                formats.append(self._byteorder +
+                               _RECORD_TYPES[self.TYPE_MAP[typ]])
+        return np.dtype({'names' : _default_names(self.nvar),
+                         'formats' : formats})
+
+    def _column(self, i, start, stop):
+        """Observations start to stop of variable i."""
+        data = self.data
+        if data_util._is_using_pandas(data, None):
+            col = data[self.varlist[i]][start:stop]
+            if self._convert_dates is not None and i in self._convert_dates:
+                # datetime objects instead of datetime64
+                col = col.astype(object)
+            return np.asarray(col)
+        elif data.dtype.names is not None:
+            return data[data.dtype.names[i]][start:stop]
+        else:
+            return data[start:stop, i]
 
-    def _write_data_dates(self):
-        convert_dates = self._convert_dates
-        data = self.datarows
-        byteorder = self._byteorder
+    def _write_data(self):
+        """
+        Write the observations as packed records, in blocks of rows.
+
+        Every block is filled column by column, dates are converted and
+        missing values encoded for whole columns at once.
+        """
+        convert_dates = self._convert_dates or {}
         TYPE_MAP = self.TYPE_MAP
         MISSING_VALUES = self.MISSING_VALUES
-        typlist = self.typlist
-        for row in data:
-            #row = row.squeeze().tolist() # needed for structured arrays
-            for i,var in enumerate(row):
-                typ = ord(typlist[i])
-                #NOTE: If anyone finds this terribly slow, there is
-                # a vectorized way to convert dates, see genfromdta for going
-                # from int to datetime and reverse it. will copy data though
+        rec_dtype = self._record_dtype()
+        names = rec_dtype.names
+        step = max(_BLOCK_SIZE // rec_dtype.itemsize, 1)
+        for start in xrange(0, self.nobs, step):
+            stop = min(start + step, self.nobs)
+            records = np.empty(stop - start, dtype=rec_dtype)
+            for i, name in enumerate(names):
+                typ = ord(self.typlist[i])
+                var = self._column(i, start, stop)
                 if i in convert_dates:
-                    var = _datetime_to_stata_elapsed(var, self.fmtlist[i])
+                    var = _datetime_to_stata_elapsed_dates(var,
+                                                           self.fmtlist[i])
                 if typ <= 244: # we've got a string
-                    if isnull(var):
-                        var = "" # missing string
-                    if len(var) < typ:
-                        var = _pad_bytes(var, len(var) + 1)
-                    self._file.write(var)
-                else:
-                    if isnull(var): # this only matters for floats
-                        var = MISSING_VALUES[typ]
-                    self._file.write(pack(byteorder+TYPE_MAP[typ], var))
-
+                    if var.dtype.type == np.object_:
+                        var = var.copy()
+                        var[isnull(var)] = "" # missing string
+                    records[name] = var
+                    continue
+                field = records[name]
+                if var.dtype.kind in 'iu' and len(var):
+                    info = np.iinfo(field.dtype)
+                    if var.min() < info.min or var.max() > info.max:
+                        raise ValueError("Values of variable %s do not fit "
+                                         "in its Stata type" %
+                                         self.varlist[i])
+                field[:] = var
+                if var.dtype.kind == 'f':
+                    missing = np.isnan(var)
+                    if missing.any():
+                        field[missing] = MISSING_VALUES[TYPE_MAP[typ]]
+            self._file.write(records.tostring())
 
     def _null_terminate(self, s, encoding):
         null_byte = asbytes('\x00')
@@ -964,7 +1175,7 @@ class StataWriter(object):
             return s
 
 def genfromdta(fname, missing_flt=-999., encoding=None, pandas=False,
-                convert_dates=True):
+                convert_dates=True, columns=None):
     """
     Returns an ndarray or DataFrame from a Stata .dta file.
 
@@ -983,11 +1194,17 @@ def genfromdta(fname, missing_flt=-999., encoding=None, pandas=False,
     convert_dates : bool
         If convert_dates is True, then Stata formatted dates will be converted
         to datetime types according to the variable's format.
+    columns : list of str or int, optional
+        Names or positions of the variables to read. Default is all
+        variables.
 
     Notes
     ------
     The tC Stata Internal Format for dates is not handled. These values
     will be returned in SIF even if convert_dates is True.
+
+    The data is read with StataReader.data, use it directly to iterate over
+    large files in chunks.
     """
     if isinstance(fname, basestring):
         fhd = StataReader(open(fname, 'rb'), missing_values=False,
@@ -997,61 +1214,13 @@ def genfromdta(fname, missing_flt=-999., encoding=None, pandas=False,
                 "(got %s instead)" % type(fname))
     else:
         fhd = StataReader(fname, missing_values=False, encoding=encoding)
-#    validate_names = np.lib._iotools.NameValidator(excludelist=excludelist,
-#                                    deletechars=deletechars,
-#                                    case_sensitive=case_sensitive)
-
-    #TODO: This needs to handle the byteorder?
-    header = fhd.file_headers()
-    types = header['dtyplist']
-    nobs = header['nobs']
-    numvars = header['nvar']
-    varnames = header['varlist']
-    fmtlist = header['fmtlist']
-    dataname = header['data_label']
-    labels = header['vlblist'] # labels are thrown away unless DataArray
-                               # type is used
-    data = np.zeros((nobs,numvars))
-    stata_dta = fhd.dataset()
-
-    dt = np.dtype(zip(varnames, types))
-    data = np.zeros((nobs), dtype=dt) # init final array
-
-    for rownum,line in enumerate(stata_dta):
-        # doesn't handle missing value objects, just casts
-        # None will only work without missing value object.
-        if None in line:
-            for i,val in enumerate(line):
-                #NOTE: This will only be scalar types because missing strings
-                # are empty not None in Stata
-                if val is None:
-                    line[i] = missing_flt
-        data[rownum] = tuple(line)
+
+    data = fhd.data(columns=columns, missing_flt=missing_flt,
+                    convert_dates=convert_dates)
 
     if pandas:
         from pandas import DataFrame
         data = DataFrame.from_records(data)
-        if convert_dates:
-            cols = np.where(map(lambda x : x in _date_formats, fmtlist))[0]
-            for col in cols:
-                i = col
-                col = data.columns[col]
-                data[col] = data[col].apply(_stata_elapsed_date_to_datetime,
-                        args=(fmtlist[i],))
-    elif convert_dates:
-        #date_cols = np.where(map(lambda x : x in _date_formats,
-        #                                                    fmtlist))[0]
-        # make the dtype for the datetime types
-        cols = np.where(map(lambda x : x in _date_formats, fmtlist))[0]
-        dtype = data.dtype.descr
-        dtype = [(dt[0], object) if i in cols else dt for i,dt in
-                 enumerate(dtype)]
-        data = data.astype(dtype) # have to copy
-        for col in cols:
-            def convert(x):
-                return _stata_elapsed_date_to_datetime(x, fmtlist[col])
-            data[data.dtype.names[col]] = map(convert,
-                                              data[data.dtype.names[col]])
     return data
 
 def savetxt(fname, X, names=None, fmt='%.18e', delimiter=' '):
@@ -0,0 +1,362 @@
+'''Compact file format for estimation results
+
+The file stores the results instance without pickling the full object graph.
+It is laid out as
+
+    magic string '\x93SMRESULTS'
+    header length, 4 byte little-endian unsigned int
+    JSON header, padded with spaces so that the data starts at a multiple
+    of 64 bytes
+    data section, every array and the pickled objects start at a multiple of
+    64 bytes
+
+The header holds the format version, the results and wrapper classes, the
+scalar attributes and cached values, and the dtype, shape and offset of every
+array. The model is stored without its data arrays, see `remove_data`.
+Arrays of the instance are read when loading, large ones are memory-mapped.
+Cached arrays, like resid and fittedvalues, are only read or memory-mapped
+when they are first accessed.
+'''
+
+import copy
+import json
+from struct import pack, unpack
+
+import numpy as np
+from statsmodels.compatnp.py3k import asbytes
+from statsmodels.iolib.smpickle import _get_file_obj
+from statsmodels.tools.decorators import ResettableCache
+
+FORMAT_VERSION = 1
+
+_MAGIC = asbytes('\x93SMRESULTS')
+_ALIGN = 64
+# arrays of at least this many bytes are memory-mapped instead of read
+_MMAP_MIN_BYTES = 2**16
+# cached arrays of length nobs, as in remove_data, computed before saving
+_DATA_IN_CACHE = ['fittedvalues', 'resid', 'wresid']
+
+
+def _class_path(klass):
+    return klass.__module__ + '.' + klass.__name__
+
+def _import_class(path):
+    module, name = path.rsplit('.', 1)
+    return getattr(__import__(module, fromlist=[name]), name)
+
+def _pad(n):
+    return -n % _ALIGN
+
+def _str_keys(d):
+    # json gives unicode keys
+    return dict((str(key), value) for key, value in d.iteritems())
+
+def _json_values(d):
+    # json gives unicode keys and strings, only ascii str are stored
+    return dict((str(key), str(value) if isinstance(value, unicode)
+                 else value) for key, value in d.iteritems())
+
+def _is_json_value(value):
+    """
+    True for scalars and strings that JSON gives back with the same type.
+    """
+    if value is None or type(value) in (bool, int, long, float):
+        return True
+    if type(value) is str:
+        try:
+            value.decode('ascii')
+            return True
+        except UnicodeDecodeError:
+            return False
+    return False
+
+def _split_values(items):
+    """
+    Split (name, value) pairs into JSON values, arrays and other objects.
+
+    Only plain scalars and ascii strings are stored as JSON values. Lists,
+    tuples, dicts and anything else are pickled with the other objects, so
+    that they are loaded with the same type.
+    """
+    values, arrays, objects = {}, {}, {}
+    for name, value in items:
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            arrays[name] = np.asarray(value)
+            continue
+        if isinstance(value, np.generic):
+            value = value.item()
+        if _is_json_value(value):
+            values[name] = value
+        else:
+            objects[name] = value
+    return values, arrays, objects
+
+def _model_spec(model):
+    """
+    Shallow copy of model with the data arrays listed in _data_attr removed.
+    """
+    data = model.data
+    # the names and row labels are computed from the data, keep them
+    for name in ('ynames', 'xnames', 'row_labels'):
+        try:
+            getattr(data, name)
+        except Exception:
+            pass
+    spec = copy.copy(model)
+    spec.data = copy.copy(data)
+    spec.data._cache = copy.copy(data._cache)
+    for att in getattr(model, '_data_attr', []) + ['data.frame']:
+        obj = spec
+        if att.startswith('data.'):
+            obj, att = spec.data, att[5:]
+        if '.' not in att and att in obj.__dict__:
+            setattr(obj, att, None)
+    return spec
+
+
+class _LazyCache(ResettableCache):
+    """
+    Results cache that reads the stored arrays on first access.
+    """
+    def __init__(self, source, start, lazy, items, reset=None):
+        ResettableCache.__init__(self, reset=reset)
+        dict.update(self, items)
+        self._source = source
+        self._start = start
+        self._lazy = lazy
+
+    def _load(self, key):
+        info = self._lazy.pop(key)
+        dict.__setitem__(self, key, _read_array(self._source, self._start,
+                                                info))
+
+    def __getitem__(self, key):
+        if key in self._lazy:
+            self._load(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._lazy:
+            self._load(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._lazy or dict.__contains__(self, key)
+
+    def keys(self):
+        return dict.keys(self) + self._lazy.keys()
+
+    def __setitem__(self, key, value):
+        self._lazy.pop(key, None)
+        ResettableCache.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if key in self._lazy:
+            self._lazy.pop(key)
+            dict.__setitem__(self, key, None)
+        ResettableCache.__delitem__(self, key)
+
+
+def _read_array(source, start, info):
+    dtype = np.dtype(str(info['dtype']))
+    shape = tuple(info['shape'])
+    nbytes = dtype.itemsize * int(np.prod(shape))
+    offset = start + info['offset']
+    if isinstance(source, basestring):
+        if nbytes >= _MMAP_MIN_BYTES:
+            # copy-on-write, changes are not written back to the file
+            return np.memmap(source, dtype=dtype, mode='c', offset=offset,
+                             shape=shape)
+        fh = open(source, 'rb')
+        try:
+            fh.seek(offset)
+            buf = fh.read(nbytes)
+        finally:
+            fh.close()
+    else:
+        source.seek(offset)
+        buf = source.read(nbytes)
+    return np.frombuffer(buf, dtype=dtype).reshape(shape).copy()
+
+def _read_header(fh):
+    if fh.read(len(_MAGIC)) != _MAGIC:
+        raise ValueError("Not a statsmodels results file")
+    length = unpack('<I', fh.read(4))[0]
+    header = json.loads(fh.read(length).decode('ascii'))
+    prefix = len(_MAGIC) + 4 + length
+    return header, prefix + _pad(prefix)
+
+
+def is_results_file(fname):
+    """
+    Check whether fname was written by save_results
+
+    Parameters
+    ----------
+    fname : str or filehandle
+        For a filehandle the position is restored.
+    """
+    fh = _get_file_obj(fname, 'rb')
+    pos = fh.tell()
+    try:
+        return fh.read(len(_MAGIC)) == _MAGIC
+    finally:
+        if fh is fname:
+            fh.seek(pos)
+        else:
+            fh.close()
+
+def save_results(results, fname):
+    """
+    Save an estimation results instance in the compact results format
+
+    Parameters
+    ----------
+    results : Results or ResultsWrapper instance
+    fname : str or filehandle
+        File to write to.
+
+    Notes
+    -----
+    The arrays `fittedvalues`, `resid` and `wresid` and the names in the
+    results' `data_in_cache` are computed if they are not yet cached, so
+    that they are available after loading without the data.
+
+    See Also
+    --------
+    load_results
+    """
+    import cPickle as pickle
+    from statsmodels.base.wrapper import ResultsWrapper
+
+    wrapper = None
+    if isinstance(results, ResultsWrapper):
+        wrapper = results.__class__
+        results = results._results
+
+    for name in getattr(results, 'data_in_cache', []) + _DATA_IN_CACHE:
+        try:
+            getattr(results, name)
+        except Exception: # not available for this model or without data
+            pass
+
+    # __getstate__ drops unpicklable attributes, as for pickle
+    if hasattr(results, '__getstate__'):
+        state = results.__getstate__()
+    else:
+        state = results.__dict__
+    attrs = [(key, value) for key, value in state.iteritems()
+             if key not in ('model', '_cache')]
+    # indexing reads the entries of a loaded lazy cache
+    results_cache = getattr(results, '_cache', None) or {}
+    cache = [(key, results_cache[key]) for key in results_cache.keys()
+             if results_cache[key] is not None]
+    attr_values, attr_arrays, attr_objects = _split_values(attrs)
+    cache_values, cache_arrays, cache_objects = _split_values(cache)
+    objects = pickle.dumps({'model' : _model_spec(results.model),
+                            'attributes' : attr_objects,
+                            'cache' : cache_objects,
+                            'cache_reset' : getattr(results_cache,
+                                                    '_resetdict', {})},
+                           protocol=-1)
+
+    # lay out the data section
+    blocks = []
+    size = [0]
+    def add(buf):
+        offset = size[0]
+        blocks.append(buf + asbytes('\x00') * _pad(len(buf)))
+        size[0] += len(blocks[-1])
+        return offset
+
+    def add_arrays(arrays):
+        info = {}
+        for name, arr in arrays.iteritems():
+            info[name] = {'dtype' : arr.dtype.str, 'shape' : list(arr.shape),
+                          'offset' : add(np.ascontiguousarray(arr).tostring())}
+        return info
+
+    header = {'format_version' : FORMAT_VERSION,
+              'results_class' : _class_path(results.__class__),
+              'wrapper_class' : wrapper and _class_path(wrapper),
+              'attributes' : attr_values,
+              'cache' : cache_values,
+              'attribute_arrays' : add_arrays(attr_arrays),
+              'cache_arrays' : add_arrays(cache_arrays),
+              'objects' : {'offset' : add(objects), 'length' : len(objects)}}
+    header = asbytes(json.dumps(header))
+    header += asbytes(' ') * _pad(len(_MAGIC) + 4 + len(header))
+
+    fh = _get_file_obj(fname, 'wb')
+    try:
+        fh.write(_MAGIC)
+        fh.write(pack('<I', len(header)))
+        fh.write(header)
+        for buf in blocks:
+            fh.write(buf)
+    finally:
+        if fh is not fname:
+            fh.close()
+
+def load_results(fname):
+    """
+    Load an estimation results instance written by save_results
+
+    Parameters
+    ----------
+    fname : str or filehandle
+        File to read from.
+
+    Returns
+    -------
+    results : Results or ResultsWrapper instance
+        The model of the results does not have the data arrays.
+
+    Notes
+    -----
+    If fname is a file name, then large arrays are memory-mapped in
+    copy-on-write mode and cached arrays are only read on first access. For
+    a filehandle all arrays are read when loading.
+
+    See Also
+    --------
+    save_results
+    """
+    import cPickle as pickle
+
+    fh = _get_file_obj(fname, 'rb')
+    try:
+        header, start = _read_header(fh)
+        if header['format_version'] > FORMAT_VERSION:
+            raise ValueError("The results file has format version %d, this "
+                             "version of statsmodels reads up to version %d"
+                             % (header['format_version'], FORMAT_VERSION))
+        info = header['objects']
+        fh.seek(start + info['offset'])
+        objects = pickle.loads(fh.read(info['length']))
+
+        klass = _import_class(header['results_class'])
+        results = klass.__new__(klass)
+        results.__dict__.update(_json_values(header['attributes']))
+        results.__dict__.update(objects['attributes'])
+        for name, info in header['attribute_arrays'].iteritems():
+            results.__dict__[str(name)] = _read_array(fname, start, info)
+        results.model = objects['model']
+
+        cache = _json_values(header['cache'])
+        cache.update(objects['cache'])
+        lazy = _str_keys(header['cache_arrays'])
+        if fh is fname:
+            # the filehandle may be closed after loading
+            for name, info in lazy.items():
+                cache[name] = _read_array(fname, start, info)
+            lazy = {}
+        results._cache = _LazyCache(fname, start, lazy, cache,
+                                    reset=objects['cache_reset'])
+    finally:
+        if fh is not fname:
+            fh.close()
+
+    if header['wrapper_class'] is not None:
+        results = _import_class(header['wrapper_class'])(results)
+    return results
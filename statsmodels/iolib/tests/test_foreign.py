@@ -9,7 +9,7 @@ from numpy.testing import *
 import numpy as np
 import statsmodels.api as sm
 import os
-from statsmodels.iolib.foreign import (StataWriter, genfromdta,
+from statsmodels.iolib.foreign import (StataReader, StataWriter, genfromdta,
             _datetime_to_stata_elapsed, _stata_elapsed_date_to_datetime)
 from statsmodels.datasets import macrodata
 from pandas import DataFrame, isnull
@@ -97,6 +97,80 @@ def test_stata_writer_pandas():
     dta2 = genfromdta(buf)
     ptesting.assert_frame_equal(dta.reset_index(), DataFrame.from_records(dta2))
 
+def test_stata_reader_data():
+    buf = StringIO()
+    dta = macrodata.load().data
+    dta = dta.astype(np.dtype([('year', 'i4'), ('quarter', 'i1')] +
+                              dta.dtype.descr[2:]))
+    writer = StataWriter(buf, dta)
+    writer.write_file()
+    buf.seek(0)
+    reader = StataReader(buf)
+    # row by row reader
+    rows = np.array(map(tuple, reader.dataset()), dtype=dta.dtype)
+    res = reader.data()
+    assert_array_equal(res.tolist(), rows.tolist())
+    assert_array_equal(res.tolist(), dta.tolist())
+
+    res = reader.data(columns=['realgdp', 1, 'year'])
+    assert_equal(res.dtype.names, ('realgdp', 'quarter', 'year'))
+    assert_array_equal(res['realgdp'], dta['realgdp'])
+    assert_array_equal(res['quarter'], dta['quarter'])
+
+    chunks = list(reader.data(columns=['year', 'infl'], chunksize=50))
+    assert_equal([len(chunk) for chunk in chunks], [50, 50, 50, 50, 3])
+    res = np.concatenate(chunks)
+    assert_array_equal(res['infl'], dta['infl'])
+    assert_array_equal(res['year'], dta['year'])
+    assert_raises(ValueError, reader.data, columns=['gdp'])
+
+def test_stata_reader_data_missing():
+    dta = genfromdta(os.path.join(curdir, "results/data_missing.dta"),
+                     missing_flt=-999)
+    reader = StataReader(open(os.path.join(curdir,
+                                           "results/data_missing.dta"), 'rb'))
+    names = reader.file_headers()['varlist']
+    res = reader.data(columns=names[::-1], chunksize=1).next()
+    assert_(np.all([res[0][i] == -999 for i in range(5)]))
+    assert_equal(res[0].tolist(), dta[0].tolist()[::-1])
+
+def test_stata_writer_blocks():
+    from statsmodels.iolib import foreign
+    np.random.seed(1234)
+    nobs = 53
+    dta = np.zeros(nobs, dtype=[('x', float), ('y', np.float32),
+                                ('n', np.int32), ('s', 'a3'), ('d', object)])
+    dta['x'] = np.random.randn(nobs)
+    dta['x'][[3, 40]] = np.nan
+    dta['y'] = np.random.randn(nobs)
+    dta['n'] = np.arange(nobs) - 20
+    dta['s'] = [('a', 'bc', 'def', '')[i % 4] for i in range(nobs)]
+    dta['d'] = [datetime(1990 + i // 12, i % 12 + 1, 1) for i in range(nobs)]
+    dta['d'][7] = None
+
+    buf = StringIO()
+    block_size = foreign._BLOCK_SIZE
+    # write and read a few rows at a time
+    foreign._BLOCK_SIZE = 64
+    try:
+        writer = StataWriter(buf, dta, {'d' : 'tm'})
+        writer.write_file()
+        buf.seek(0)
+        res = genfromdta(buf, missing_flt=np.nan)
+    finally:
+        foreign._BLOCK_SIZE = block_size
+    assert_(np.isnan(res['x'][[3, 40]]).all())
+    assert_array_equal(res['x'], dta['x'])
+    assert_array_equal(res['y'], dta['y'])
+    assert_array_equal(res['n'], dta['n'])
+    assert_array_equal(res['s'], dta['s'])
+    assert_(isnull(res['d'][7]))
+    assert_array_equal(res['d'][:7].tolist(), dta['d'][:7].tolist())
+    assert_array_equal(res['d'][8:].tolist(), dta['d'][8:].tolist())
+
+    dta['n'][5] = 40000
+    assert_raises(ValueError, StataWriter(StringIO(), dta).write_file)
+
 def test_stata_writer_unicode():
     # make sure to test with characters outside the latin-1 encoding
     pass
@@ -112,6 +186,11 @@ def test_genfromdta_datetime():
     assert_array_equal(dta[0].tolist(), results[0])
     assert_array_equal(dta[1].tolist(), results[1])
 
+    dta = genfromdta(os.path.join(curdir, "results/time_series_examples.dta"),
+                     columns=[5, 2])
+    assert_array_equal(dta[0].tolist(), (results[0][5], results[0][2]))
+    assert_array_equal(dta[1].tolist(), (results[1][5], results[1][2]))
+
     dta = genfromdta(os.path.join(curdir, "results/time_series_examples.dta"),
                     pandas=True)
     assert_array_equal(dta.irow(0).tolist(), results[0])
@@ -0,0 +1,170 @@
+#cython: boundscheck = False
+#cython: wraparound = False
+#cython: cdivision = True
+"""
+Compiled lowess engine used by smoothers_lowess.lowess.
+
+All functions assume that `x` is sorted in increasing order. The k nearest
+neighbors of a point are tracked with a window [left, right) over the sorted
+x values that only moves to the right, so a pass over the data is O(n*k)
+with no searching.
+"""
+
+cimport cython
+cimport numpy as np
+import numpy as np
+from libc.math cimport fabs
+
+ctypedef np.float64_t DOUBLE
+
+
+cdef inline void update_neighborhood(double *x, Py_ssize_t n, double xval,
+                                     Py_ssize_t *left, Py_ssize_t *right):
+    # slide the window of k points to the right as long as the point
+    # entering on the right is strictly closer than the one leaving
+    while right[0] < n:
+        if x[right[0]] - xval < xval - x[left[0]]:
+            left[0] += 1
+            right[0] += 1
+        else:
+            break
+
+
+cdef inline double fit_point(double *x, double *y, double *robust_weights,
+                             double xval, Py_ssize_t left, Py_ssize_t right):
+    # weighted local linear regression evaluated at xval
+    cdef:
+        Py_ssize_t j
+        double width, dist, w, sum_w = 0, xbar = 0, ybar = 0
+        double sxx = 0, sxy = 0, xd
+
+    width = xval - x[left]
+    if x[right - 1] - xval > width:
+        width = x[right - 1] - xval
+    # tricube weights times robustness weights
+    for j in range(left, right):
+        dist = fabs(x[j] - xval) / width
+        if dist < 1:
+            w = 1 - dist * dist * dist
+            w = w * w * w * robust_weights[j]
+        else:
+            w = 0
+        sum_w += w
+        xbar += w * x[j]
+        ybar += w * y[j]
+    if sum_w <= 0:
+        # no observation with positive weight, same as the least squares
+        # solution of the old python implementation
+        return 0.
+    xbar /= sum_w
+    ybar /= sum_w
+    for j in range(left, right):
+        dist = fabs(x[j] - xval) / width
+        if dist < 1:
+            w = 1 - dist * dist * dist
+            w = w * w * w * robust_weights[j]
+            xd = x[j] - xbar
+            sxx += w * xd * xd
+            sxy += w * xd * (y[j] - ybar)
+    # the weighted x values do not vary, the local fit is the weighted mean
+    if sxx <= 1e-12 * sum_w * (fabs(xbar) + width) * (fabs(xbar) + width):
+        return ybar
+    return ybar + sxy / sxx * (xval - xbar)
+
+
+def lowess_fit(np.ndarray[DOUBLE, ndim=1] x, np.ndarray[DOUBLE, ndim=1] y,
+               np.ndarray[DOUBLE, ndim=1] robust_weights, Py_ssize_t k,
+               double delta):
+    """
+    One pass of local linear fits at the sorted x values.
+
+    Parameters
+    ----------
+    x : ndarray
+        Sorted x values, contiguous.
+    y : ndarray
+        The y values in the order of x, contiguous.
+    robust_weights : ndarray
+        Robustness weights of the observations, ones for the initial fit.
+    k : int
+        Number of nearest neighbors used in each local fit.
+    delta : float
+        Points within delta of the last fitted point are not fit, their
+        values are linearly interpolated. Tied x values are always copied.
+
+    Returns
+    -------
+    fitted : ndarray
+        The fitted values at x.
+    """
+    cdef:
+        Py_ssize_t n = x.shape[0]
+        Py_ssize_t i = 0, j, last = -1, left = 0, right = k
+        double cut, alpha
+        double *xp = <double *>x.data
+        double *yp = <double *>y.data
+        double *rw = <double *>robust_weights.data
+        np.ndarray[DOUBLE, ndim=1] fitted = np.empty(n)
+
+    while last < n - 1:
+        update_neighborhood(xp, n, xp[i], &left, &right)
+        fitted[i] = fit_point(xp, yp, rw, xp[i], left, right)
+
+        # linear interpolation of the skipped points
+        if last < i - 1:
+            for j in range(last + 1, i):
+                alpha = (xp[j] - xp[last]) / (xp[i] - xp[last])
+                fitted[j] = alpha * fitted[i] + (1 - alpha) * fitted[last]
+        last = i
+
+        # next point to fit, ties get the same fitted value
+        cut = xp[last] + delta
+        i = last + 1
+        while i < n:
+            if xp[i] > cut:
+                break
+            if xp[i] == xp[last]:
+                fitted[i] = fitted[last]
+                last = i
+            i += 1
+        i = max(last + 1, i - 1)
+
+    return fitted
+
+
+def lowess_eval(np.ndarray[DOUBLE, ndim=1] x, np.ndarray[DOUBLE, ndim=1] y,
+                np.ndarray[DOUBLE, ndim=1] robust_weights, Py_ssize_t k,
+                np.ndarray[DOUBLE, ndim=1] xvals):
+    """
+    Local linear fits at sorted points xvals.
+
+    Parameters
+    ----------
+    x : ndarray
+        Sorted x values, contiguous.
+    y : ndarray
+        The y values in the order of x, contiguous.
+    robust_weights : ndarray
+        Robustness weights of the observations.
+    k : int
+        Number of nearest neighbors used in each local fit.
+    xvals : ndarray
+        Sorted points at which the fit is evaluated.
+
+    Returns
+    -------
+    fitted : ndarray
+        The fitted values at xvals.
+    """
+    cdef:
+        Py_ssize_t n = x.shape[0], m = xvals.shape[0]
+        Py_ssize_t i, left = 0, right = k
+        double *xp = <double *>x.data
+        double *yp = <double *>y.data
+        double *rw = <double *>robust_weights.data
+        np.ndarray[DOUBLE, ndim=1] fitted = np.empty(m)
+
+    for i in range(m):
+        update_neighborhood(xp, n, xvals[i], &left, &right)
+        fitted[i] = fit_point(xp, yp, rw, xvals[i], left, right)
+    return fitted
@@ -27,10 +27,14 @@ def configuration(parent_package='', top_path=None):
     #config.add_data_files('tests/results/results_kde_weights.csv')
     if has_c_compiler():
         cython(['fast_linbin.pyx'], working_path=cur_dir)
+        cython(['_smoothers_lowess.pyx'], working_path=cur_dir)
 
         config.add_extension('fast_linbin',
                          sources=['fast_linbin.c'],
                          include_dirs=[get_numpy_include_dirs()])
+        config.add_extension('_smoothers_lowess',
+                         sources=['_smoothers_lowess.c'],
+                         include_dirs=[get_numpy_include_dirs()])
 
 
     return config
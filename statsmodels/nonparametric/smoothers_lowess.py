@@ -10,9 +10,14 @@ Cleveland, W.S. (1979) "Robust Locally Weighted Regression and Smoothing Scatter
 
 import numpy as np
 from scipy.linalg import lstsq
+try:
+    from ._smoothers_lowess import lowess_fit, lowess_eval
+    _have_compiled = True
+except ImportError:
+    _have_compiled = False
 
 
-def lowess(endog, exog, frac = 2./3, it = 3):
+def lowess(endog, exog, frac = 2./3, it = 3, delta = 0.0, xvals = None):
     """
     LOWESS (Locally Weighted Scatterplot Smoothing)
 
@@ -31,13 +36,24 @@ def lowess(endog, exog, frac = 2./3, it = 3):
     it: int
         The number of residual-based reweightings
         to perform.
+    delta: float
+        Distance within which to use linear-interpolation
+        instead of weighted regression. The local regressions
+        are only computed at points that are more than delta
+        apart, the remaining fitted values are interpolated.
+        Default is 0, all points are fit.
+    xvals: 1-D numpy array, optional
+        Values of the exogenous variable at which to evaluate
+        the smoothed curve. The robustness weights are computed
+        from the fit at the observed points.
 
     Returns
     -------
     out: numpy array
         A numpy array with two columns. The first column
         is the sorted x values and the second column the
-        associated estimated y-values.
+        associated estimated y-values. If xvals is given,
+        a 1-D array with the estimated y-values at xvals.
 
     Notes
     -----
@@ -65,6 +81,12 @@ def lowess(endog, exog, frac = 2./3, it = 3):
     Some experimentation is likely required to find a good
     choice of frac and iter for a particular dataset.
 
+    The fits are computed by a compiled extension. For large
+    datasets a delta of about 1 percent of the range of exog,
+    as used by R, reduces the number of local regressions
+    considerably. Without the compiled extension the same fits
+    are computed in python, which is much slower.
+
 
     References
     ----------
@@ -119,11 +141,44 @@ def lowess(endog, exog, frac = 2./3, it = 3):
     x_copy = np.array(exog[index_array]) #, dtype ='float32')
     y_copy = endog[index_array]
 
-    fitted, weights = _lowess_initial_fit(x_copy, y_copy, k, n)
-
-    for i in xrange(it):
-        _lowess_robustify_fit(x_copy, y_copy, fitted,
-                                            weights, k, n)
+    if xvals is not None:
+        xvals = np.asarray(xvals, dtype=np.float64)
+        if xvals.ndim != 1:
+            raise ValueError('xvals must be a vector')
+
+    if not _have_compiled:
+        fit_index = None
+        if delta > 0:
+            fit_index = np.zeros(n, dtype=bool)
+            fit_index[_lowess_delta_anchors(x_copy, delta)] = True
+        fitted, weights = _lowess_initial_fit(x_copy, y_copy, k, n,
+                                              fit_index)
+        _lowess_interpolate(x_copy, fitted, fit_index)
+
+        robust_weights = np.ones(n)
+        for i in xrange(it):
+            robust_weights = _lowess_robust_weights(y_copy, fitted)
+            _lowess_robustify_fit(x_copy, y_copy, fitted,
+                                                weights, k, n, fit_index)
+            _lowess_interpolate(x_copy, fitted, fit_index)
+
+        if xvals is not None:
+            return _lowess_eval(x_copy, y_copy, robust_weights, k, xvals)
+    else:
+        x_fit = np.ascontiguousarray(x_copy, dtype=np.float64)
+        y_fit = np.ascontiguousarray(y_copy, dtype=np.float64)
+        robust_weights = np.ones(n)
+        fitted = lowess_fit(x_fit, y_fit, robust_weights, k, delta)
+        for i in xrange(it):
+            robust_weights = _lowess_robust_weights(y_fit, fitted)
+            fitted = lowess_fit(x_fit, y_fit, robust_weights, k, delta)
+
+        if xvals is not None:
+            xvals_order = np.argsort(xvals)
+            out = np.empty(len(xvals))
+            out[xvals_order] = lowess_eval(x_fit, y_fit, robust_weights, k,
+                                           xvals[xvals_order])
+            return out
 
     out = np.array([x_copy, fitted]).T
     out.shape = (n,2)
@@ -131,7 +186,98 @@ def lowess(endog, exog, frac = 2./3, it = 3):
     return out
 
 
-def _lowess_initial_fit(x_copy, y_copy, k, n):
+def _lowess_robust_weights(y_copy, fitted):
+    """
+    The bisquare weights of the residuals used by the robustifying
+    iterations, zero for residuals larger than 6 times the median
+    absolute residual.
+    """
+    residual_weights = np.absolute(y_copy - fitted)
+    s = np.median(residual_weights)
+    residual_weights /= (6*s)
+    too_big = residual_weights>=1
+    _lowess_bisquare(residual_weights)
+    residual_weights[too_big] = 0
+    return residual_weights
+
+
+def _lowess_eval(x_copy, y_copy, robust_weights, k, xvals):
+    """
+    Weighted local linear regressions at the points xvals, the same fits
+    as `lowess_eval` in the compiled extension.
+
+    The k nearest neighbors of each point get tricube weights in the
+    distance times the robustness weights. The fit is extrapolated for
+    points outside of the range of x_copy.
+    """
+    n = len(x_copy)
+    xvals_order = np.argsort(xvals)
+    fitted = np.empty(len(xvals))
+    left, right = 0, k
+    for i in xvals_order:
+        xval = xvals[i]
+        # move the window of the k nearest neighbors to the right
+        while right < n and x_copy[right] - xval < xval - x_copy[left]:
+            left += 1
+            right += 1
+        x_i = x_copy[left:right]
+        y_i = y_copy[left:right]
+        width = max(xval - x_i[0], x_i[-1] - xval)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dist = np.absolute(x_i - xval) / width
+        w = np.zeros(k)
+        near = dist < 1
+        w[near] = (1 - dist[near]**3)**3
+        w *= robust_weights[left:right]
+        sum_w = w.sum()
+        if sum_w <= 0:
+            fitted[i] = 0.
+            continue
+        xbar = np.dot(w, x_i) / sum_w
+        ybar = np.dot(w, y_i) / sum_w
+        sxx = np.dot(w, (x_i - xbar)**2)
+        if sxx <= 1e-12 * sum_w * (abs(xbar) + width)**2:
+            # the weighted x values do not vary
+            fitted[i] = ybar
+        else:
+            sxy = np.dot(w, (x_i - xbar) * (y_i - ybar))
+            fitted[i] = ybar + sxy / sxx * (xval - xbar)
+    return fitted
+
+
+def _lowess_delta_anchors(x_copy, delta):
+    """
+    Indices of the sorted x values at which the local regressions are
+    computed if delta > 0, the same points as in the compiled extension.
+
+    The next point fit is the last one within delta of the previous point,
+    or the point after it if there is none. Ties of a fitted point are not
+    fit.
+    """
+    n = len(x_copy)
+    anchors = []
+    i = 0
+    while True:
+        anchors.append(i)
+        last = np.searchsorted(x_copy, x_copy[i], 'right') - 1
+        if last >= n - 1:
+            break
+        i = max(last + 1,
+                np.searchsorted(x_copy, x_copy[i] + delta, 'right') - 1)
+    return np.array(anchors)
+
+
+def _lowess_interpolate(x_copy, fitted, fit_index):
+    """
+    Linear interpolation of the points that were not fit, in place.
+    """
+    if fit_index is None:
+        return
+    fitted[~fit_index] = np.interp(x_copy[~fit_index], x_copy[fit_index],
+                                   fitted[fit_index])
+
+
+def _lowess_initial_fit(x_copy, y_copy, k, n, fit_index=None):
     """
     The initial weighted local linear regression for lowess.
 
@@ -146,6 +292,9 @@ def _lowess_initial_fit(x_copy, y_copy, k, n):
         each estimated point
     n : int
         The total number of points
+    fit_index : 1-d boolean ndarray, optional
+        The points at which the local regressions are computed, all points
+        if None. The other fitted values are left at zero.
 
     Returns
     -------
@@ -164,6 +313,9 @@ def _lowess_initial_fit(x_copy, y_copy, k, n):
     fitted = np.zeros(n)
 
     for i in xrange(n):
+        if fit_index is not None and not fit_index[i]:
+            _lowess_update_nn(x_copy, nn_indices, i+1)
+            continue
         #note: all _lowess functions are inplace, no return
         left_width = x_copy[i] - x_copy[nn_indices[0]]
         right_width = x_copy[nn_indices[1]-1] - x_copy[i]
@@ -213,7 +365,8 @@ def _lowess_wt_standardize(weights, new_entries, x_copy_i, width):
 
 
 
-def _lowess_robustify_fit(x_copy, y_copy, fitted, weights, k, n):
+def _lowess_robustify_fit(x_copy, y_copy, fitted, weights, k, n,
+                          fit_index=None):
     """
     Additional weighted local linear regressions, performed if
     iter>0. They take into account the sizes of the residuals,
@@ -236,6 +389,9 @@ def _lowess_robustify_fit(x_copy, y_copy, fitted, weights, k, n):
         each estimated point
     n : int
         The total number of points
+    fit_index : 1-d boolean ndarray, optional
+        The points at which the local regressions are computed, all points
+        if None. The other fitted values are not changed.
 
    Returns
     -------
@@ -258,6 +414,9 @@ def _lowess_robustify_fit(x_copy, y_copy, fitted, weights, k, n):
 
 
     for i in xrange(n):
+        if fit_index is not None and not fit_index[i]:
+            _lowess_update_nn(x_copy, nn_indices, i+1)
+            continue
 
         total_weights = weights[i,:] * np.sqrt(residual_weights[nn_indices[0]:
                                                         nn_indices[1]])
@@ -1,5 +1,5 @@
 import numpy as np
-from numpy.testing import assert_almost_equal, assert_
+from numpy.testing import assert_almost_equal, assert_, assert_raises
 from statsmodels.nonparametric.smoothers_lowess import lowess
 
 
@@ -139,6 +139,56 @@ class  TestLowess(object):
         #not sure why I get lower precision on the last test
         assert_almost_equal(expected_lowess_15, actual_lowess_15, decimal=6)
 
+    def test_python_fallback(self):
+        from statsmodels.nonparametric import smoothers_lowess
+        np.random.seed(12345)
+        x = np.round(np.random.uniform(-5, 5, size=200), 1) # ties
+        y = np.sin(x) + 0.3 * np.random.standard_cauchy(size=200)
+        actual = lowess(y, x, frac=0.3, it=3)
+        actual_delta = lowess(y, x, frac=0.3, it=3, delta=0.5)
+        # inside, at and outside of the range of x
+        xvals = np.array([2.05, -5., 0.3, 4.9, 5.5, -7.])
+        actual_xvals = lowess(y, x, frac=0.3, it=3, xvals=xvals)
+        have_compiled = smoothers_lowess._have_compiled
+        smoothers_lowess._have_compiled = False
+        try:
+            expected = lowess(y, x, frac=0.3, it=3)
+            expected_delta = lowess(y, x, frac=0.3, it=3, delta=0.5)
+            expected_xvals = lowess(y, x, frac=0.3, it=3, xvals=xvals)
+        finally:
+            smoothers_lowess._have_compiled = have_compiled
+        assert_almost_equal(actual, expected, 12)
+        assert_almost_equal(actual_delta, expected_delta, 12)
+        assert_almost_equal(actual_xvals, expected_xvals, 12)
+
+    def test_delta(self):
+        np.random.seed(12345)
+        x = np.random.uniform(0, 10, size=100)
+        y = np.sin(x) + np.random.normal(size=100)
+        expected = lowess(y, x, frac=0.5)
+        # no two points are within delta
+        actual = lowess(y, x, frac=0.5, delta=1e-8)
+        assert_almost_equal(actual, expected, 12)
+        # only the end points are fit, the rest is interpolated
+        actual = lowess(y, x, frac=0.5, it=0, delta=20)
+        ends = lowess(y, x, frac=0.5, it=0)[[0, -1]]
+        assert_almost_equal(actual[[0, -1]], ends, 12)
+        assert_almost_equal(actual[:, 1], np.interp(actual[:, 0],
+                                                    ends[:, 0], ends[:, 1]))
+
+    def test_xvals(self):
+        np.random.seed(12345)
+        x = np.random.uniform(0, 10, size=100)
+        y = np.sin(x) + np.random.normal(size=100)
+        expected = lowess(y, x, frac=0.4)
+        actual = lowess(y, x, frac=0.4, xvals=x)
+        assert_almost_equal(actual, expected[np.argsort(np.argsort(x)), 1],
+                            12)
+        # the results are in the order of xvals
+        xvals = np.array([5., 2., 8., -1.])
+        actual = lowess(y, x, frac=0.4, xvals=xvals)
+        sorted_fit = lowess(y, x, frac=0.4, xvals=np.sort(xvals))
+        assert_almost_equal(actual, sorted_fit[[2, 1, 3, 0]], 12)
 
 if __name__ == "__main__":
     import nose
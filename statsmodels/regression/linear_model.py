@@ -28,7 +28,8 @@ W. Green.  "Econometric Analysis," 5th ed., Pearson, 2003.
 
 __docformat__ = 'restructuredtext en'
 
-__all__ = ['GLS', 'WLS', 'OLS', 'GLSAR']
+__all__ = ['GLS', 'WLS', 'OLS', 'GLSAR', 'MultiOLS', 'ChunkedLS',
+           'chunk_arrays']
 
 import numpy as np
 from scipy.linalg import toeplitz
@@ -40,10 +41,24 @@ from statsmodels.tools.decorators import (resettable_cache,
         cache_readonly, cache_writable)
 import statsmodels.base.model as base
 import statsmodels.base.wrapper as wrap
-from statsmodels.emplike.elregress import _ELRegOpts
+from statsmodels.tools import sparsetools
+from statsmodels.base.data import _make_exog_names
+from statsmodels.tools.grouputils import (Group, group_demean_multi,
+                                          absorbed_levels)
 from scipy import optimize
 from scipy.stats import chi2
 
+_absorb_note = """If `absorb` is given, then the fixed effects of the absorbed factors are
+    removed from endog and exog with the (weighted) within transformation,
+    see `statsmodels.tools.grouputils.group_demean_multi`, instead of
+    including dummy variables in exog. exog should not include a constant.
+    params, bse and the residuals are the same as in the regression with
+    dummy variables, and the degrees of freedom account for the absorbed
+    levels. The parameters of the absorbed effects are not estimated and
+    fittedvalues include the absorbed effects. `predict` does not include
+    the absorbed effects. absorb cannot contain missing values."""
+
+
 def _get_sigma(sigma, nobs):
     """
     Returns sigma for GLS and the inverse of its Cholesky decomposition.
@@ -83,9 +98,11 @@ class RegressionModel(base.LikelihoodModel):
         self.wendog = self.whiten(self.endog)
         # overwrite nobs from class Model:
         self.nobs = float(self.wexog.shape[0])
-        self.df_resid = self.nobs - rank(self.exog)
+        rank_ = sparsetools.rank(self.exog)
+        self.df_resid = self.nobs - rank_
         #Below assumes that we have a constant
-        self.df_model = float(rank(self.exog)-1)
+        self.df_model = float(rank_-1)
+        self.k_absorb = 0
 
     def fit(self, method="pinv", **kwargs):
         """
@@ -99,7 +116,7 @@ class RegressionModel(base.LikelihoodModel):
         method : str
             Can be "pinv", "qr".  "pinv" uses the Moore-Penrose pseudoinverse
             to solve the least squares problem. "qr" uses the QR
-            factorization.
+            factorization. It is ignored if exog is a sparse matrix.
 
         Returns
         -------
@@ -116,11 +133,24 @@ class RegressionModel(base.LikelihoodModel):
 
         The fit method uses the pseudoinverse of the design/exogenous variables
         to solve the least squares minimization.
+
+        If exog is a scipy.sparse matrix, the normal equations are solved with
+        a sparse LU factorization of X'X, and the design matrix has to have
+        full column rank.
         """
         exog = self.wexog
         endog = self.wendog
 
-        if method == "pinv":
+        if sparsetools.issparse(exog):
+            if ((not hasattr(self, '_xtx_factor')) or
+                (not hasattr(self, 'normalized_cov_params'))):
+                xtx = sparsetools.cross_product(exog)
+                self._xtx_factor = factor = sparsetools.factorize(xtx)
+                self.normalized_cov_params = sparsetools.inv_cross_product(
+                                                            xtx, factor)
+            beta = self._xtx_factor.solve(sparsetools.tdot(exog, endog))
+
+        elif method == "pinv":
             if ((not hasattr(self, 'pinv_wexog')) or
                 (not hasattr(self, 'normalized_cov_params'))):
                 #print "recalculating pinv"   #for debugging
@@ -172,7 +202,7 @@ class RegressionModel(base.LikelihoodModel):
         #SS: it needs its own predict method
         if exog is None:
             exog = self.exog
-        return np.dot(exog, params)
+        return sparsetools.dot(exog, params)
 
 class GLS(RegressionModel):
     __doc__ = """
@@ -335,11 +365,19 @@ class WLS(RegressionModel):
         multiplied by 1/sqrt(W).  If no weights are supplied the default value
         is 1 and WLS reults are the same as OLS.
     %(extra_params)s
+    absorb : array-like, optional
+        Group labels of categorical effects that are absorbed, (nobs,) for
+        a single factor or (nobs, n_factors) with one column per factor.
+        See Notes.
 
     Attributes
     ----------
     weights : array
         The stored weights supplied as an argument.
+    absorb : list
+        List of `Group` instances for the absorbed factors, or None.
+    k_absorb : int
+        Number of absorbed parameters, including the constant.
 
     See regression.GLS
 
@@ -365,20 +403,62 @@ class WLS(RegressionModel):
     If the weights are a function of the data, then the postestimation
     statistics such as fvalue and mse_model might not be correct, as the
     package does not yet support no-constant regression.
+
+    %(absorb_note)s
     """ % {'params' : base._model_params_doc,
-           'extra_params' : base._missing_param_doc}
+           'extra_params' : base._missing_param_doc,
+           'absorb_note' : _absorb_note}
 
-    def __init__(self, endog, exog, weights=1., missing='none'):
+    def __init__(self, endog, exog, weights=1., missing='none', absorb=None):
         weights = np.array(weights)
         if weights.shape == ():
             weights = np.repeat(weights, len(endog))
         weights = weights.squeeze()
+        self._absorb = absorb
         super(WLS, self).__init__(endog, exog, missing=missing,
                                   weights=weights)
         nobs = self.exog.shape[0]
         weights = self.weights
         if len(weights) != nobs and weights.size == nobs:
             raise ValueError('Weights must be scalar or same length as design')
+        if absorb is not None:
+            self._data_attr.extend(['endog_within', 'exog_within'])
+
+    def initialize(self):
+        if self._absorb is None:
+            self.absorb = None
+            return super(WLS, self).initialize()
+
+        if sparsetools.issparse(self.exog):
+            raise NotImplementedError("absorb is not available for sparse "
+                                      "exog")
+        absorb = np.asarray(self._absorb)
+        # rows dropped because of missing values in the other arrays
+        row_idx = getattr(self.data, 'missing_row_idx', None)
+        if row_idx:
+            absorb = np.delete(absorb, row_idx, axis=0)
+        if absorb.ndim == 1:
+            absorb = absorb[:,None]
+        if absorb.shape[0] != self.exog.shape[0]:
+            raise ValueError("absorb needs to have the same number of rows "
+                             "as exog")
+        self.absorb = [Group(absorb[:,i]) for i in range(absorb.shape[1])]
+        self.k_absorb = absorbed_levels(self.absorb)
+
+        # within transformation of endog and exog together
+        weights = None if isinstance(self, OLS) else self.weights
+        within, _ = group_demean_multi(np.column_stack((self.endog,
+                                                        self.exog)),
+                                       self.absorb, weights=weights)
+        self.endog_within = within[:,0]
+        self.exog_within = within[:,1:]
+        self.wendog = self.whiten(self.endog_within)
+        self.wexog = self.whiten(self.exog_within)
+        self.nobs = float(self.wexog.shape[0])
+        rank_ = rank(self.wexog)
+        self.df_resid = self.nobs - rank_ - self.k_absorb
+        # the constant is one of the absorbed parameters
+        self.df_model = float(rank_ + self.k_absorb - 1)
 
     def whiten(self, X):
         """
@@ -394,12 +474,59 @@ class WLS(RegressionModel):
         sqrt(weights)*X
         """
         #print self.weights.var()
+        if sparsetools.issparse(X):
+            return sparsetools.scale_rows(X, np.sqrt(self.weights))
         X = np.asarray(X)
         if X.ndim == 1:
             return X * np.sqrt(self.weights)
         elif X.ndim == 2:
             return np.sqrt(self.weights)[:,None]*X
 
+    @classmethod
+    def fit_chunked(cls, chunks):
+        """
+        Fit the model from data that is supplied in chunks.
+
+        Only a k x k triangular factor is kept in memory, so the data can be
+        larger than the available memory.
+
+        Parameters
+        ----------
+        chunks : iterable
+            Iterable that yields tuples of arrays `(endog, exog)` for OLS
+            and `(endog, exog, weights)` for WLS. Each `exog` chunk has to
+            have the same number of columns. If `chunks` can be iterated
+            over more than once, for example a list or the return of
+            `chunk_arrays`, then the heteroscedasticity robust standard
+            errors HC0_se and HC1_se are available from a second pass.
+
+        Returns
+        -------
+        A ChunkedRegressionResults instance.
+
+        See Also
+        --------
+        ChunkedLS
+        chunk_arrays
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import statsmodels.api as sm
+        >>> from statsmodels.regression.linear_model import chunk_arrays
+        >>> endog = np.load('endog.npy', mmap_mode='r')
+        >>> exog = np.load('exog.npy', mmap_mode='r')
+        >>> res = sm.OLS.fit_chunked(chunk_arrays(endog, exog, chunksize=100000))
+        """
+        weighted = not issubclass(cls, OLS)
+        accum = ChunkedLS()
+        for chunk in chunks:
+            if not weighted and len(chunk) != 2:
+                raise ValueError("%s chunks need to be (endog, exog) pairs" %
+                                 cls.__name__)
+            accum.partial_fit(*chunk)
+        return accum.fit(chunks=chunks)
+
     def loglike(self, params):
         """
         Returns the value of the gaussian loglikelihood function at params.
@@ -423,7 +550,7 @@ class WLS(RegressionModel):
         where :math:`W` is a diagonal matrix
         """
         nobs2 = self.nobs / 2.0
-        SSR = ss(self.wendog - np.dot(self.wexog,params))
+        SSR = ss(self.wendog - sparsetools.dot(self.wexog,params))
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with constant
         return llf
@@ -435,11 +562,19 @@ class OLS(WLS):
 
     %(params)s
     %(extra_params)s
+    absorb : array-like, optional
+        Group labels of categorical effects that are absorbed, (nobs,) for
+        a single factor or (nobs, n_factors) with one column per factor.
+        See Notes.
 
     Attributes
     ----------
     weights : scalar
         Has an attribute weights = array(1.0) due to inheritance from WLS.
+    absorb : list
+        List of `Group` instances for the absorbed factors, or None.
+    k_absorb : int
+        Number of absorbed parameters, including the constant.
 
     See regression.GLS
 
@@ -467,11 +602,14 @@ class OLS(WLS):
     Notes
     -----
     OLS, as the other models, assumes that the design matrix contains a constant.
+
+    %(absorb_note)s
     """ % {'params' : base._model_params_doc,
-           'extra_params' : base._missing_param_doc}
+           'extra_params' : base._missing_param_doc,
+           'absorb_note' : _absorb_note}
     #TODO: change example to use datasets.  This was the point of datasets!
-    def __init__(self, endog, exog=None, missing='none'):
-        super(OLS, self).__init__(endog, exog, missing=missing)
+    def __init__(self, endog, exog=None, missing='none', absorb=None):
+        super(OLS, self).__init__(endog, exog, missing=missing, absorb=absorb)
 
     def loglike(self, params):
         '''
@@ -487,11 +625,10 @@ class OLS(WLS):
         The concentrated likelihood function evaluated at params.
         '''
         nobs2 = self.nobs/2.
+        # wendog and wexog are endog and exog unless effects are absorbed
+        resid = self.wendog - sparsetools.dot(self.wexog, params)
         return -nobs2*np.log(2*np.pi)-nobs2*np.log(1/(2*nobs2) *\
-                np.dot(np.transpose(self.endog -
-                    np.dot(self.exog, params)),
-                    (self.endog - np.dot(self.exog,params)))) -\
-                    nobs2
+                np.dot(resid, resid)) - nobs2
 
     def whiten(self, Y):
         """
@@ -499,6 +636,121 @@ class OLS(WLS):
         """
         return Y
 
+class MultiOLS(base.Model):
+    __doc__ = """
+    OLS for several response variables that share one design matrix.
+
+    Parameters
+    ----------
+    endog : array-like
+        nobs x n_responses array of response variables. Each column is
+        regressed on `exog`.
+    exog : array-like
+        A nobs x k array where `nobs` is the number of observations and `k`
+        is the number of regressors. An interecept is not included by default
+        and should be added by the user. See `statsmodels.tools.add_constant`.
+    %(extra_params)s
+
+    Attributes
+    ----------
+    n_responses : int
+        The number of response variables.
+    pinv_wexog : array
+        The p x n Moore-Penrose pseudoinverse of `exog`. Only available after
+        `fit` with method="pinv".
+
+    Notes
+    -----
+    The design matrix is factored only once and the estimates and statistics
+    for all responses are computed with array operations. The results for a
+    single response are available as a RegressionResults instance from
+    `MultiOLSResults.get_result`. `missing` drops a row if any of the
+    responses is missing.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import statsmodels.api as sm
+    >>> data = sm.datasets.longley.load()
+    >>> exog = sm.add_constant(data.exog[:, 1:])
+    >>> endog = np.column_stack((data.endog, data.exog[:, 0]))
+    >>> res = sm.MultiOLS(endog, exog).fit()
+    >>> res.params.shape
+    (6, 2)
+    >>> print res.get_result(0).summary()
+    """ % {'extra_params' : base._missing_param_doc}
+
+    def __init__(self, endog, exog, missing='none'):
+        super(MultiOLS, self).__init__(endog, exog, missing=missing)
+        if self.endog.ndim == 1:
+            self.endog = self.endog[:,None]
+        self.n_responses = self.endog.shape[1]
+        self._data_attr.extend(['pinv_wexog'])
+        self.nobs = float(self.exog.shape[0])
+        rank_ = rank(self.exog)
+        self.df_resid = self.nobs - rank_
+        self.df_model = float(rank_ - 1)
+
+    def fit(self, method="pinv"):
+        """
+        Fit all responses with a single factorization of exog.
+
+        Parameters
+        ----------
+        method : str
+            Can be "pinv", "qr".  "pinv" uses the Moore-Penrose pseudoinverse
+            to solve the least squares problem. "qr" uses the QR
+            factorization.
+
+        Returns
+        -------
+        A MultiOLSResults class instance.
+        """
+        exog = self.exog
+        endog = self.endog
+        if method == "pinv":
+            if ((not hasattr(self, 'pinv_wexog')) or
+                (not hasattr(self, 'normalized_cov_params'))):
+                self.pinv_wexog = pinv_wexog = np.linalg.pinv(exog)
+                self.normalized_cov_params = np.dot(pinv_wexog, pinv_wexog.T)
+            params = np.dot(self.pinv_wexog, endog)
+
+        elif method == "qr":
+            if ((not hasattr(self, '_exog_Q')) or
+                (not hasattr(self, 'normalized_cov_params'))):
+                Q, R = np.linalg.qr(exog)
+                self._exog_Q, self._exog_R = Q, R
+                self.normalized_cov_params = np.linalg.inv(np.dot(R.T, R))
+            else:
+                Q, R = self._exog_Q, self._exog_R
+            params = np.linalg.solve(R, np.dot(Q.T, endog))
+        else:
+            raise ValueError("method %s not understood" % method)
+
+        lfit = MultiOLSResults(self, params,
+                        normalized_cov_params=self.normalized_cov_params)
+        return MultiOLSResultsWrapper(lfit)
+
+    def predict(self, params, exog=None):
+        """
+        Return linear predicted values for all responses.
+
+        Parameters
+        ----------
+        params : array
+            k x n_responses array of parameters.
+        exog : array-like, optional.
+            Design / exogenous data. Model exog is used if None.
+
+        Returns
+        -------
+        An nobs x n_responses array of fitted values
+        """
+        if exog is None:
+            exog = self.exog
+        return np.dot(exog, params)
+
+
 class GLSAR(GLS):
     __doc__ = """
     A regression model with an AR(p) covariance structure.
@@ -895,6 +1147,9 @@ class RegressionResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def fittedvalues(self):
+        if getattr(self.model, 'k_absorb', 0):
+            # includes the absorbed effects
+            return self.model.endog - self.resid
         return self.model.predict(self.params, self.model.exog)
 
     @cache_readonly
@@ -904,8 +1159,11 @@ class RegressionResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def resid(self):
-        return self.model.endog - self.model.predict(self.params,
-                self.model.exog)
+        model = self.model
+        if getattr(model, 'k_absorb', 0):
+            return model.endog_within - model.predict(self.params,
+                    model.exog_within)
+        return model.endog - model.predict(self.params, model.exog)
 
     #TODO: fix writable example
     @cache_writable()
@@ -972,7 +1230,7 @@ class RegressionResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def bse(self):
-        return np.sqrt(np.diag(self.cov_params()))
+        return np.sqrt(self.cov_params().diagonal())
 
     @cache_readonly
     def pvalues(self):
@@ -993,6 +1251,12 @@ class RegressionResults(base.LikelihoodModelResults):
 
     #TODO: make these properties reset bse
     def _HCCM(self, scale):
+        wexog = self.model.wexog
+        if sparsetools.issparse(wexog):
+            meat = sparsetools.cross_product(wexog, scale)
+            # (X'X)^(-1) is symmetric, only the result is dense
+            inv_xtx = self.normalized_cov_params
+            return inv_xtx.dot(inv_xtx.dot(meat.toarray()).T)
         H = np.dot(self.model.pinv_wexog,
             scale[:,None]*self.model.pinv_wexog.T)
         return H
@@ -1025,10 +1289,11 @@ class RegressionResults(base.LikelihoodModelResults):
         See statsmodels.RegressionResults
         """
         if self._HC2_se is None:
-            # probably could be optimized
-            h = np.diag(chain_dot(self.model.exog,
-                                  self.normalized_cov_params,
-                                  self.model.exog.T))
+            if getattr(self.model, 'k_absorb', 0):
+                raise NotImplementedError("HC2_se is not available with "
+                                          "absorbed effects")
+            h = sparsetools.leverage(self.model.exog,
+                                     self.normalized_cov_params)
             self.het_scale = self.resid**2/(1-h)
             self.cov_HC2 = self._HCCM(self.het_scale)
             self._HC2_se = np.sqrt(np.diag(self.cov_HC2))
@@ -1040,10 +1305,11 @@ class RegressionResults(base.LikelihoodModelResults):
         See statsmodels.RegressionResults
         """
         if self._HC3_se is None:
-            # above probably could be optimized to only calc the diag
-            h = np.diag(chain_dot(self.model.exog,
-                                  self.normalized_cov_params,
-                                  self.model.exog.T))
+            if getattr(self.model, 'k_absorb', 0):
+                raise NotImplementedError("HC3_se is not available with "
+                                          "absorbed effects")
+            h = sparsetools.leverage(self.model.exog,
+                                     self.normalized_cov_params)
             self.het_scale=(self.resid/(1-h))**2
             self.cov_HC3 = self._HCCM(self.het_scale)
             self._HC3_se = np.sqrt(np.diag(self.cov_HC3))
@@ -1188,7 +1454,10 @@ class RegressionResults(base.LikelihoodModelResults):
         #TODO: reuse condno from somewhere else ?
         #condno = np.linalg.cond(np.dot(self.wexog.T, self.wexog))
         wexog = self.model.wexog
-        eigvals = np.linalg.linalg.eigvalsh(np.dot(wexog.T, wexog))
+        xtx = sparsetools.cross_product(wexog)
+        if sparsetools.issparse(xtx):
+            xtx = xtx.toarray()
+        eigvals = np.linalg.linalg.eigvalsh(xtx)
         eigvals = np.sort(eigvals) #in increasing order
         condno = np.sqrt(eigvals[-1]/eigvals[0])
 
@@ -1607,6 +1876,7 @@ class OLSResults(RegressionResults):
         >>> fitted.test_beta([0], [1])
         >>> (1.7894660442330235e-07, 27.248146353709153)
         """
+        from statsmodels.emplike.elregress import _ELRegOpts
         params = np.copy(self.params)
         opt_fun_inst = _ELRegOpts() # to store weights
         if len(param_nums) == len(params):
@@ -1725,6 +1995,532 @@ class OLSResults(RegressionResults):
         return (lowerl, upperl)
 
 
+class _ArrayChunks(object):
+    """
+    Re-iterable sequence of row slices of equally long arrays.
+    """
+    def __init__(self, arrays, chunksize):
+        self.arrays = arrays
+        self.chunksize = int(chunksize)
+        self.nobs = len(arrays[0])
+
+    def __iter__(self):
+        for start in xrange(0, self.nobs, self.chunksize):
+            stop = start + self.chunksize
+            yield tuple(arr[start:stop] for arr in self.arrays)
+
+    def __len__(self):
+        return -(-self.nobs // self.chunksize)
+
+
+def chunk_arrays(endog, exog, weights=None, chunksize=100000):
+    """
+    Split data arrays into row chunks for `fit_chunked`.
+
+    Parameters
+    ----------
+    endog : array-like
+        1d endogenous response variable.
+    exog : array-like
+        nobs x k design matrix.
+    weights : array-like, optional
+        1d array of weights for WLS.
+    chunksize : int
+        Number of observations in each chunk.
+
+    Returns
+    -------
+    chunks : iterable
+        Iterable of `(endog, exog)` or `(endog, exog, weights)` tuples that
+        can be iterated over more than once.
+
+    Notes
+    -----
+    The chunks are slices of the original arrays. If the arrays are opened
+    with `np.load(..., mmap_mode='r')` or `np.memmap`, then only one chunk at
+    a time is read into memory.
+    """
+    if len(endog) != len(exog):
+        raise ValueError("endog and exog need to have the same length")
+    arrays = (endog, exog)
+    if weights is not None:
+        if len(weights) != len(endog):
+            raise ValueError("weights need to have the same length as endog")
+        arrays += (weights,)
+    return _ArrayChunks(arrays, chunksize)
+
+
+class ChunkedLS(object):
+    """
+    Least squares estimation from data that is added in chunks.
+
+    Attributes
+    ----------
+    nobs : float
+        The number of observations seen so far.
+    k_exog : int
+        The number of regressors.
+    endog_names : str
+        The name of endog, taken from the first chunk if it is a named
+        pandas Series and 'y' otherwise.
+    exog_names : list of str
+        The names of the regressors, taken from the first chunk if it is a
+        pandas DataFrame and 'const', 'x1', ... otherwise.
+
+    Notes
+    -----
+    The triangular factor R of the QR decomposition of the whitened and
+    augmented data [X, y] is updated with each chunk, so memory usage only
+    depends on the number of regressors and the size of a single chunk. The
+    estimates are as accurate as `fit(method="qr")` on the full data.
+
+    Examples
+    --------
+    >>> accum = ChunkedLS()
+    >>> for endog, exog in chunks:
+    ...     accum.partial_fit(endog, exog)
+    >>> res = accum.fit()
+    """
+    def __init__(self):
+        self.nobs = 0.
+        self.k_exog = None
+        self.endog_names = None
+        self.exog_names = None
+        self._r = None
+        self.wsum = 0.
+        self.wysum = 0.
+
+    def partial_fit(self, endog, exog, weights=None):
+        """
+        Add a chunk of observations.
+
+        Parameters
+        ----------
+        endog : array-like
+            1d endogenous response variable of the chunk.
+        exog : array-like
+            Design matrix of the chunk.
+        weights : array-like, optional
+            1d array of WLS weights of the chunk.
+
+        Returns
+        -------
+        self
+        """
+        endog_name = getattr(endog, 'name', None)
+        exog_names = getattr(exog, 'columns', None)
+        endog = np.asarray(endog, dtype=np.float64).squeeze()
+        exog = np.asarray(exog, dtype=np.float64)
+        if endog.ndim == 0:
+            endog = endog[None]
+        if exog.ndim == 1:
+            exog = exog[:,None]
+        nobs = len(endog)
+        if exog.shape[0] != nobs:
+            raise ValueError("endog and exog chunks have different lengths")
+        if self.k_exog is None:
+            self.k_exog = exog.shape[1]
+            self._r = np.zeros((self.k_exog + 1, self.k_exog + 1))
+            self.endog_names = endog_name if endog_name else 'y'
+            if exog_names is not None:
+                self.exog_names = list(exog_names)
+            else:
+                self.exog_names = _make_exog_names(exog)
+        elif exog.shape[1] != self.k_exog:
+            raise ValueError("exog chunk has %d columns, expected %d" %
+                             (exog.shape[1], self.k_exog))
+
+        if weights is None:
+            wdata = np.column_stack((exog, endog))
+            self.wsum += nobs
+            self.wysum += endog.sum()
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape == ():
+                weights = np.repeat(weights, nobs)
+            wdata = np.sqrt(weights)[:,None] * np.column_stack((exog, endog))
+            self.wsum += weights.sum()
+            self.wysum += np.dot(weights, endog)
+
+        self._r = np.linalg.qr(np.vstack((self._r, wdata)), mode='r')
+        self.nobs += nobs
+        return self
+
+    @property
+    def xtx(self):
+        """Whitened cross-product of exog :math:`X^{T}WX`"""
+        r = self._r[:-1, :-1]
+        return np.dot(r.T, r)
+
+    @property
+    def ssr(self):
+        """Sum of squared whitened residuals"""
+        return self._r[-1, -1]**2
+
+    @property
+    def yty(self):
+        """Whitened sum of squares of endog :math:`y^{T}Wy`"""
+        return np.dot(self._r[:, -1], self._r[:, -1])
+
+    def fit(self, chunks=None):
+        """
+        Estimate the parameters from the accumulated data.
+
+        Parameters
+        ----------
+        chunks : iterable, optional
+            The data that has been added with `partial_fit`, in the format
+            described in `WLS.fit_chunked`. It is only needed for the
+            robust standard errors and has to be iterable again.
+
+        Returns
+        -------
+        A ChunkedRegressionResults instance.
+        """
+        if self.k_exog is None:
+            raise ValueError("no data has been added with partial_fit")
+        r = self._r[:-1, :-1]
+        rank_ = rank(r)
+        self.df_model = float(rank_ - 1)
+        self.df_resid = self.nobs - rank_
+        rinv = np.linalg.pinv(r)
+        params = np.dot(rinv, self._r[:-1, -1])
+        normalized_cov_params = np.dot(rinv, rinv.T)
+        return ChunkedRegressionResults(self, params,
+                        normalized_cov_params=normalized_cov_params,
+                        chunks=chunks)
+
+    def _hc_meat(self, params, chunks):
+        """
+        Second pass over the data to get sum of resid**2 * x x'
+        """
+        meat = np.zeros((self.k_exog, self.k_exog))
+        for chunk in chunks:
+            endog = np.asarray(chunk[0], dtype=np.float64).squeeze()
+            exog = np.asarray(chunk[1], dtype=np.float64)
+            if exog.ndim == 1:
+                exog = exog[:,None]
+            resid = endog - np.dot(exog, params)
+            if len(chunk) > 2 and chunk[2] is not None:
+                weights = np.asarray(chunk[2], dtype=np.float64)
+                exog = np.sqrt(weights)[:,None] * exog
+            meat += np.dot(exog.T, resid[:,None]**2 * exog)
+        return meat
+
+
+class ChunkedRegressionResults(RegressionResults):
+    """
+    Results of a least squares fit computed from cross-products.
+
+    Has the same statistics as RegressionResults as far as they can be
+    computed from `ChunkedLS` without the data. Residuals and fitted values
+    are not available. HC0_se and HC1_se need a second pass over the data
+    and are only available if the chunks were given to `ChunkedLS.fit`.
+
+    See Also
+    --------
+    RegressionResults
+    """
+    def __init__(self, model, params, normalized_cov_params=None, scale=1.,
+                 chunks=None):
+        super(ChunkedRegressionResults, self).__init__(model, params,
+                                                  normalized_cov_params, scale)
+        # a single-use iterator cannot be used for another pass
+        if chunks is not None and iter(chunks) is chunks:
+            chunks = None
+        self._chunks = chunks
+
+    @cache_readonly
+    def nobs(self):
+        return self.model.nobs
+
+    @cache_readonly
+    def fittedvalues(self):
+        raise ValueError("fittedvalues are not available for chunked fits")
+
+    @cache_readonly
+    def wresid(self):
+        raise ValueError("residuals are not available for chunked fits")
+
+    @cache_readonly
+    def resid(self):
+        raise ValueError("residuals are not available for chunked fits")
+
+    @cache_writable()
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def ssr(self):
+        return self.model.ssr
+
+    @cache_readonly
+    def centered_tss(self):
+        model = self.model
+        return model.yty - model.wysum**2 / model.wsum
+
+    @cache_readonly
+    def uncentered_tss(self):
+        return self.model.yty
+
+    @cache_readonly
+    def llf(self):
+        nobs2 = self.nobs / 2.0
+        llf = -np.log(self.ssr) * nobs2
+        llf -= (1 + np.log(np.pi/nobs2)) * nobs2
+        return llf
+
+    def _chunked_HCCM(self):
+        if self._chunks is None:
+            raise ValueError("robust standard errors need the chunks to be "
+                             "iterable more than once")
+        meat = self.model._hc_meat(self.params, self._chunks)
+        return chain_dot(self.normalized_cov_params, meat,
+                         self.normalized_cov_params)
+
+    @property
+    def HC0_se(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        if self._HC0_se is None:
+            self.cov_HC0 = self._chunked_HCCM()
+            self._HC0_se = np.sqrt(np.diag(self.cov_HC0))
+        return self._HC0_se
+
+    @property
+    def HC1_se(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        if self._HC1_se is None:
+            if not hasattr(self, 'cov_HC0'):
+                self.HC0_se
+            self.cov_HC1 = self.nobs / self.df_resid * self.cov_HC0
+            self._HC1_se = np.sqrt(np.diag(self.cov_HC1))
+        return self._HC1_se
+
+    @property
+    def HC2_se(self):
+        raise NotImplementedError("HC2_se needs the hat matrix diagonal")
+
+    @property
+    def HC3_se(self):
+        raise NotImplementedError("HC3_se needs the hat matrix diagonal")
+
+    def summary(self, yname=None, xname=None, title=None, alpha=.05):
+        """Summarize the Regression Results
+
+        Parameters
+        -----------
+        yname : string, optional
+            Default is `model.endog_names`
+        xname : list of strings, optional
+            Default is `model.exog_names`
+        title : string, optional
+            Title for the top table. If not None, then this replaces the
+            default title
+        alpha : float
+            significance level for the confidence intervals
+
+        Returns
+        -------
+        smry : Summary instance
+            this holds the summary tables and text, which can be printed or
+            converted to various output formats.
+
+        Notes
+        -----
+        The residual diagnostics of `RegressionResults.summary`, Omnibus,
+        Jarque-Bera and Durbin-Watson, need the residuals and are not
+        included. The condition number is computed from the accumulated
+        cross-product.
+        """
+        eigvals = np.sort(np.linalg.eigvalsh(self.model.xtx))
+        condno = np.sqrt(eigvals[-1]/eigvals[0])
+
+        top_left = [('Dep. Variable:', None),
+                    ('Model:', None),
+                    ('Method:', ['Least Squares']),
+                    ('Date:', None),
+                    ('Time:', None),
+                    ('No. Observations:', None),
+                    ('Df Residuals:', None),
+                    ('Df Model:', None),
+                    ]
+
+        top_right = [('R-squared:', ["%#8.3f" % self.rsquared]),
+                     ('Adj. R-squared:', ["%#8.3f" % self.rsquared_adj]),
+                     ('F-statistic:', ["%#8.4g" % self.fvalue] ),
+                     ('Prob (F-statistic):', ["%#6.3g" % self.f_pvalue]),
+                     ('Log-Likelihood:', None),
+                     ('AIC:', ["%#8.4g" % self.aic]),
+                     ('BIC:', ["%#8.4g" % self.bic]),
+                     ('Cond. No.', ["%#8.3g" % condno])
+                     ]
+
+        if title is None:
+            title = self.model.__class__.__name__ + ' ' + "Regression Results"
+
+        from statsmodels.iolib.summary import Summary
+        smry = Summary()
+        smry.add_table_2cols(self, gleft=top_left, gright=top_right,
+                          yname=yname, xname=xname, title=title)
+        smry.add_table_params(self, yname=yname, xname=xname, alpha=alpha,
+                             use_t=True)
+
+        if eigvals[0] < 1e-10:
+            wstr = "The smallest eigenvalue is %6.3g. This might indicate "
+            wstr += "that there are\n"
+            wstr += "strong multicollinearity problems or that the design "
+            wstr += "matrix is singular."
+            smry.add_extra_txt([wstr % eigvals[0]])
+        elif condno > 1000:
+            wstr = "The condition number is large, %6.3g. This might "
+            wstr += "indicate that there are\n"
+            wstr += "strong multicollinearity or other numerical "
+            wstr += "problems."
+            smry.add_extra_txt([wstr % condno])
+
+        return smry
+
+
+class MultiOLSResults(base.Results):
+    """
+    Results for a MultiOLS model, one column for each response.
+
+    Attributes
+    ----------
+    params : array
+        k x n_responses array of the estimated coefficients.
+    bse : array
+        k x n_responses array of standard errors.
+    tvalues : array
+        k x n_responses array of t-statistics.
+    pvalues : array
+        k x n_responses array of two-sided p-values of the t-statistics.
+    ssr : array
+        Sum of squared residuals for each response.
+    scale : array
+        Residual variance ssr/df_resid for each response.
+    rsquared : array
+        R-squared for each response, the model is assumed to have a constant.
+    rsquared_adj : array
+        Adjusted R-squared for each response.
+    fvalue : array
+        F-statistic that all slope coefficients are zero for each response.
+    llf : array
+        Value of the loglikelihood function for each response.
+
+    See Also
+    --------
+    RegressionResults
+    """
+    def __init__(self, model, params, normalized_cov_params=None):
+        super(MultiOLSResults, self).__init__(model, params)
+        self.normalized_cov_params = normalized_cov_params
+        self._cache = resettable_cache()
+
+    @cache_readonly
+    def nobs(self):
+        return self.model.nobs
+
+    @cache_readonly
+    def df_resid(self):
+        return self.model.df_resid
+
+    @cache_readonly
+    def df_model(self):
+        return self.model.df_model
+
+    @cache_readonly
+    def fittedvalues(self):
+        return self.model.predict(self.params)
+
+    @cache_readonly
+    def resid(self):
+        return self.model.endog - self.fittedvalues
+
+    @cache_readonly
+    def ssr(self):
+        resid = self.resid
+        return (resid * resid).sum(0)
+
+    @cache_readonly
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def centered_tss(self):
+        centered_endog = self.model.endog - self.model.endog.mean(0)
+        return (centered_endog * centered_endog).sum(0)
+
+    @cache_readonly
+    def ess(self):
+        return self.centered_tss - self.ssr
+
+    @cache_readonly
+    def rsquared(self):
+        return 1 - self.ssr / self.centered_tss
+
+    @cache_readonly
+    def rsquared_adj(self):
+        return 1 - (self.nobs - 1) / self.df_resid * (1 - self.rsquared)
+
+    @cache_readonly
+    def fvalue(self):
+        return (self.ess / self.df_model) / (self.ssr / self.df_resid)
+
+    @cache_readonly
+    def f_pvalue(self):
+        return stats.f.sf(self.fvalue, self.df_model, self.df_resid)
+
+    @cache_readonly
+    def llf(self):
+        nobs2 = self.nobs / 2.0
+        llf = -np.log(self.ssr) * nobs2
+        llf -= (1 + np.log(np.pi/nobs2)) * nobs2
+        return llf
+
+    @cache_readonly
+    def bse(self):
+        return np.sqrt(np.outer(np.diag(self.normalized_cov_params),
+                                self.scale))
+
+    @cache_readonly
+    def tvalues(self):
+        return self.params / self.bse
+
+    @cache_readonly
+    def pvalues(self):
+        return stats.t.sf(np.abs(self.tvalues), self.df_resid) * 2
+
+    def get_result(self, idx):
+        """
+        Regression results for a single response.
+
+        Parameters
+        ----------
+        idx : int
+            Column index of the response in endog.
+
+        Returns
+        -------
+        A RegressionResults instance that shares the factorization of exog
+        with this instance.
+        """
+        model = self.model
+        mod = OLS(model.endog[:, idx], model.exog)
+        mod.normalized_cov_params = model.normalized_cov_params
+        if hasattr(model, 'pinv_wexog'):
+            mod.pinv_wexog = model.pinv_wexog
+        if hasattr(model, '_exog_Q'):
+            mod._exog_Q, mod._exog_R = model._exog_Q, model._exog_R
+        lfit = OLSResults(mod, self.params[:, idx],
+                          normalized_cov_params=model.normalized_cov_params)
+        return RegressionResultsWrapper(lfit)
+
+
 class RegressionResultsWrapper(wrap.ResultsWrapper):
 
     _attrs = {
@@ -1754,6 +2550,21 @@ wrap.populate_wrapper(RegressionResultsWrapper,
                       RegressionResults)
 
 
+class MultiOLSResultsWrapper(wrap.ResultsWrapper):
+    _wrap_attrs = {
+        'params' : 'columns_eq',
+        'bse' : 'columns_eq',
+        'tvalues' : 'columns_eq',
+        'pvalues' : 'columns_eq',
+        'resid' : 'rows',
+        'fittedvalues' : 'rows',
+        'normalized_cov_params' : 'cov',
+    }
+    _wrap_methods = {}
+wrap.populate_wrapper(MultiOLSResultsWrapper,
+                      MultiOLSResults)
+
+
 if __name__ == "__main__":
     import statsmodels.api as sm
     data = sm.datasets.longley.load()
@@ -7,7 +7,7 @@ from numpy.testing import (assert_almost_equal, assert_, assert_approx_equal,
 from scipy.linalg import toeplitz
 from statsmodels.tools.tools import add_constant
 from statsmodels.regression.linear_model import (OLS, GLSAR, WLS, GLS,
-        yule_walker)
+        yule_walker, ChunkedLS, chunk_arrays, MultiOLS)
 from statsmodels.datasets import longley
 from nose import SkipTest
 from scipy.stats import t as student_t
@@ -546,6 +546,349 @@ class TestGLS_OLS(CheckRegressionResults):
 #        pass
 
 
+class CheckChunkedResults(object):
+    # compare fit from cross-products with the full data fit in res2
+
+    def test_params(self):
+        assert_almost_equal(self.res1.params, self.res2.params, DECIMAL_4)
+
+    def test_bse(self):
+        assert_almost_equal(self.res1.bse, self.res2.bse, DECIMAL_4)
+
+    def test_degrees(self):
+        assert_equal(self.res1.nobs, self.res2.nobs)
+        assert_equal(self.res1.df_model, self.res2.df_model)
+        assert_equal(self.res1.df_resid, self.res2.df_resid)
+
+    def test_stats(self):
+        for attr in ['ssr', 'rsquared', 'rsquared_adj', 'fvalue', 'llf',
+                     'aic', 'bic']:
+            assert_approx_equal(getattr(self.res1, attr),
+                                getattr(self.res2, attr), 7)
+
+    def test_HC_errors(self):
+        # relative, the constant in Longley has large standard errors
+        assert_almost_equal(self.res1.HC0_se / self.res2.HC0_se, 1, DECIMAL_7)
+        assert_almost_equal(self.res1.HC1_se / self.res2.HC1_se, 1, DECIMAL_7)
+
+    def test_names(self):
+        assert_equal(self.res1.model.endog_names, self.res2.model.endog_names)
+        assert_equal(self.res1.model.exog_names, self.res2.model.exog_names)
+
+    def test_tests(self):
+        k = len(self.res2.params)
+        r_matrix = np.eye(k)[1:3]
+        assert_almost_equal(self.res1.conf_int(), self.res2.conf_int(),
+                            DECIMAL_4)
+        t1, t2 = self.res1.t_test(r_matrix), self.res2.t_test(r_matrix)
+        assert_almost_equal(t1.tvalue, t2.tvalue, DECIMAL_4)
+        assert_almost_equal(t1.pvalue, t2.pvalue, DECIMAL_4)
+        f1, f2 = self.res1.f_test(r_matrix), self.res2.f_test(r_matrix)
+        assert_almost_equal(f1.fvalue, f2.fvalue, DECIMAL_4)
+        assert_almost_equal(f1.pvalue, f2.pvalue, DECIMAL_4)
+        hypothesis = '%s = 0' % self.res2.model.exog_names[1]
+        t1, t2 = self.res1.t_test(hypothesis), self.res2.t_test(hypothesis)
+        assert_almost_equal(t1.tvalue, t2.tvalue, DECIMAL_4)
+
+    def test_summary(self):
+        text = self.res1.summary().as_text()
+        for name in self.res2.model.exog_names:
+            assert_(name in text)
+        assert_('Durbin-Watson' not in text)
+
+class TestOLSChunked(CheckChunkedResults):
+    @classmethod
+    def setupClass(cls):
+        data = longley.load()
+        exog = add_constant(data.exog)
+        cls.res1 = OLS.fit_chunked(chunk_arrays(data.endog, exog, chunksize=5))
+        cls.res2 = OLS(data.endog, exog).fit()
+
+class TestWLSChunked(CheckChunkedResults):
+    @classmethod
+    def setupClass(cls):
+        from statsmodels.datasets.ccard import load
+        dta = load()
+        exog = add_constant(dta.exog, prepend=False)
+        weights = 1 / dta.exog[:,2]
+        chunks = list(chunk_arrays(dta.endog, exog, weights, chunksize=10))
+        cls.res1 = WLS.fit_chunked(chunks)
+        cls.res2 = WLS(dta.endog, exog, weights=weights).fit()
+
+def test_chunked_partial_fit():
+    data = longley.load()
+    exog = add_constant(data.exog)
+    accum = ChunkedLS()
+    for endog_i, exog_i in chunk_arrays(data.endog, exog, chunksize=7):
+        accum.partial_fit(endog_i, exog_i)
+    res1 = accum.fit()
+    res2 = OLS(data.endog, exog).fit()
+    assert_almost_equal(res1.params, res2.params, DECIMAL_4)
+    # robust standard errors need a second pass over the data
+    assert_raises(ValueError, getattr, res1, 'HC0_se')
+    res3 = OLS.fit_chunked(iter(chunk_arrays(data.endog, exog, chunksize=7)))
+    assert_raises(ValueError, getattr, res3, 'HC0_se')
+    assert_raises(ValueError, accum.partial_fit, data.endog, exog[:,:2])
+    assert_raises(ValueError, OLS.fit_chunked,
+                  [(data.endog, exog, np.ones(len(exog)))])
+
+
+def test_chunked_names():
+    import pandas
+    data = longley.load_pandas()
+    exog = add_constant(data.exog, prepend=False)
+    accum = ChunkedLS()
+    for start in range(0, len(exog), 5):
+        accum.partial_fit(data.endog[start:start+5],
+                          exog[start:start+5])
+    res1 = accum.fit()
+    res2 = OLS(data.endog, exog).fit()
+    assert_equal(accum.endog_names, res2.model.endog_names)
+    assert_equal(accum.exog_names, res2.model.exog_names)
+    t1 = res1.t_test('GNP = 0')
+    t2 = res2.t_test('GNP = 0')
+    assert_almost_equal(t1.tvalue, t2.tvalue, DECIMAL_4)
+
+
+class TestMultiOLS(object):
+    @classmethod
+    def setupClass(cls):
+        data = longley.load()
+        exog = add_constant(data.exog[:,1:])
+        endog = np.column_stack((data.endog, data.exog[:,0],
+                                 np.log(data.endog)))
+        cls.res1 = MultiOLS(endog, exog).fit()
+        cls.res_qr = MultiOLS(endog, exog).fit(method="qr")
+        cls.res2 = [OLS(endog[:,i], exog).fit() for i in range(3)]
+
+    def test_arrays(self):
+        for attr in ['params', 'bse', 'tvalues', 'pvalues', 'resid']:
+            res2 = np.column_stack([getattr(r, attr) for r in self.res2])
+            assert_almost_equal(getattr(self.res1, attr), res2, DECIMAL_4)
+
+    def test_stats(self):
+        for attr in ['ssr', 'scale', 'rsquared', 'rsquared_adj', 'fvalue',
+                     'f_pvalue', 'llf']:
+            res2 = [getattr(r, attr) for r in self.res2]
+            assert_almost_equal(getattr(self.res1, attr) / res2, 1, DECIMAL_7)
+
+    def test_qr(self):
+        assert_almost_equal(self.res_qr.params, self.res1.params, 6)
+
+    def test_get_result(self):
+        for i, res2 in enumerate(self.res2):
+            res1 = self.res1.get_result(i)
+            assert_almost_equal(res1.params, res2.params, DECIMAL_4)
+            assert_almost_equal(res1.bse, res2.bse, DECIMAL_4)
+            assert_almost_equal(res1.HC0_se, res2.HC0_se, DECIMAL_4)
+            assert_equal(res1.df_resid, res2.df_resid)
+
+def test_multiols_pandas():
+    import pandas
+    data = longley.load_pandas()
+    exog = add_constant(data.exog.ix[:,1:], prepend=True)
+    endog = pandas.DataFrame({'TOTEMP' : data.endog,
+                              'GNPDEFL' : data.exog['GNPDEFL']})
+    res = MultiOLS(endog, exog).fit()
+    assert_equal(list(res.params.columns), list(endog.columns))
+    assert_equal(list(res.bse.index), list(exog.columns))
+    res2 = OLS(data.endog, exog).fit()
+    assert_almost_equal(res.params['TOTEMP'].values, res2.params.values,
+                        DECIMAL_4)
+
+
+class CheckSparseResults(object):
+    decimal = 10
+
+    def test_params(self):
+        assert_almost_equal(self.res1.params, self.res2.params, self.decimal)
+
+    def test_bse(self):
+        assert_almost_equal(self.res1.bse, self.res2.bse, self.decimal)
+
+    def test_HC(self):
+        assert_almost_equal(self.res1.HC0_se, self.res2.HC0_se, self.decimal)
+        assert_almost_equal(self.res1.HC3_se, self.res2.HC3_se, self.decimal)
+
+    def test_stats(self):
+        assert_almost_equal(self.res1.rsquared, self.res2.rsquared,
+                            self.decimal)
+        assert_almost_equal(self.res1.llf, self.res2.llf, self.decimal)
+        assert_almost_equal(self.res1.fittedvalues, self.res2.fittedvalues,
+                            self.decimal)
+        assert_equal(self.res1.df_resid, self.res2.df_resid)
+
+    def test_predict(self):
+        exog = self.res1.model.exog[:5]
+        assert_almost_equal(self.res1.predict(exog),
+                            self.res2.predict(exog.toarray()), self.decimal)
+
+    def test_summary(self):
+        self.res1.summary()
+
+    def test_tests(self):
+        from statsmodels.tools.sparsetools import InverseCrossProduct
+        assert_(isinstance(self.res1.cov_params(), InverseCrossProduct))
+        r_matrix = np.eye(len(self.res1.params))[[0, 2]]
+        t1 = self.res1.t_test(r_matrix)
+        t2 = self.res2.t_test(r_matrix)
+        assert_almost_equal(t1.tvalue, t2.tvalue, self.decimal)
+        f1 = self.res1.f_test(r_matrix)
+        f2 = self.res2.f_test(r_matrix)
+        assert_almost_equal(f1.fvalue, f2.fvalue, self.decimal)
+        assert_almost_equal(self.res1.cov_params(column=[0, 2]),
+                            self.res2.cov_params(column=[0, 2]), self.decimal)
+
+def _sparse_design():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(987125)
+    nobs = 200
+    groups = np.random.randint(0, 10, size=nobs)
+    x = np.random.normal(size=nobs)
+    exog = sparse.hstack((sparse.csr_matrix(x[:,None]),
+                          dummy_sparse(groups))).tocsr()
+    endog = x + .2 * groups + np.random.normal(size=nobs)
+    return endog, exog
+
+class TestOLSSparse(CheckSparseResults):
+    @classmethod
+    def setupClass(cls):
+        endog, exog = _sparse_design()
+        cls.res1 = OLS(endog, exog).fit()
+        cls.res2 = OLS(endog, exog.toarray()).fit()
+
+class TestWLSSparse(CheckSparseResults):
+    @classmethod
+    def setupClass(cls):
+        endog, exog = _sparse_design()
+        weights = np.linspace(1, 2, len(endog))
+        cls.res1 = WLS(endog, exog, weights).fit()
+        cls.res2 = WLS(endog, exog.toarray(), weights).fit()
+
+def test_sparse_rank_deficient():
+    from scipy import sparse
+    endog, exog = _sparse_design()
+    # constant and a full set of dummies
+    exog = sparse.hstack((np.ones((len(endog), 1)), exog)).tocsr()
+    assert_raises(ValueError, OLS(endog, exog).fit)
+
+
+class CheckAbsorbResults(object):
+    decimal = 7
+
+    def test_params(self):
+        k_vars = len(self.res1.params)
+        assert_almost_equal(self.res1.params, self.res2.params[:k_vars],
+                            self.decimal)
+        assert_almost_equal(self.res1.bse, self.res2.bse[:k_vars],
+                            self.decimal)
+        assert_almost_equal(self.res1.HC0_se, self.res2.HC0_se[:k_vars],
+                            self.decimal)
+
+    def test_stats(self):
+        assert_equal(self.res1.df_resid, self.res2.df_resid)
+        assert_equal(self.res1.df_model, self.res2.df_model)
+        assert_almost_equal(self.res1.rsquared, self.res2.rsquared,
+                            self.decimal)
+        assert_almost_equal(self.res1.fvalue, self.res2.fvalue, 5)
+        assert_almost_equal(self.res1.llf, self.res2.llf, self.decimal)
+        assert_almost_equal(self.res1.resid, self.res2.resid, self.decimal)
+        assert_almost_equal(self.res1.fittedvalues, self.res2.fittedvalues,
+                            self.decimal)
+
+    def test_cov_cluster(self):
+        from statsmodels.stats.sandwich_covariance import cov_cluster
+        k_vars = len(self.res1.params)
+        cov1 = cov_cluster(self.res1, self.groups[:,0])
+        cov2 = cov_cluster(self.res2, self.groups[:,0])
+        assert_almost_equal(cov1, cov2[:k_vars,:k_vars], self.decimal)
+
+def _absorb_design():
+    np.random.seed(987125)
+    nobs = 300
+    groups = np.column_stack((np.random.randint(0, 20, size=nobs),
+                              np.random.randint(0, 6, size=nobs)))
+    exog = np.random.normal(size=(nobs, 2)) + .1 * groups[:,:1]
+    endog = (exog.sum(1) + .2 * groups[:,0] - .3 * groups[:,1] +
+             np.random.normal(size=nobs))
+    # dummy variables with the first level of each group as reference
+    dummies = [(g[:,None] == np.unique(g)[1:]) for g in groups.T]
+    exog_dummies = np.column_stack([exog, np.ones(nobs)] + dummies)
+    return endog, exog, exog_dummies.astype(float), groups
+
+class TestOLSAbsorb(CheckAbsorbResults):
+    @classmethod
+    def setupClass(cls):
+        endog, exog, exog_dummies, groups = _absorb_design()
+        cls.groups = groups
+        cls.res1 = OLS(endog, exog, absorb=groups).fit()
+        cls.res2 = OLS(endog, exog_dummies).fit()
+
+class TestWLSAbsorb(CheckAbsorbResults):
+    @classmethod
+    def setupClass(cls):
+        endog, exog, exog_dummies, groups = _absorb_design()
+        weights = np.linspace(1, 2, len(endog))
+        cls.groups = groups
+        cls.res1 = WLS(endog, exog, weights, absorb=groups).fit()
+        cls.res2 = WLS(endog, exog_dummies, weights).fit()
+
+def test_absorb_level():
+    # a large level of exog does not make its within variation vanish
+    endog, exog, exog_dummies, groups = _absorb_design()
+    res0 = OLS(endog, exog_dummies).fit()
+    exog = exog + 1e6
+    exog_dummies = exog_dummies.copy()
+    exog_dummies[:,:2] += 1e6
+    res1 = OLS(endog, exog, absorb=groups).fit()
+    res2 = OLS(endog, exog_dummies).fit()
+    assert_almost_equal(res1.params, res2.params[:2], 6)
+    # the rank of the dummy design is underestimated at this level
+    assert_almost_equal(res1.bse, res0.bse[:2], 10)
+    assert_equal(res1.df_resid, res0.df_resid)
+
+def test_absorb_nested():
+    from statsmodels.tools.grouputils import absorbed_levels
+    np.random.seed(987125)
+    group = np.random.randint(0, 10, size=100)
+    # the second group is nested in the first group
+    assert_equal(absorbed_levels([group, group // 2]), 10)
+    assert_equal(absorbed_levels([group, np.arange(100) % 3]), 12)
+
+def test_absorb_levels_no_csgraph():
+    # union-find for scipy < 0.11 without scipy.sparse.csgraph
+    import sys
+    from statsmodels.tools.grouputils import absorbed_levels
+    np.random.seed(987125)
+    group0 = np.random.randint(0, 30, size=100)
+    group1 = np.random.randint(0, 40, size=100)
+    expected = [absorbed_levels([group0, group0 // 2]),
+                absorbed_levels([group0, group1])]
+    csgraph = sys.modules.get('scipy.sparse.csgraph')
+    sys.modules['scipy.sparse.csgraph'] = None
+    try:
+        actual = [absorbed_levels([group0, group0 // 2]),
+                  absorbed_levels([group0, group1])]
+    finally:
+        if csgraph is None:
+            del sys.modules['scipy.sparse.csgraph']
+        else:
+            sys.modules['scipy.sparse.csgraph'] = csgraph
+    assert_equal(actual, expected)
+    assert_equal(actual[0], len(np.unique(group0)))
+
+def test_absorb_missing():
+    endog, exog, exog_dummies, groups = _absorb_design()
+    endog = endog.copy()
+    endog[[3, 10]] = np.nan
+    res1 = OLS(endog, exog, absorb=groups[:,0], missing='drop').fit()
+    mask = ~np.isnan(endog)
+    res2 = OLS(endog[mask], exog[mask], absorb=groups[mask,0]).fit()
+    assert_almost_equal(res1.params, res2.params, DECIMAL_7)
+    assert_equal(res1.df_resid, res2.df_resid)
+
+
 class TestYuleWalker(object):
     @classmethod
     def setupClass(cls):
@@ -27,6 +27,8 @@ from .sandwich_covariance import (
             se_cov
             )
 
+from .bootstrap import bootstrap, BootstrapResults
+
 from weightstats import DescrStatsW
 
 from descriptivestats import Describe
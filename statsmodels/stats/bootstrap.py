@@ -0,0 +1,479 @@
+'''Bootstrap for the parameter estimates of models with independent or
+weakly dependent observations
+
+The replications are refit with the original parameters as start_params.
+Linear regression models, OLS and WLS, are not refit, the least squares
+solution is calculated directly from the resampled data.
+
+Each replication uses its own random number generator that is seeded from
+a seed sequence drawn once, so the results only depend on the seed and not
+on the number of parallel jobs.
+
+License: BSD-3
+
+References
+----------
+Davison, A.C. and Hinkley, D.V. 1997. Bootstrap Methods and their
+    Application. Cambridge University Press.
+Efron, B. and Tibshirani, R.J. 1993. An Introduction to the Bootstrap.
+    Chapman & Hall.
+
+'''
+
+import inspect
+import types
+
+import numpy as np
+from scipy import stats
+
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools import sparsetools
+
+
+def bootstrap_indices(nobs, random_state, block_size=None):
+    '''indices of the observations for one bootstrap sample
+
+    Parameters
+    ----------
+    nobs : int
+        number of observations
+    random_state : RandomState instance
+        random number generator used for the draws
+    block_size : None or int
+        If None, then observations are drawn independently with
+        replacement. Otherwise, overlapping blocks of block_size consecutive
+        observations are drawn with replacement and concatenated (moving
+        block bootstrap).
+
+    Returns
+    -------
+    idx : ndarray, int, (nobs,)
+        index of the resampled observations
+    '''
+    if block_size is None or block_size <= 1:
+        return random_state.randint(nobs, size=nobs)
+    n_blocks = -(-nobs // block_size)
+    starts = random_state.randint(nobs - block_size + 1, size=n_blocks)
+    idx = (starts[:,None] + np.arange(block_size)).ravel()
+    return idx[:nobs]
+
+
+def _percentiles(x, per):
+    # scoreatpercentile only accepts a sequence of percentiles in
+    # scipy >= 0.11
+    return np.array([stats.scoreatpercentile(x, p) for p in per])
+
+
+def _is_linear(model):
+    from statsmodels.regression.linear_model import WLS
+    return isinstance(model, WLS)
+
+
+def _init_kwds(model):
+    '''keyword arguments to create a new instance of the model class
+
+    Arguments of __init__ that are attached to the model under the same
+    name are reused. Arrays with one row per observation are resampled by
+    the caller.
+    '''
+    argspec = inspect.getargspec(model.__class__.__init__)
+    kwds = {}
+    for name in argspec.args[3:]:   # self, endog, exog
+        if name == 'missing':
+            continue
+        if name == 'absorb':
+            if getattr(model, 'absorb', None) is not None:
+                kwds[name] = np.column_stack([g.group_int
+                                              for g in model.absorb])
+            continue
+        if name not in model.__dict__:
+            continue
+        value = model.__dict__[name]
+        if isinstance(value, (types.FunctionType, types.MethodType)):
+            raise ValueError("a model with a user supplied %s function "
+                             "cannot be resampled, subclass "
+                             "GenericLikelihoodModel instead" % name)
+        if name == 'exposure' and value is not None:
+            value = np.exp(value)   # models store log(exposure)
+        kwds[name] = value
+    return kwds
+
+
+def _fit_kwds(model, start_params, fit_kwds):
+    argspec = inspect.getargspec(model.fit)
+    kwds = {}
+    for name, value in [('start_params', start_params), ('disp', 0)]:
+        if name in argspec.args or argspec.keywords is not None:
+            kwds[name] = value
+    if fit_kwds:
+        kwds.update(fit_kwds)
+    return kwds
+
+
+def _take_rows(value, idx, nobs):
+    if isinstance(value, np.ndarray) and value.ndim > 0 and \
+                                                    value.shape[0] == nobs:
+        return value[idx]
+    return value
+
+
+def _bootstrap_linear(results, seeds, method, block_size, studentize):
+    '''replications for OLS and WLS without refitting the model'''
+    model = results.model
+    exog = model.exog
+    nobs, k_vars = exog.shape
+    df_resid = model.df_resid
+    sqrt_w = np.sqrt(model.weights)
+    params_b = np.empty((len(seeds), k_vars))
+    bse_b = np.empty((len(seeds), k_vars)) if studentize else None
+
+    if method in ['pairs', 'block']:
+        endog = model.endog
+        weights = model.weights
+        for i, seed in enumerate(seeds):
+            rs = np.random.RandomState(seed)
+            idx = bootstrap_indices(nobs, rs, block_size)
+            # weights times number of times that an observation is drawn
+            w_b = weights * np.bincount(idx, minlength=nobs)
+            try:
+                cov_b = np.linalg.inv(np.dot(exog.T, w_b[:,None] * exog))
+            except np.linalg.LinAlgError:
+                params_b[i] = np.nan
+                if studentize:
+                    bse_b[i] = np.nan
+                continue
+            params_b[i] = np.dot(cov_b, np.dot(exog.T, w_b * endog))
+            if studentize:
+                resid_b = endog - np.dot(exog, params_b[i])
+                scale_b = np.dot(w_b * resid_b, resid_b) / df_resid
+                bse_b[i] = np.sqrt(np.diag(cov_b) * scale_b)
+        return params_b, bse_b
+
+    # residual and wild bootstrap keep exog fixed, the replications are
+    # a single matrix product with the pseudo inverse of wexog
+    wfitted = sqrt_w * results.fittedvalues
+    wresid = results.wresid
+    wendog_b = np.empty((nobs, len(seeds)))
+    for i, seed in enumerate(seeds):
+        rs = np.random.RandomState(seed)
+        if method == 'residual':
+            wendog_b[:,i] = wfitted + wresid[rs.randint(nobs, size=nobs)]
+        else:
+            # Rademacher weights
+            sign = 2 * rs.randint(2, size=nobs) - 1
+            wendog_b[:,i] = wfitted + wresid * sign
+    pinv_wexog = getattr(model, 'pinv_wexog', None)
+    if pinv_wexog is None:
+        pinv_wexog = np.linalg.pinv(model.wexog)
+    params_b = np.dot(pinv_wexog, wendog_b).T
+    if studentize:
+        wresid_b = wendog_b - np.dot(model.wexog, params_b.T)
+        scale_b = (wresid_b**2).sum(0) / df_resid
+        bse_b = np.sqrt(np.outer(scale_b,
+                                 np.diag(results.normalized_cov_params)))
+    return params_b, bse_b
+
+
+def _bootstrap_refit(results, seeds, method, block_size, studentize,
+                     fit_kwds):
+    '''replications that create and fit a new model instance'''
+    model = results.model
+    endog, exog = model.endog, model.exog
+    nobs = endog.shape[0]
+    params = np.asarray(results.params)
+    init_kwds = _init_kwds(model)
+    fit_kwds = _fit_kwds(model, params, fit_kwds)
+    cloneattr = getattr(model, 'cloneattr', [])
+
+    params_b = np.empty((len(seeds), len(params)))
+    bse_b = np.empty((len(seeds), len(params))) if studentize else None
+    for i, seed in enumerate(seeds):
+        rs = np.random.RandomState(seed)
+        if method in ['pairs', 'block']:
+            idx = bootstrap_indices(nobs, rs, block_size)
+            endog_b, exog_b = endog[idx], exog[idx]
+            kwds = dict((key, _take_rows(value, idx, nobs))
+                        for key, value in init_kwds.iteritems())
+        else:
+            # only linear models with absorbed effects get here
+            if method == 'residual':
+                wresid_b = results.wresid[rs.randint(nobs, size=nobs)]
+            else:
+                wresid_b = results.wresid * (2 * rs.randint(2, size=nobs) - 1)
+            endog_b = results.fittedvalues + wresid_b / np.sqrt(model.weights)
+            exog_b = exog
+            kwds = init_kwds
+        try:
+            mod_b = model.__class__(endog_b, exog_b, **kwds)
+            for attr in cloneattr:
+                setattr(mod_b, attr, getattr(model, attr))
+            res_b = mod_b.fit(**fit_kwds)
+            params_b[i] = res_b.params
+            if studentize:
+                bse_b[i] = res_b.bse
+        except Exception:
+            # e.g. perfect separation or a singular design in a resample
+            params_b[i] = np.nan
+            if studentize:
+                bse_b[i] = np.nan
+    return params_b, bse_b
+
+
+def _bootstrap_block(results, seeds, method, block_size, studentize,
+                     fit_kwds):
+    model = results.model
+    if (_is_linear(model) and not model.k_absorb and
+                            not sparsetools.issparse(model.exog)):
+        return _bootstrap_linear(results, seeds, method, block_size,
+                                 studentize)
+    return _bootstrap_refit(results, seeds, method, block_size, studentize,
+                            fit_kwds)
+
+
+def bootstrap(results, nrep=200, method='pairs', block_size=None,
+              studentize=False, seed=None, n_jobs=1, verbose=0,
+              fit_kwds=None):
+    '''bootstrap the parameter estimates of a model
+
+    Parameters
+    ----------
+    results : results instance
+        results of OLS, WLS, GLM, a discrete model or a
+        GenericLikelihoodModel
+    nrep : int
+        number of bootstrap replications
+    method : str
+        - 'pairs' : nonparametric bootstrap, resample observations (rows of
+          endog, exog and of other arrays with one row per observation, for
+          example weights, offset and exposure)
+        - 'residual' : fittedvalues plus resampled residuals, OLS and WLS
+          only
+        - 'wild' : fittedvalues plus residuals with random signs
+          (Rademacher weights), robust to heteroscedasticity, OLS and WLS
+          only
+        - 'block' : moving block bootstrap of observations for weakly
+          dependent data, see block_size
+    block_size : None or int
+        length of the blocks for method 'block'. The default is
+        int(nobs**(1/3.)).
+    studentize : bool
+        If true, then the standard errors of the parameters are also
+        calculated for each replication, which is required for the
+        studentized confidence interval.
+    seed : None, int or RandomState instance
+        seed for the random number generators. A seed is drawn for each
+        replication from it, so the results are reproducible and do not
+        depend on n_jobs.
+    n_jobs : int
+        number of jobs to run in parallel, requires joblib, see
+        `statsmodels.tools.parallel.parallel_func`.
+    verbose : int
+        verbosity level of joblib.
+    fit_kwds : None or dict
+        additional keywords for the fit method of the model. The original
+        parameters are used as start_params and disp is 0 if the fit method
+        accepts these options.
+
+    Returns
+    -------
+    res : BootstrapResults instance
+
+    Notes
+    -----
+    For OLS and WLS without absorbed effects and with a dense exog, the
+    replications are not refit, the parameters are the least squares
+    solution with observations weighted by the number of times they are
+    drawn (pairs and block), or the pseudo inverse of the whitened design
+    times the bootstrap samples of the response (residual and wild).
+
+    All other models are refit for each replication. The model is recreated
+    with the arguments of its `__init__` that are attached to it under the
+    same name, and the attributes listed in model.cloneattr are copied.
+    Replications that fail to converge or raise an exception have nan
+    params and are excluded from the summary statistics.
+
+    Examples
+    --------
+    >>> res = sm.OLS(endog, exog).fit()
+    >>> bs = bootstrap(res, nrep=999, method='wild', seed=1234)
+    >>> bs.std
+    >>> bs.conf_int(method='bca')
+    '''
+    from statsmodels.tools.parallel import parallel_func, split_jobs
+
+    results = getattr(results, '_results', results)
+    model = results.model
+    if np.ndim(results.params) != 1:
+        raise NotImplementedError("bootstrap requires one dimensional "
+                                  "params")
+    linear = _is_linear(model)
+    from statsmodels.regression.linear_model import RegressionModel
+    if isinstance(model, RegressionModel) and not linear:
+        raise NotImplementedError("bootstrap is not available for GLS and "
+                                  "GLSAR")
+    if method not in ['pairs', 'residual', 'wild', 'block']:
+        raise ValueError("method %s not understood" % method)
+    if method in ['residual', 'wild'] and not linear:
+        raise ValueError("method %s is only available for OLS and WLS" %
+                         method)
+    nobs = model.endog.shape[0]
+    if method == 'block' and block_size is None:
+        block_size = max(int(nobs**(1 / 3.)), 1)
+    elif method != 'block':
+        block_size = None
+
+    if not isinstance(seed, np.random.RandomState):
+        seed = np.random.RandomState(seed)
+    seeds = seed.randint(np.iinfo(np.int32).max, size=nrep)
+
+    parallel, p_func, n_jobs = parallel_func(_bootstrap_block, n_jobs,
+                                             verbose=verbose)
+    blocks = split_jobs(seeds, n_jobs)
+    fits = parallel(p_func(results, seeds_block, method, block_size,
+                           studentize, fit_kwds)
+                    for seeds_block in blocks)
+    params = np.concatenate([fit[0] for fit in fits])
+    bse = np.concatenate([fit[1] for fit in fits]) if studentize else None
+    return BootstrapResults(results, params, bse, method=method,
+                            block_size=block_size)
+
+
+class BootstrapResults(object):
+    '''results of the bootstrap of parameter estimates
+
+    Parameters
+    ----------
+    results : results instance
+        results of the original model
+    params : ndarray, (nrep, k_params)
+        parameter estimates of the replications
+    bse : None or ndarray, (nrep, k_params)
+        standard errors of the parameter estimates of the replications
+    method : str
+        bootstrap method
+    block_size : None or int
+        block length of the block bootstrap
+
+    Attributes
+    ----------
+    failed : ndarray, bool
+        replications that did not produce parameter estimates
+    n_failed : int
+        number of failed replications
+    params_valid : ndarray
+        params of the replications that did not fail
+    '''
+
+    def __init__(self, results, params, bse=None, method='pairs',
+                 block_size=None):
+        self.results = results
+        self.params = params
+        self.bse = bse
+        self.method = method
+        self.block_size = block_size
+        self.nrep = params.shape[0]
+        self.failed = np.isnan(params).any(1)
+        self.n_failed = self.failed.sum()
+        self.params_valid = params[~self.failed]
+
+    @cache_readonly
+    def mean(self):
+        '''mean of the parameter estimates over the replications'''
+        return self.params_valid.mean(0)
+
+    @cache_readonly
+    def std(self):
+        '''bootstrap standard errors of the parameter estimates'''
+        return self.params_valid.std(0, ddof=1)
+
+    @cache_readonly
+    def bias(self):
+        '''bootstrap estimate of the bias of the parameter estimates'''
+        return self.mean - np.asarray(self.results.params)
+
+    def cov_params(self):
+        '''bootstrap covariance matrix of the parameter estimates'''
+        return np.cov(self.params_valid, rowvar=0)
+
+    @cache_readonly
+    def _influence(self):
+        '''empirical influence values of the observations on params
+
+        These are used for the acceleration in the BCa interval. They are
+        cov_params times the score of each observation, which is up to scale
+        the jackknife change in params for regression models.
+        '''
+        results = self.results
+        model = results.model
+        params = np.asarray(results.params)
+        if _is_linear(model):
+            score_obs = model.wexog * results.wresid[:,None]
+            return np.dot(score_obs, results.normalized_cov_params)
+        from statsmodels.genmod.generalized_linear_model import GLM
+        if isinstance(model, GLM):
+            family = model.family
+            mu = results.mu
+            resid = (model.endog - mu) / (family.variance(mu) *
+                                          family.link.deriv(mu))
+            score_obs = sparsetools.scale_rows(model.exog,
+                                               resid * model.data_weights)
+            score_obs = np.asarray(score_obs.todense()
+                                   if sparsetools.issparse(score_obs)
+                                   else score_obs)
+            return np.dot(score_obs, results.normalized_cov_params)
+        return np.dot(model.jac(params), results.cov_params())
+
+    def conf_int(self, alpha=0.05, method='percentile'):
+        '''bootstrap confidence intervals for the parameters
+
+        Parameters
+        ----------
+        alpha : float
+            significance level, the coverage of the interval is 1 - alpha
+        method : str
+            - 'percentile' : quantiles of the bootstrap distribution
+            - 'bca' : bias corrected and accelerated percentile interval.
+              The acceleration is estimated from the empirical influence
+              values of the observations, it ignores the dependence for the
+              block bootstrap.
+            - 'studentized' : bootstrap-t interval, requires that the
+              bootstrap was run with studentize=True
+
+        Returns
+        -------
+        conf_int : ndarray, (k_params, 2)
+            lower and upper limits of the confidence interval in columns
+        '''
+        params_b = self.params_valid
+        params = np.asarray(self.results.params)
+        q = np.array([alpha / 2., 1 - alpha / 2.])
+
+        if method == 'percentile':
+            return np.array([_percentiles(params_b[:,j], 100 * q)
+                             for j in range(params_b.shape[1])])
+
+        elif method == 'bca':
+            # bias correction from the fraction of replications below params
+            below = ((params_b < params).sum(0) +
+                     0.5 * (params_b == params).sum(0))
+            z0 = stats.norm.ppf(below / float(params_b.shape[0]))
+            u = self._influence
+            accel = (u**3).sum(0) / (6 * ((u**2).sum(0))**1.5)
+            z = stats.norm.ppf(q)
+            zq = z0[:,None] + z[None,:]
+            q_bca = stats.norm.cdf(z0[:,None] + zq / (1 - accel[:,None] * zq))
+            return np.array([_percentiles(params_b[:,j], 100 * q_bca[j])
+                             for j in range(params_b.shape[1])])
+
+        elif method == 'studentized':
+            if self.bse is None:
+                raise ValueError("studentized interval requires the "
+                                 "bootstrap with studentize=True")
+            bse = np.asarray(self.results.bse)
+            tvalues_b = (params_b - params) / self.bse[~self.failed]
+            t_q = np.array([_percentiles(tvalues_b[:,j], 100 * q[::-1])
+                            for j in range(params_b.shape[1])])
+            return params[:,None] - t_q * bse[:,None]
+
+        else:
+            raise ValueError("method %s not understood" % method)
@@ -12,6 +12,7 @@ import numpy as np
 
 from statsmodels.regression.linear_model import OLS
 from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.compatibility import np_slogdet
 from statsmodels.stats.multitest import multipletests
 
 # outliers test convenience wrapper
@@ -174,20 +175,28 @@ class OLSInfluence(object):
     ----------
     results : Regression Results instance
         currently assumes the results are from an OLS regression
+    chunksize : None or int
+        If chunksize is given, then the nobs x k_vars intermediate products
+        with the design matrix are calculated in chunks of chunksize rows,
+        which limits the temporary memory for large datasets.
 
     Notes
     -----
     One part of the results can be calculated without any auxiliary regression
     (some of which have the `_internal` postfix in the name. Other statistics
-    require leave-one-observation-out (LOOO) auxiliary regression, and will be
-    slower (mainly results with `_external` postfix in the name).
-    The auxiliary LOOO regression only the required results are stored.
+    are based on the leave-one-observation-out (LOOO) regressions (mainly
+    results with `_external` postfix in the name).
 
-    Using the LOO measures is currently only recommended if the data set
-    is not too large. One possible approach for LOOO measures would be to
-    identify possible problem observations with the _internal measures, and
-    then run the leave-one-observation-out only with observations that are
-    possible outliers. (However, this is not yet available in an automized way.)
+    The LOOO results are not calculated by refitting the model without each
+    observation. Removing an observation is a rank one update of X'X, so
+    the parameters, the error variance and the determinant of the parameter
+    covariance of the LOOO regressions follow from the diagonal of the hat
+    matrix and the residuals (Sherman-Morrison formula), e.g. ::
+
+        params_not_obsi = params - (X'X)^(-1) x_i resid_i / (1 - hii)
+
+    All measures only require a pass over the design matrix and are linear
+    in the number of observations.
 
     This should be extended to general least squares.
 
@@ -196,13 +205,14 @@ class OLSInfluence(object):
 
     '''
 
-    def __init__(self, results):
+    def __init__(self, results, chunksize=None):
         #check which model is allowed
         try:
             self.results = results._results # don't use wrapped results
         except: # we got unwrapped results
             self.results = results
         self.nobs, self.k_vars = results.model.exog.shape
+        self.chunksize = chunksize
         self.endog = results.model.endog
         self.exog = results.model.exog
         self.model_class = results.model.__class__
@@ -212,6 +222,21 @@ class OLSInfluence(object):
         self.aux_regression_exog = {}
         self.aux_regression_endog = {}
 
+    def _chunks(self):
+        '''slices of rows for calculations with the design matrix'''
+        chunksize = self.chunksize or self.nobs
+        for start in xrange(0, self.nobs, chunksize):
+            yield slice(start, start + chunksize)
+
+    def _map_exog(self, func):
+        '''apply func(slice, exog[slice] (X'X)^(-1)) to chunks of exog
+
+        and stack the returned arrays
+        '''
+        cov_params = self.results.normalized_cov_params
+        return np.concatenate([func(rows, np.dot(self.exog[rows], cov_params))
+                               for rows in self._chunks()])
+
     @cache_readonly
     def hat_matrix_diag(self):
         '''(cached attribute) diagonal of the hat_matrix for OLS
@@ -220,7 +245,8 @@ class OLSInfluence(object):
         -----
         temporarily calculated here, this should go to model class
         '''
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        return self._map_exog(lambda rows, xcov:
+                              (xcov * self.exog[rows]).sum(1))
 
     @cache_readonly
     def resid_press(self):
@@ -359,10 +385,13 @@ class OLSInfluence(object):
     def dfbetas(self):
         '''(cached attribute) dfbetas
 
-        uses results from leave-one-observation-out loop
+        change in params if an observation is dropped, scaled by the
+        standard errors using the LOOO error variance
         '''
-        dfbetas = self.results.params - self.params_not_obsi#[None,:]
-        dfbetas /= np.sqrt(self.sigma2_not_obsi[:,None])
+        # params - params_not_obsi, without storing params_not_obsi
+        scale = self.resid_press / np.sqrt(self.sigma2_not_obsi)
+        dfbetas = self._map_exog(lambda rows, xcov:
+                                 xcov * scale[rows,None])
         dfbetas /=  np.sqrt(np.diag(self.results.normalized_cov_params))
         return dfbetas
 
@@ -372,25 +401,42 @@ class OLSInfluence(object):
 
         This is 'mse_resid' from each auxiliary regression.
 
-        uses results from leave-one-observation-out loop
+        ::
+
+           sigma2_not_obsi = (ssr - resid**2 / (1 - hii)) / (df_resid - 1)
+
         '''
-        return np.asarray(self._res_looo['mse_resid'])
+        results = self.results
+        ssr_not_obsi = results.ssr - results.resid * self.resid_press
+        return ssr_not_obsi / (results.df_resid - 1)
 
     @cache_readonly
     def params_not_obsi(self):
         '''(cached attribute) parameter estimates for all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        ::
+
+           params_not_obsi = params - (X'X)^(-1) x_i resid_i / (1 - hii)
+
         '''
-        return np.asarray(self._res_looo['params'])
+        resid_press = self.resid_press
+        params = self.results.params
+        return self._map_exog(lambda rows, xcov:
+                              params - xcov * resid_press[rows,None])
 
     @cache_readonly
     def det_cov_params_not_obsi(self):
         '''(cached attribute) determinant of cov_params of all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        ::
+
+           det(sigma2_not_obsi (X'X - x_i x_i')^(-1))
+               = sigma2_not_obsi**k_vars * det((X'X)^(-1)) / (1 - hii)
+
         '''
-        return np.asarray(self._res_looo['det_cov_params'])
+        sign, logdet = np_slogdet(self.results.normalized_cov_params)
+        return sign * np.exp(self.k_vars * np.log(self.sigma2_not_obsi) +
+                             logdet - np.log(1 - self.hat_matrix_diag))
 
     @cache_readonly
     def cooks_distance(self):
@@ -531,34 +577,16 @@ class OLSInfluence(object):
 
     @cache_readonly
     def _res_looo(self):
-        '''collect required results from the LOOO loop
+        '''collect required results of the LOOO regressions
 
-        all results will be attached.
         currently only 'params', 'mse_resid', 'det_cov_params' are stored
 
-        regresses endog on exog dropping one observation at a time
-
-        this uses a nobs loop, only attributes of the OLS instance are stored.
+        the results are calculated with rank one updates and without a nobs
+        loop, see the Notes in the class docstring
         '''
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-        get_det_cov_params = lambda res: np.linalg.det(res.cov_params())
-
-        endog = self.endog
-        exog = self.exog
-
-        params = np.zeros_like(exog)
-        mse_resid = np.zeros_like(endog)
-        det_cov_params = np.zeros_like(endog)
-
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            res_i = self.model_class(endog[inidx], exog[inidx]).fit()
-            params[outidx] = res_i.params
-            mse_resid[outidx] = res_i.mse_resid
-            det_cov_params[outidx] = get_det_cov_params(res_i)
-
-        return dict(params=params, mse_resid=mse_resid,
-                       det_cov_params=det_cov_params)
+        return dict(params=self.params_not_obsi,
+                    mse_resid=self.sigma2_not_obsi,
+                    det_cov_params=self.det_cov_params_not_obsi)
 
     def summary_frame(self):
         """
@@ -480,8 +480,7 @@ def cov_cluster(results, group, use_correction=True):
     Parameters
     ----------
     results : result instance
-       result of a regression, uses results.model.exog and results.resid
-       TODO: this should use wexog instead
+       result of a regression, uses results.model.wexog and results.wresid
     use_correction : bool
        If true (default), then the small sample correction factor is used.
 
@@ -494,12 +493,18 @@ def cov_cluster(results, group, use_correction=True):
     -----
     same result as Stata in UCLA example and same as Peterson
 
+    For models with absorbed effects, see the `absorb` option of OLS and
+    WLS, wexog is the within transformed design matrix and the absorbed
+    parameters are included in the small sample correction as in Stata's
+    areg.
+
     '''
     #TODO: currently used version of groupsums requires 2d resid
-    xu = results.model.exog * results.resid[:, None]
+    xu = results.model.wexog * results.wresid[:, None]
     scale = S_crosssection(xu, group)
 
-    nobs, k_vars = results.model.exog.shape
+    nobs, k_vars = results.model.wexog.shape
+    k_vars += getattr(results.model, 'k_absorb', 0)
     n_groups = len(np.unique(group)) #replace with stored group attributes if available
 
     cov_c = _HCCM2(results, scale)
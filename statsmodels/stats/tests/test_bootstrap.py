@@ -0,0 +1,102 @@
+import numpy as np
+from numpy.testing import (assert_almost_equal, assert_equal, assert_,
+                           assert_raises)
+
+import statsmodels.api as sm
+from statsmodels.base.model import GenericLikelihoodModel
+from statsmodels.stats import bootstrap as smboot
+from statsmodels.stats.bootstrap import bootstrap, bootstrap_indices
+
+
+def _linear_data(nobs=200):
+    np.random.seed(987125)
+    exog = sm.add_constant(np.random.normal(size=(nobs, 2)), prepend=True)
+    endog = exog.sum(1) + np.random.normal(size=nobs)
+    return endog, exog
+
+
+class MyProbit(GenericLikelihoodModel):
+    def loglikeobs(self, params):
+        from scipy import stats
+        q = 2 * self.endog - 1
+        return stats.norm.logcdf(q * np.dot(self.exog, params))
+
+
+def test_bootstrap_indices():
+    rs = np.random.RandomState(0)
+    idx = np.concatenate([bootstrap_indices(5, rs) for _ in range(50)])
+    # all observations, including the last, are drawn
+    assert_equal(np.unique(idx), np.arange(5))
+
+    idx = bootstrap_indices(20, rs, block_size=4)
+    assert_equal(len(idx), 20)
+    assert_equal(np.diff(idx.reshape(5, 4), axis=1), np.ones((5, 3)))
+
+
+def test_linear_refit():
+    # the direct least squares solution is the same as refitting
+    endog, exog = _linear_data()
+    weights = np.linspace(1, 2, len(endog))
+    seeds = [1, 2, 3]
+    for res in [sm.OLS(endog, exog).fit(),
+                sm.WLS(endog, exog, weights=weights).fit()]:
+        for method in ['pairs', 'residual', 'wild']:
+            params1, bse1 = smboot._bootstrap_linear(res, seeds, method,
+                                                     None, True)
+            params2, bse2 = smboot._bootstrap_refit(res, seeds, method, None,
+                                                    True, None)
+            assert_almost_equal(params1, params2, 12)
+            assert_almost_equal(bse1, bse2, 12)
+
+
+def test_ols():
+    endog, exog = _linear_data()
+    res = sm.OLS(endog, exog).fit()
+    bs = bootstrap(res, nrep=500, method='wild', studentize=True, seed=1)
+    assert_equal(bs.params.shape, (500, 3))
+    assert_equal(bs.n_failed, 0)
+    assert_almost_equal(bs.std / res.bse, np.ones(3), 1)
+    params = res.params
+    for method in ['percentile', 'bca', 'studentized']:
+        ci = bs.conf_int(method=method)
+        assert_equal(ci.shape, (3, 2))
+        assert_((ci[:,0] < params).all() and (params < ci[:,1]).all())
+        assert_almost_equal(ci, res.conf_int(), 1)
+
+    # reproducible and independent of the number of jobs
+    bs2 = bootstrap(res, nrep=500, method='wild', seed=1, n_jobs=2)
+    assert_almost_equal(bs2.params, bs.params, 12)
+    bs3 = bootstrap(res, nrep=20, method='block', seed=1)
+    assert_raises(ValueError, bs3.conf_int, method='studentized')
+
+
+def test_discrete_glm():
+    endog, exog = _linear_data()
+    endog = (endog > 1).astype(float)
+    res = sm.Logit(endog, exog).fit(disp=0)
+    bs = bootstrap(res, nrep=50, seed=2)
+    assert_almost_equal(bs.std / res.bse, np.ones(3), 0)
+    assert_equal(bs.conf_int(method='bca').shape, (3, 2))
+    assert_raises(ValueError, bootstrap, res, method='residual')
+
+    exposure = np.linspace(1, 2, len(endog))
+    res = sm.GLM(endog, exog, family=sm.families.Poisson(),
+                 exposure=exposure).fit()
+    bs = bootstrap(res, nrep=50, seed=2, studentize=True)
+    res_p = sm.Poisson(endog, exog, exposure=exposure).fit(disp=0)
+    bs_p = bootstrap(res_p, nrep=50, seed=2)
+    assert_almost_equal(bs.params, bs_p.params, 5)
+    assert_almost_equal(bs.conf_int(method='bca'),
+                        bs_p.conf_int(method='bca'), 5)
+
+
+def test_generic():
+    endog, exog = _linear_data()
+    endog = (endog > 1).astype(float)
+    res = MyProbit(endog, exog).fit(disp=0)
+    res_probit = sm.Probit(endog, exog).fit(disp=0)
+    mean, std, params = res.bootstrap(nrep=20)
+    assert_equal(params.shape, (20, 3))
+    bs = bootstrap(res_probit, nrep=20, seed=3)
+    bs_generic = bootstrap(res, nrep=20, seed=3)
+    assert_almost_equal(bs_generic.params, bs.params, 3)
@@ -723,6 +723,30 @@ def test_influence_wrapped():
     assert_almost_equal(infl.dfbetas, infl_r2[:,:3], decimal=13)
     assert_almost_equal(infl.cov_ratio, infl_r2[:,4], decimal=14)
 
+def test_influence_looo():
+    # compare the rank one updates with explicit leave one out regressions
+    np.random.seed(987125)
+    nobs = 30
+    exog = add_constant(np.random.normal(size=(nobs, 2)), prepend=True)
+    endog = exog.sum(1) + np.random.normal(size=nobs)
+    res = OLS(endog, exog).fit()
+    infl = oi.OLSInfluence(res)
+    infl_chunked = oi.OLSInfluence(res, chunksize=7)
+
+    for i in [0, 11, nobs - 1]:
+        mask = np.arange(nobs) != i
+        res_i = OLS(endog[mask], exog[mask]).fit()
+        assert_almost_equal(infl.params_not_obsi[i], res_i.params, 12)
+        assert_almost_equal(infl.sigma2_not_obsi[i], res_i.mse_resid, 12)
+        assert_almost_equal(infl.det_cov_params_not_obsi[i],
+                            np.linalg.det(res_i.cov_params()), 14)
+
+    assert_almost_equal(infl_chunked.hat_matrix_diag, infl.hat_matrix_diag,
+                        14)
+    assert_almost_equal(infl_chunked.params_not_obsi, infl.params_not_obsi,
+                        14)
+    assert_almost_equal(infl_chunked.dfbetas, infl.dfbetas, 14)
+
 def test_outlier_test():
     # results from R with NA -> 1. Just testing interface here because
     # outlier_test is just a wrapper
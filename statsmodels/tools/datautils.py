@@ -3,6 +3,96 @@ import time
 import numpy as np
 from numpy import genfromtxt, array
 
+# bump to invalidate the files written by cached_recfromtxt
+_CACHE_VERSION = 1
+
+def get_cache_dir():
+    """
+    Directory of the binary cache of the parsed datasets
+
+    Returns
+    -------
+    path : str or None
+        The environment variable STATSMODELS_CACHE if it is set, otherwise
+        statsmodels/datasets in XDG_CACHE_HOME or ~/.cache. None if
+        STATSMODELS_CACHE is set to an empty string, which disables the
+        cache.
+    """
+    path = os.environ.get('STATSMODELS_CACHE')
+    if path is not None:
+        return path or None
+    base = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'statsmodels', 'datasets')
+
+def cached_recfromtxt(fname, **kwargs):
+    """
+    recfromtxt with a binary cache of the parsed record array
+
+    Parameters
+    ----------
+    fname : str
+        Path of the text file.
+    kwargs
+        Passed to numpy.recfromtxt.
+
+    Returns
+    -------
+    data : recarray
+        Same as numpy.recfromtxt(open(fname, 'rb'), **kwargs).
+
+    Notes
+    -----
+    The parsed array is saved as .npy in the directory given by
+    `get_cache_dir`, keyed by a hash of the file content, the keyword
+    arguments and the numpy version. Later calls memory-map the .npy file in
+    copy-on-write mode, so changes to the returned array are not written to
+    the cache. If the cache directory cannot be written, the file is parsed
+    on every call.
+    """
+    import hashlib
+    fh = open(fname, 'rb')
+    try:
+        content = fh.read()
+    finally:
+        fh.close()
+
+    cache_dir = get_cache_dir()
+    if cache_dir is not None:
+        key = hashlib.sha1(content)
+        key.update(repr((sorted(kwargs.items()), np.__version__,
+                         _CACHE_VERSION)))
+        name = os.path.splitext(os.path.basename(fname))[0]
+        path = os.path.join(cache_dir, '%s-%s.npy' % (name,
+                                                      key.hexdigest()[:16]))
+        if os.path.exists(path):
+            try:
+                return np.load(path, mmap_mode='c').view(np.recarray)
+            except (IOError, ValueError):
+                pass # unreadable, parse and write it again
+
+    from cStringIO import StringIO
+    data = np.recfromtxt(StringIO(content), **kwargs)
+    if cache_dir is not None and not data.dtype.hasobject:
+        # write to a temporary file first so that concurrent loads never
+        # see a partially written file
+        tmp_path = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            fh = open(tmp_path, 'wb')
+            try:
+                np.save(fh, np.asarray(data))
+            finally:
+                fh.close()
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return data
+
 class Dataset(dict):
     def __init__(self, **kw):
         dict.__init__(self,kw)
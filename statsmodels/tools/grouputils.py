@@ -169,7 +169,7 @@ def dummy_sparse(groups):
 
     indptr = np.arange(len(groups)+1)
     data = np.ones(len(groups), dtype=np.int8)
-    indi = sparse.csr_matrix((data, g, indptr))
+    indi = sparse.csr_matrix((data, groups, indptr))
 
     return indi
 
@@ -239,13 +239,185 @@ class Group(object):
     def group_sums(self, x, use_bincount=True):
         return group_sums(x, self.group_int, use_bincount=use_bincount)
 
-    def group_demean(self, x, use_bincount=True):
-        means_g = group_demean(x/float(nobs), self.group_int,
-                               use_bincount=use_bincount)
+    def group_demean(self, x, weights=None, use_bincount=True):
+        '''subtract the (weighted) group means from x
+
+        returns the demeaned x and the group means, means_g has one row for
+        each group
+        '''
+        x = np.asarray(x, dtype=float)
+        if weights is None:
+            counts = self.counts().astype(float)
+            sums_g = group_sums(x, self.group_int, use_bincount=use_bincount)
+        else:
+            counts = np.bincount(self.group_int, weights=weights)
+            wx = weights[:,None] * x if x.ndim == 2 else weights * x
+            sums_g = group_sums(wx, self.group_int, use_bincount=use_bincount)
+        means_g = sums_g.T / counts[:,None]
+        if x.ndim == 1:
+            means_g = means_g[:,0]
         x_demeaned = x - means_g[self.group_int]  #check reverse_index?
         return x_demeaned, means_g
 
 
+def group_demean_multi(x, groups, weights=None, tol=1e-8, maxiter=1000):
+    '''remove the effects of several groups from x by alternating projections
+
+    This is the within transformation for several, possibly high dimensional,
+    categorical effects. The (weighted) group means of each group are
+    subtracted in turn until the means removed in a full sweep over the
+    groups are smaller than tol times the within variation of the column.
+    Time and memory are linear in the number of observations.
+
+    Parameters
+    ----------
+    x : ndarray, (nobs,) or (nobs, k_vars)
+        data to be demeaned
+    groups : list of Group instances
+        the groups defining the effects that are removed
+    weights : None or ndarray, (nobs,)
+        if weights are given, then the weighted group means are removed,
+        which is the within transformation for weighted least squares
+    tol : float
+        convergence tolerance relative to the largest absolute value of each
+        column after the first sweep
+    maxiter : int
+        maximum number of sweeps over the groups
+
+    Returns
+    -------
+    x_demeaned : ndarray
+        x with the group effects removed, same shape as x
+    n_iter : int
+        largest number of sweeps used for a column
+
+    Notes
+    -----
+    Each column is iterated separately, so that columns that converge fast
+    do not wait for the slow ones. A single group only needs one sweep.
+    The scale of a column is measured after the first sweep, so that the
+    level of the column, which is removed with the group means, does not
+    affect the tolerance. Columns that are spanned by the group effects, for
+    example a constant, have no variation left after the transformation and
+    are set to zero. These are columns that are at the rounding error of
+    their level after the first sweep, or that shrink below 1000 * tol of
+    their scale.
+
+    '''
+    x = np.array(x, dtype=float, order='F')
+    is1d = x.ndim == 1
+    if is1d:
+        x = x[:,None]
+    groups = [Group(g) if not isinstance(g, Group) else g for g in groups]
+    group_ints = [g.group_int for g in groups]
+    if weights is None:
+        counts = [np.bincount(g).astype(float) for g in group_ints]
+    else:
+        weights = np.asarray(weights, dtype=float)
+        counts = [np.bincount(g, weights=weights) for g in group_ints]
+    for cnt in counts:
+        cnt[cnt == 0] = 1   # groups without weight have a zero sum
+
+    eps = np.finfo(float).eps
+    n_iter = 0
+    for col in range(x.shape[1]):
+        xc = x[:,col]   #a view, x is in Fortran order
+        level = np.abs(xc).max()
+        if level == 0:
+            continue
+        for it in range(1, maxiter + 1):
+            change = 0.
+            for gint, cnt in zip(group_ints, counts):
+                wxc = xc if weights is None else weights * xc
+                means_g = np.bincount(gint, weights=wxc) / cnt
+                xc -= means_g[gint]
+                change = max(change, np.abs(means_g).max())
+            if it == 1:
+                # the within variation, the level is removed by the means
+                scale = np.abs(xc).max()
+                if scale <= 1000 * eps * level:
+                    break
+            if len(groups) == 1 or change <= tol * scale:
+                break
+        else:
+            import warnings
+            warnings.warn("group_demean_multi did not converge in %d "
+                          "iterations for column %d" % (maxiter, col))
+        n_iter = max(n_iter, it)
+        if (scale <= 1000 * eps * level or
+            np.abs(xc).max() <= 1000 * tol * scale):
+            xc[:] = 0
+
+    if is1d:
+        x = x[:,0]
+    return x, n_iter
+
+
+def _n_connected_levels(group0, n_groups0, group1, n_groups1):
+    '''number of connected components of the bipartite graph of levels
+
+    Two levels are connected if an observation has both. Uses
+    scipy.sparse.csgraph if it is available (scipy >= 0.11), and a
+    union-find over the distinct pairs of levels otherwise.
+    '''
+    n_nodes = n_groups0 + n_groups1
+    try:
+        from scipy.sparse.csgraph import connected_components
+    except ImportError:
+        pairs = np.unique(group0 * n_groups1 + group1)
+        parent = range(n_nodes)
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        n_components = n_nodes
+        for i, j in zip(pairs // n_groups1, n_groups0 + pairs % n_groups1):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[root_i] = root_j
+                n_components -= 1
+        return n_components
+
+    from scipy import sparse
+    edges = sparse.coo_matrix((np.ones(len(group0)),
+                               (group0, n_groups0 + group1)),
+                              shape=(n_nodes, n_nodes))
+    return connected_components(edges, directed=False)[0]
+
+
+def absorbed_levels(groups):
+    '''number of parameters that are absorbed by the effects of groups
+
+    This is the rank of the matrix of dummy variables for all groups. All
+    levels of the first group are counted. For the second group one level
+    is redundant for each connected component of the bipartite graph of
+    levels of the first and second group, e.g. one for nested groups. For
+    any further group one level is assumed to be redundant, the count is
+    then an upper bound and the degrees of freedom are conservative.
+
+    Parameters
+    ----------
+    groups : list of Group instances
+
+    Returns
+    -------
+    k_absorb : int
+        number of absorbed parameters, including the constant
+
+    '''
+    groups = [Group(g) if not isinstance(g, Group) else g for g in groups]
+    k_absorb = groups[0].n_groups
+    if len(groups) > 1:
+        g0, g1 = groups[0], groups[1]
+        n_components = _n_connected_levels(g0.group_int, g0.n_groups,
+                                           g1.group_int, g1.n_groups)
+        k_absorb += g1.n_groups - n_components
+    for g in groups[2:]:
+        k_absorb += g.n_groups - 1
+    return k_absorb
+
+
 class GroupSorted(Group):
 
     def __init__(self, group, name=''):
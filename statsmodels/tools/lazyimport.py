@@ -0,0 +1,52 @@
+"""Deferred imports of modules, used for the namespaces in statsmodels.api
+"""
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder for a module that is imported on first attribute access
+
+    Parameters
+    ----------
+    name : str
+        The full dotted name of the module, for example
+        'statsmodels.tsa.api'.
+
+    Notes
+    -----
+    After the import the namespace of the module is copied into the
+    placeholder, so that later attribute lookups do not go through
+    `__getattr__`. `__doc__` is None until the module is imported.
+
+    Examples
+    --------
+    >>> tsa = LazyModule('statsmodels.tsa.api')  # nothing is imported yet
+    >>> tsa.AR
+    <class 'statsmodels.tsa.ar_model.AR'>
+    """
+    def __init__(self, name):
+        types.ModuleType.__init__(self, name)
+
+    def _load(self):
+        name = self.__name__
+        __import__(name)
+        module = sys.modules[name]
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        # only called for attributes that are not in __dict__ yet
+        if attr.startswith('__') and attr.endswith('__'):
+            # don't import for introspection, e.g. by copy, pickle or nose
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        if self.__name__ in sys.modules:
+            return repr(sys.modules[self.__name__])
+        return "<lazy module '%s'>" % self.__name__
@@ -7,14 +7,19 @@ License: Simplified BSD
 
 changes for statsmodels (Josef Perktold)
 - try import from joblib directly, (doesn't import all of sklearn)
+- n_jobs=1 runs serially without trying to import joblib
+- split_jobs to hand blocks of work to the jobs
 
 '''
+import numpy as np
+
 
 
 def parallel_func(func, n_jobs, verbose=5):
     """Return parallel instance with delayed function
 
-    Util function to use joblib only if available
+    Util function to use joblib only if available. If n_jobs is 1, joblib
+    is not used and the function is called serially.
 
     Parameters
     ----------
@@ -42,6 +47,8 @@ def parallel_func(func, n_jobs, verbose=5):
     >>> print n_jobs
     >>> parallel(p_func(i**2) for i in range(10))
     """
+    if n_jobs == 1:
+        return list, func, 1
     try:
         try:
             from joblib import Parallel, delayed
@@ -65,3 +72,24 @@ def parallel_func(func, n_jobs, verbose=5):
         my_func = func
         parallel = list
     return parallel, my_func, n_jobs
+
+
+def split_jobs(arr, n_jobs):
+    """Split an array into blocks of work for parallel jobs
+
+    Parameters
+    ----------
+    arr : array-like
+        The items to split along the first axis.
+    n_jobs : int
+        Number of jobs as returned by `parallel_func`.
+
+    Returns
+    -------
+    blocks : list of arrays
+        About four blocks per job so that the load is balanced if the items
+        take different time, but at most one block per item and at least
+        one block.
+    """
+    n_blocks = max(min(4 * n_jobs, len(arr)), 1)
+    return np.array_split(arr, n_blocks)
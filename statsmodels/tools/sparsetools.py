@@ -0,0 +1,288 @@
+"""
+Linear algebra helpers for models with a scipy.sparse design matrix.
+
+The functions accept dense arrays as well, so that the models can use them
+without checking the type of exog. For sparse exog the n x k design matrix
+is never converted to a dense array, only k x k cross-products are.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as splinalg
+from statsmodels.tools.tools import rank as _rank
+
+issparse = sparse.issparse
+
+
+def dot(exog, params):
+    """
+    Matrix product of exog and params, exog can be sparse.
+
+    Parameters
+    ----------
+    exog : ndarray or sparse matrix
+        nobs x k design matrix.
+    params : ndarray
+        1d or 2d array with k rows.
+
+    Returns
+    -------
+    ndarray
+    """
+    if issparse(exog):
+        return exog.dot(params)
+    return np.dot(exog, params)
+
+
+def tdot(exog, x):
+    """
+    Matrix product of exog.T and x, exog can be sparse.
+    """
+    if issparse(exog):
+        return exog.T.dot(x)
+    return np.dot(exog.T, x)
+
+
+def rank(exog):
+    """
+    Rank of exog. A sparse exog is assumed to have full column rank.
+
+    A rank deficient sparse exog makes the sparse factorization of the
+    normal equations fail, see `inv_cross_product`.
+    """
+    if issparse(exog):
+        return exog.shape[1]
+    return _rank(exog)
+
+
+def scale_rows(exog, weights):
+    """
+    Multiplies the rows of exog by weights.
+
+    Returns a sparse matrix in CSR format if exog is sparse.
+    """
+    if issparse(exog):
+        return sparse.csr_matrix(exog.multiply(weights[:,None]))
+    return weights[:,None] * exog
+
+
+def cross_product(exog, weights=None, dense=False):
+    """
+    X'WX for a diagonal weighting matrix W = diag(weights).
+
+    Returns a sparse matrix in CSC format if exog is sparse and dense is
+    False, and an ndarray otherwise.
+    """
+    if issparse(exog):
+        wexog = exog if weights is None else scale_rows(exog, weights)
+        xtx = exog.T.dot(wexog)
+        if dense:
+            return xtx.toarray()
+        return sparse.csc_matrix(xtx)
+    if weights is None:
+        return np.dot(exog.T, exog)
+    return np.dot(exog.T, weights[:,None] * exog)
+
+
+def factorize(xtx, rcond=1e-10):
+    """
+    Sparse LU factorization of the cross-product xtx.
+
+    Raises a ValueError if xtx is singular, i.e. if the design matrix does
+    not have full column rank, for example because it includes a constant
+    and a full set of dummy variables. The matrix is treated as singular if
+    the ratio of the smallest to the largest pivot is below `rcond`. If the
+    pivots are not available, as in scipy < 0.14, an estimate of the
+    reciprocal 1-norm condition number is compared to `rcond` instead.
+    """
+    msg = "The sparse design matrix does not have full column rank"
+    xtx = sparse.csc_matrix(xtx)
+    try:
+        factor = splinalg.splu(xtx)
+    except RuntimeError, err:
+        raise ValueError("%s: %s" % (msg, err))
+    # splu only fails for exactly singular matrices, check the pivots
+    if hasattr(factor, 'U'):
+        pivots = np.abs(factor.U.diagonal())
+        singular = pivots.min() <= rcond * pivots.max()
+    else:
+        singular = _condest(xtx, factor) * rcond >= 1
+    if singular:
+        raise ValueError(msg)
+    return factor
+
+
+def _condest(xtx, factor, maxiter=5):
+    """
+    Estimate of the 1-norm condition number of the symmetric matrix xtx.
+
+    Uses Hager's method to estimate the 1-norm of the inverse from a few
+    solves with `factor`, the LU factorization of xtx. Returns inf if the
+    solves are not finite.
+    """
+    k = xtx.shape[0]
+    x = np.ones(k) / k
+    for i in range(maxiter):
+        y = factor.solve(x)
+        if not np.isfinite(y).all():
+            return np.inf
+        z = factor.solve(np.where(y >= 0, 1., -1.))  # xtx is symmetric
+        j = np.argmax(np.abs(z))
+        if np.abs(z[j]) <= np.dot(z, x):
+            break
+        x = np.zeros(k)
+        x[j] = 1.
+    norm = np.abs(xtx).sum(0).max()
+    return norm * np.abs(y).sum()
+
+
+class InverseCrossProduct(object):
+    """
+    Inverse of a sparse cross-product, scaled by a constant.
+
+    The inverse is not computed. Its entries, its diagonal and its products
+    with other arrays are obtained by solving against the LU factorization
+    of the cross-product, so that only the requested columns are formed.
+    This is used as the normalized_cov_params of models with a sparse
+    design matrix, for which the dense k x k inverse can be too large.
+
+    Parameters
+    ----------
+    xtx : sparse matrix
+        The k x k cross-product.
+    factor : SuperLU instance, optional
+        `factorize(xtx)` if it is already available.
+    scale : float
+        The inverse is multiplied by scale.
+
+    Notes
+    -----
+    Multiplying or dividing by a scalar returns a new instance that shares
+    the factorization. np.asarray and the `toarray` method return the dense
+    inverse.
+    """
+    # number of elements in a block of solutions, limits the memory used by
+    # diagonal
+    _block_size = 2**20
+    # let numpy defer to __rmul__ instead of converting to a dense array
+    __array_priority__ = 20.
+
+    def __init__(self, xtx, factor=None, scale=1.):
+        if factor is None:
+            factor = factorize(xtx)
+        self.xtx = xtx
+        self.factor = factor
+        self.scale = scale
+        self.shape = xtx.shape
+        self.ndim = 2
+
+    def dot(self, other):
+        """
+        Product of the scaled inverse with a 1d or 2d array.
+        """
+        other = np.asarray(other, dtype=np.float64)
+        return self.scale * self.factor.solve(other)
+
+    def _columns(self, cols):
+        k = self.shape[0]
+        eye = np.zeros((k, len(cols)))
+        eye[cols, np.arange(len(cols))] = 1.
+        return self.dot(eye)
+
+    def diagonal(self):
+        """
+        Diagonal of the scaled inverse, computed in blocks of columns.
+        """
+        k = self.shape[0]
+        step = max(1, self._block_size // k)
+        diag = np.empty(k)
+        for start in range(0, k, step):
+            cols = np.arange(start, min(start + step, k))
+            diag[cols] = self._columns(cols)[cols, np.arange(len(cols))]
+        return diag
+
+    def __getitem__(self, key):
+        rows, cols = key
+        ucols, pos = np.unique(np.asarray(cols).ravel(), return_inverse=True)
+        pos = pos.reshape(np.shape(cols))
+        return self._columns(ucols)[rows, pos]
+
+    def toarray(self):
+        """
+        Dense scaled inverse.
+        """
+        return self.dot(np.eye(self.shape[0]))
+
+    def __array__(self, dtype=None):
+        return self.toarray()
+
+    def __mul__(self, other):
+        if not np.isscalar(other):
+            return NotImplemented
+        return InverseCrossProduct(self.xtx, self.factor, self.scale * other)
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        return self * (1. / other)
+
+    __truediv__ = __div__
+
+
+def inv_cross_product(xtx, factor=None):
+    """
+    Inverse of the k x k cross-product xtx.
+
+    Parameters
+    ----------
+    xtx : ndarray or sparse matrix
+        Cross-product of the design matrix.
+    factor : SuperLU instance, optional
+        `factorize(xtx)` if it is already available.
+
+    Returns
+    -------
+    ndarray or InverseCrossProduct
+        The dense inverse if xtx is an ndarray. If xtx is sparse, the inverse
+        is not formed, see `InverseCrossProduct`.
+    """
+    if not issparse(xtx):
+        return np.linalg.inv(xtx)
+    return InverseCrossProduct(xtx, factor)
+
+
+def solve(xtx, rhs):
+    """
+    Solves xtx x = rhs, with a sparse LU factorization if xtx is sparse.
+    """
+    if issparse(xtx):
+        return factorize(xtx).solve(np.asarray(rhs, dtype=np.float64))
+    return np.dot(np.linalg.inv(xtx), rhs)
+
+
+def leverage(exog, normalized_cov_params):
+    """
+    Diagonal of the hat matrix exog (X'X)^(-1) exog.T.
+
+    Only the diagonal is computed, exog can be sparse. If
+    normalized_cov_params is an InverseCrossProduct, the rows of exog are
+    processed in blocks.
+    """
+    if isinstance(normalized_cov_params, InverseCrossProduct):
+        nobs, k = exog.shape
+        step = max(1, normalized_cov_params._block_size // k)
+        h = np.empty(nobs)
+        for start in range(0, nobs, step):
+            stop = min(start + step, nobs)
+            block = exog[start:stop]
+            if issparse(block):
+                z = normalized_cov_params.dot(block.T.toarray())
+                h[start:stop] = np.asarray(block.multiply(z.T).sum(1)).ravel()
+            else:
+                z = normalized_cov_params.dot(block.T)
+                h[start:stop] = (block * z.T).sum(1)
+        return h
+    if issparse(exog):
+        return np.asarray(exog.multiply(exog.dot(normalized_cov_params))
+                          .sum(1)).ravel()
+    return (np.dot(exog, normalized_cov_params) * exog).sum(1)
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from numpy.testing import assert_, assert_equal
+from statsmodels.tools import datautils as du
+from statsmodels.datasets import longley
+
+
+def test_cached_recfromtxt():
+    fname = os.path.join(os.path.dirname(longley.__file__), 'longley.csv')
+    kwargs = dict(delimiter=",", names=True, dtype=float,
+                  usecols=(1,2,3,4,5,6,7))
+    expected = np.recfromtxt(open(fname, 'rb'), **kwargs)
+
+    cache_env = os.environ.get('STATSMODELS_CACHE')
+    cache_dir = tempfile.mkdtemp(prefix='smcache')
+    os.environ['STATSMODELS_CACHE'] = cache_dir
+    try:
+        res1 = du.cached_recfromtxt(fname, **kwargs)
+        assert_equal(os.listdir(cache_dir), [os.listdir(cache_dir)[0]])
+        assert_(os.listdir(cache_dir)[0].startswith('longley-'))
+        res2 = du.cached_recfromtxt(fname, **kwargs)
+        for res in [res1, res2]:
+            assert_(type(res) is np.recarray)
+            assert_equal(res.dtype, expected.dtype)
+            assert_equal(res.tolist(), expected.tolist())
+        assert_(isinstance(res2.base, np.memmap))
+
+        # changes are not written back to the cache
+        res2['TOTEMP'][0] = 0
+        res3 = du.cached_recfromtxt(fname, **kwargs)
+        assert_equal(res3['TOTEMP'], expected['TOTEMP'])
+
+        # other options are another entry
+        du.cached_recfromtxt(fname, delimiter=",", names=True, dtype=float)
+        assert_equal(len(os.listdir(cache_dir)), 2)
+
+        dta = longley.load()
+        assert_equal(dta.data.tolist(), expected.tolist())
+        assert_equal(dta.exog, np.column_stack([expected[name] for name in
+                                                expected.dtype.names[1:]]))
+        del res1, res2, res3, dta
+
+        # an empty directory disables the cache
+        os.environ['STATSMODELS_CACHE'] = ''
+        assert_(du.get_cache_dir() is None)
+        res = du.cached_recfromtxt(fname, **kwargs)
+        assert_equal(res.tolist(), expected.tolist())
+        assert_(not isinstance(res.base, np.memmap))
+    finally:
+        if cache_env is None:
+            del os.environ['STATSMODELS_CACHE']
+        else:
+            os.environ['STATSMODELS_CACHE'] = cache_env
+        shutil.rmtree(cache_dir, ignore_errors=True)
@@ -0,0 +1,30 @@
+import sys
+import subprocess
+from numpy.testing import assert_, assert_equal
+from statsmodels.tools.lazyimport import LazyModule
+
+
+def test_lazy_module():
+    mod = LazyModule('statsmodels.tools.eval_measures')
+    assert_('statsmodels.tools.eval_measures' in repr(mod))
+    from statsmodels.tools import eval_measures
+    assert_(mod.rmse is eval_measures.rmse)
+    assert_('rmse' in mod.__dict__)
+    assert_('rmse' in dir(mod))
+
+
+def test_api_import():
+    # in a new interpreter, the lazy namespaces and the optional
+    # dependencies are not imported with statsmodels.api
+    code = ("import sys, pandas; before = set(sys.modules); "
+            "import statsmodels.api as sm; "
+            "mods = ['statsmodels.tsa.api', 'statsmodels.stats.api', "
+            "'statsmodels.graphics.api', 'statsmodels.emplike.api', "
+            "'statsmodels.datasets', 'patsy', 'matplotlib']; "
+            "print [m for m in mods if m in sys.modules and "
+            "m not in before]; "
+            "sm.tsa.AR; print 'statsmodels.tsa.api' in sys.modules")
+    proc = subprocess.Popen([sys.executable, '-c', code],
+                            stdout=subprocess.PIPE)
+    out = proc.communicate()[0].split()
+    assert_equal(out, ['[]', 'True'])
@@ -1,5 +1,5 @@
-from statsmodels.tools.parallel import parallel_func
-from numpy import arange, testing
+from statsmodels.tools.parallel import parallel_func, split_jobs
+from numpy import arange, concatenate, testing
 from math import sqrt
 
 def test_parallel():
@@ -7,3 +7,17 @@ def test_parallel():
     parallel, p_func, n_jobs = parallel_func(sqrt, n_jobs=-1, verbose=0)
     y = parallel(p_func(i**2) for i in range(10))
     testing.assert_equal(x,y)
+
+def test_serial():
+    # no joblib needed
+    parallel, p_func, n_jobs = parallel_func(sqrt, n_jobs=1)
+    testing.assert_(parallel is list)
+    testing.assert_(p_func is sqrt)
+    testing.assert_equal(n_jobs, 1)
+
+def test_split_jobs():
+    x = arange(10)
+    testing.assert_equal(len(split_jobs(x, 1)), 4)
+    testing.assert_equal(len(split_jobs(x, 4)), 10)
+    testing.assert_equal(concatenate(split_jobs(x, 2)), x)
+    testing.assert_equal(len(split_jobs(x[:0], 2)), 1)
@@ -0,0 +1,83 @@
+"""
+Tests for the sparse linear algebra helpers
+"""
+
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_equal
+from nose.tools import assert_raises, assert_true
+from scipy import sparse
+
+from statsmodels.tools import sparsetools
+
+
+def _xtx():
+    np.random.seed(987125)
+    x = sparse.rand(50, 8, density=.3, format='csr') + sparse.eye(50, 8)
+    return sparse.csc_matrix(x.T.dot(x))
+
+
+class _NoPivots(object):
+    # SuperLU as in scipy < 0.14, without the L and U attributes
+    def __init__(self, factor):
+        self.solve = factor.solve
+
+
+def test_factorize_without_pivots():
+    splu = sparsetools.splinalg.splu
+    try:
+        sparsetools.splinalg.splu = lambda a: _NoPivots(splu(a))
+        xtx = _xtx()
+        factor = sparsetools.factorize(xtx)
+        assert_true(isinstance(factor, _NoPivots))
+        # numerically singular, splu does not fail
+        near = sparse.csc_matrix([[1., 1.], [1., 1. + 1e-13]])
+        assert_raises(ValueError, sparsetools.factorize, near)
+    finally:
+        sparsetools.splinalg.splu = splu
+
+
+def test_condest():
+    xtx = _xtx()
+    dense = xtx.toarray()
+    cond = np.linalg.cond(dense, 1)
+    est = sparsetools._condest(xtx, sparsetools.splinalg.splu(xtx))
+    # Hager's estimate is a lower bound, usually close to the exact value
+    assert_true(cond / 10 <= est <= cond * (1 + 1e-8))
+
+
+def test_inverse_cross_product():
+    xtx = _xtx()
+    inv = np.linalg.inv(xtx.toarray())
+    inv_op = sparsetools.inv_cross_product(xtx)
+    assert_true(isinstance(inv_op, sparsetools.InverseCrossProduct))
+    assert_almost_equal(inv_op.toarray(), inv, 12)
+    assert_almost_equal(np.asarray(inv_op), inv, 12)
+    assert_almost_equal(inv_op.diagonal(), np.diag(inv), 12)
+
+    scaled = 2. * inv_op / 4.
+    assert_almost_equal(scaled.diagonal(), .5 * np.diag(inv), 12)
+    b = np.arange(16.).reshape(8, 2)
+    assert_almost_equal(scaled.dot(b), .5 * np.dot(inv, b), 12)
+
+    cols = np.array([5, 1, 5])
+    assert_almost_equal(inv_op[cols[:,None], cols], inv[cols[:,None], cols],
+                        12)
+    assert_almost_equal(inv_op[3, 3], inv[3, 3], 12)
+
+    # blocks of columns in diagonal
+    inv_op._block_size = 20
+    assert_almost_equal(inv_op.diagonal(), np.diag(inv), 12)
+
+
+def test_leverage_blocks():
+    np.random.seed(987125)
+    exog = sparse.rand(50, 8, density=.3, format='csr') + sparse.eye(50, 8)
+    exog = sparse.csr_matrix(exog)
+    xtx = sparsetools.cross_product(exog)
+    inv_op = sparsetools.inv_cross_product(xtx)
+    inv_op._block_size = 20
+    h = sparsetools.leverage(exog, inv_op)
+    dense = exog.toarray()
+    h2 = np.diag(np.dot(dense, np.linalg.solve(xtx.toarray(), dense.T)))
+    assert_almost_equal(h, h2, 12)
+    assert_equal(h.shape, (50,))
@@ -6,8 +6,9 @@ from numpy.linalg import inv
 from scipy import optimize
 from scipy.stats import t, norm, ss as sumofsq
 from statsmodels.regression.linear_model import OLS
+from statsmodels.tsa.stattools import _nested_ols
 from statsmodels.tsa.tsatools import (lagmat, add_trend,
-                _ar_transparams, _ar_invtransparams)
+                _ar_transparams, _ar_invtransparams, solve_discrete_lyapunov)
 import statsmodels.tsa.base.tsa_model as tsbase
 import statsmodels.base.model as base
 from statsmodels.tools.decorators import (resettable_cache,
@@ -119,11 +120,8 @@ class AR(tsbase.TimeSeriesModel):
 
         # Initial State mean and variance
         alpha = np.zeros((p,1))
-        Q_0 = dot(inv(identity(p**2)-np.kron(T_mat,T_mat)),dot(R_mat,
-                R_mat.T).ravel('F'))
-
-        Q_0 = Q_0.reshape(p,p, order='F') #TODO: order might need to be p+k
-        P = Q_0
+        #TODO: order might need to be p+k
+        P = solve_discrete_lyapunov(T_mat, dot(R_mat, R_mat.T))
         Z_mat = KalmanFilter.Z(p)
         for i in xrange(end): #iterate p-1 times to fit presample
             v_mat = y[i] - dot(Z_mat,alpha)
@@ -388,10 +386,12 @@ class AR(tsbase.TimeSeriesModel):
         Columns are trend terms then lags.
         """
         endog = self.endog
-        X = lagmat(endog, maxlag=k_ar, trim='both')
+        X = lagmat(endog, maxlag=k_ar, trim='both', view=True)
         k_trend = util.get_trendorder(trend)
         if k_trend:
             X = add_trend(X, prepend=True, trend=trend)
+        else:
+            X = np.array(X)
         self.k_trend = k_trend
         return X
 
@@ -426,6 +426,23 @@ class AR(tsbase.TimeSeriesModel):
         k = max(1,k) # handle if startlag is 0
         results = {}
 
+        if method == 'cmle':
+            # conditional MLE is OLS, fit all lag lengths from one QR
+            lags = np.arange(k, maxlag+1)
+            nobs = len(Y)
+            ssr, tvalues = _nested_ols(Y.squeeze(), X, self.k_trend + lags)
+            if ic == 't-stat':
+                stop = 1.6448536269514722 # for t-stat, norm.ppf(.95)
+                for bestlag in range(maxlag,k-1,-1):
+                    if np.abs(tvalues[bestlag - k]) >= stop:
+                        break
+                return bestlag
+            # as in ARResults, sigma2 is ssr/nobs and the constant counts
+            penalty = {'aic' : 2., 'bic' : np.log(nobs),
+                       'hqic' : 2 * np.log(np.log(nobs))}[ic]
+            ics = np.log(ssr/nobs) + penalty * (1 + lags)/nobs
+            return lags[ics.argmin()]
+
         if ic != 't-stat':
             for lag in range(k,maxlag+1):
                 # have to reinstantiate the model to keep comparable models
@@ -21,8 +21,9 @@ from statsmodels.tsa.vector_ar import util
 from statsmodels.tsa.ar_model import AR
 from statsmodels.tsa.arima_process import arma2ma
 from statsmodels.tools.numdiff import (approx_fprime, approx_fprime_cs,
-        approx_hess_cs)
+        approx_hess_cs, EPS)
 from statsmodels.tsa.base.datetools import _index_date
+from statsmodels.tools.data import _is_using_pandas
 from statsmodels.tsa.kalmanf import KalmanFilter
 try:
     from kalmanf import kalman_loglike
@@ -212,6 +213,17 @@ def _make_arma_exog(endog, exog, trend):
         k_trend = 0
     return k_trend, exog
 
+def _append_data(orig, new):
+    # keeps a pandas index if both are pandas objects
+    if orig is None:
+        return None
+    if _is_using_pandas(orig, None) and _is_using_pandas(new, None):
+        return orig.append(new)
+    orig, new = np.asarray(orig), np.asarray(new)
+    if orig.ndim == 2 and new.ndim == 1:
+        new = new[:,None]
+    return np.concatenate((orig, new))
+
 class ARMA(tsbase.TimeSeriesModel):
 
     __doc__ = tsbase._tsa_doc % {"model" : _arma_model,
@@ -278,15 +290,15 @@ class ARMA(tsbase.TimeSeriesModel):
                 arcoefs_tmp = armod.params
                 p_tmp = armod.k_ar
                 resid = endog[p_tmp:] - np.dot(lagmat(endog, p_tmp,
-                                trim='both'), arcoefs_tmp)
+                                trim='both', view=True), arcoefs_tmp)
                 if p < p_tmp + q:
                     endog_start = p_tmp + q - p
                     resid_start = 0
                 else:
                     endog_start = 0
                     resid_start = p - p_tmp - q
-                lag_endog = lagmat(endog, p, 'both')[endog_start:]
-                lag_resid = lagmat(resid, q, 'both')[resid_start:]
+                lag_endog = lagmat(endog, p, 'both', view=True)[endog_start:]
+                lag_resid = lagmat(resid, q, 'both', view=True)[resid_start:]
                 # stack ar lags and resids
                 X = np.column_stack((lag_endog, lag_resid))
                 coefs = GLS(endog[max(p_tmp+q,p):], X).fit().params
@@ -315,14 +327,24 @@ class ARMA(tsbase.TimeSeriesModel):
         return start_params
 
 
+    def _analytic_score(self, params):
+        # exact derivatives of the Kalman filter loglike are only in Cython
+        method = getattr(self, 'method', 'mle')
+        return (fast_kalman and method in ['mle', 'css-mle'] and
+                not np.iscomplexobj(params))
+
     def score(self, params):
         """
         Compute the score function at params.
 
         Notes
         -----
-        This is a numerical approximation.
+        For the exact likelihood the derivatives are computed within the
+        Kalman filter recursions, if the Cython version of the Kalman filter
+        is available. Otherwise this is a numerical approximation.
         """
+        if self._analytic_score(params):
+            return KalmanFilter.score(params, self)
         loglike = self.loglike
         #if self.transparams:
         #    params = self._invtransparams(params)
@@ -335,8 +357,18 @@ class ARMA(tsbase.TimeSeriesModel):
 
         Notes
         -----
-        This is a numerical approximation.
+        This is a numerical approximation. If the analytic score is available
+        this is the numerical derivative of the score, which needs 2*k filter
+        passes instead of the order of k**2 for the second derivative of the
+        loglikelihood.
         """
+        if self._analytic_score(params):
+            # relative step size that does not vanish at zero params
+            epsilon = EPS**(1/3.) * np.maximum(np.abs(params), .1)
+            hess = approx_fprime(params, self.score, epsilon=epsilon,
+                                 centered=True)
+            hess = np.atleast_2d(hess)
+            return (hess + hess.T) / 2.
         loglike = self.loglike
         #if self.transparams:
         #    params = self._invtransparams(params)
@@ -435,7 +467,8 @@ class ARMA(tsbase.TimeSeriesModel):
             (y, k, nobs, k_ar, k_ma, k_lags, newparams, Z_mat, m, R_mat,
             T_mat, paramsdtype) = KalmanFilter._init_kalman_state(params, self)
             errors = KalmanFilter.geterrors(y,k,k_ar,k_ma, k_lags, nobs,
-                    Z_mat, m, R_mat, T_mat, paramsdtype)
+                    Z_mat, m, R_mat, T_mat, paramsdtype,
+                    getattr(self, 'kalman_tol', 0))
             if isinstance(errors, tuple):
                 errors = errors[0] # non-cython version returns a tuple
         else: # use scipy.signal.lfilter
@@ -575,7 +608,7 @@ class ARMA(tsbase.TimeSeriesModel):
 
     def fit(self, order=None, start_params=None, trend='c', method = "css-mle",
             transparams=True, solver=None, maxiter=35, full_output=1,
-            disp=5, callback=None, **kwargs):
+            disp=5, callback=None, kalman_tol=0, **kwargs):
         """
         Fits ARMA(p,q) model using exact maximum likelihood via Kalman filter.
 
@@ -624,6 +657,12 @@ class ARMA(tsbase.TimeSeriesModel):
         callback : function, optional
             Called after each iteration as callback(xk) where xk is the current
             parameter vector.
+        kalman_tol : float, optional
+            The Kalman filter stops updating the state variance once its
+            largest change is at most `kalman_tol`, and uses the steady
+            state Kalman gain for the remaining observations. The default 0
+            only stops at an exact fixed point. The observation at which the
+            steady state was reached is `kalman_steady_state` of the results.
         kwargs
             See Notes for keyword arguments that can be passed to fit.
 
@@ -639,9 +678,9 @@ class ARMA(tsbase.TimeSeriesModel):
         Notes
         ------
         If fit by 'mle', it is assumed for the Kalman Filter that the initial
-        unkown state is zero, and that the inital variance is
-        P = dot(inv(identity(m**2)-kron(T,T)),dot(R,R.T).ravel('F')).reshape(r,
-        r, order = 'F')
+        unkown state is zero, and that the inital variance is the stationary
+        variance P, the solution of P = T P T' + R R'. It is computed with
+        `statsmodels.tsa.tsatools.solve_discrete_lyapunov`.
 
         The below is the docstring from
         `statsmodels.LikelihoodModel.fit`
@@ -671,6 +710,7 @@ class ARMA(tsbase.TimeSeriesModel):
         self.transparams = transparams
 
         self.method = method.lower()
+        self.kalman_tol = kalman_tol
 
         endog, exog = self.endog, self.exog
         k_exog = self.k_exog
@@ -706,9 +746,15 @@ class ARMA(tsbase.TimeSeriesModel):
 
         if solver is None:  # use default limited memory bfgs
             bounds = [(None,)*2]*(k_ar+k_ma+k)
+            if self._analytic_score(start_params):
+                score = lambda params: -self.score(params)
+                approx_grad = False
+            else:
+                score = None
+                approx_grad = True
             mlefit = optimize.fmin_l_bfgs_b(loglike, start_params,
-                    approx_grad=True, m=12, pgtol=1e-8, factr=1e2,
-                    bounds=bounds, iprint=disp)
+                    fprime=score, approx_grad=approx_grad, m=12, pgtol=1e-8,
+                    factr=1e2, bounds=bounds, iprint=disp)
             self.mlefit = mlefit
             params = mlefit[0]
 
@@ -790,7 +836,7 @@ class ARIMA(ARMA):
 
     def fit(self, start_params=None, trend='c', method = "css-mle",
             transparams=True, solver=None, maxiter=35, full_output=1,
-            disp=5, callback=None, **kwargs):
+            disp=5, callback=None, kalman_tol=0, **kwargs):
         """
         Fits ARIMA(p,d,q) model by exact maximum likelihood via Kalman filter.
 
@@ -839,6 +885,12 @@ class ARIMA(ARMA):
         callback : function, optional
             Called after each iteration as callback(xk) where xk is the current
             parameter vector.
+        kalman_tol : float, optional
+            The Kalman filter stops updating the state variance once its
+            largest change is at most `kalman_tol`, and uses the steady
+            state Kalman gain for the remaining observations. The default 0
+            only stops at an exact fixed point. The observation at which the
+            steady state was reached is `kalman_steady_state` of the results.
         kwargs
             See Notes for keyword arguments that can be passed to fit.
 
@@ -854,9 +906,9 @@ class ARIMA(ARMA):
         Notes
         ------
         If fit by 'mle', it is assumed for the Kalman Filter that the initial
-        unkown state is zero, and that the inital variance is
-        P = dot(inv(identity(m**2)-kron(T,T)),dot(R,R.T).ravel('F')).reshape(r,
-        r, order = 'F')
+        unkown state is zero, and that the inital variance is the stationary
+        variance P, the solution of P = T P T' + R R'. It is computed with
+        `statsmodels.tsa.tsatools.solve_discrete_lyapunov`.
 
         The below is the docstring from
         `statsmodels.LikelihoodModel.fit`
@@ -864,7 +916,7 @@ class ARIMA(ARMA):
         arima_fit = super(ARIMA, self).fit(None,
                                start_params, trend, method,
                                transparams, solver, maxiter, full_output,
-                               disp, callback, **kwargs)
+                               disp, callback, kalman_tol, **kwargs)
         if self.k_diff == 0:#TODO: what do to here?
             #Overide results methods or just return ARMA?
             return arima_fit
@@ -1183,6 +1235,17 @@ class ARMAResults(tsbase.TimeSeriesModelResults):
     def llf(self):
         return self.model.loglike(self.params)
 
+    @cache_readonly
+    def kalman_steady_state(self):
+        """
+        The number of observations after which the Kalman filter variance
+        recursions reached the steady state, nobs if they did not.
+        """
+        if 'mle' not in self.model.method:
+            return None
+        self.model.loglike(self.params)
+        return self.model.kalman_steady_state
+
     @cache_readonly
     def bse(self):
         params = self.params
@@ -1311,6 +1374,125 @@ class ARMAResults(tsbase.TimeSeriesModelResults):
 
         return forecast, fcasterr, conf_int
 
+    def append(self, endog, exog=None, refit=False, **kwargs):
+        """
+        Results for the model with new observations appended
+
+        Parameters
+        ----------
+        endog : array-like
+            The new observations of the endogenous variable. For ARIMA these
+            are in levels. Use a pandas object continuing the index of the
+            original data to keep the dates.
+        exog : array-like, optional
+            The new observations of the exogenous variables, without the
+            constant. Required if the model has exogenous variables.
+        refit : bool, optional
+            If False, the default, the parameters are not changed. The
+            Kalman filter continues from the state after the last
+            observation, so the work is proportional to the number of new
+            observations. If True, the model is fit to all observations
+            using the current parameters as starting values.
+        kwargs
+            Keyword arguments for `fit` if `refit` is True. The default
+            method is the one used for these results.
+
+        Returns
+        -------
+        results : ARMAResults or ARIMAResults
+            The residuals, loglikelihood, sigma2 and forecasts include the
+            new observations.
+
+        Notes
+        -----
+        The results keep the final state of the Kalman filter, so that
+        repeated calls to append each only filter the new observations.
+        """
+        model = self.model
+        k_ar, k_ma = self.k_ar, self.k_ma
+        k_diff = getattr(model, 'k_diff', 0)
+        if isinstance(model, ARIMA):
+            order = (k_ar, k_diff, k_ma)
+        else:
+            order = (k_ar, k_ma)
+        if (model.data.orig_exog is None) != (exog is None):
+            raise ValueError("exog must be given if and only if the model "
+                             "has exogenous variables")
+        new_model = _make_arma_model(_append_data(model.data.orig_endog,
+                                                  endog), order,
+                                     _append_data(model.data.orig_exog, exog))
+        trend = 'c' if self.k_trend else 'nc'
+        method = model.method
+        kalman_tol = getattr(model, 'kalman_tol', 0)
+        if refit:
+            kwargs.setdefault('method', method)
+            kwargs.setdefault('kalman_tol', kalman_tol)
+            return new_model.fit(start_params=self.params, trend=trend,
+                                 **kwargs)
+
+        # set up the model like fit does
+        new_model.method = method
+        new_model.transparams = False
+        new_model.kalman_tol = kalman_tol
+        new_model.k_trend, new_model.exog = _make_arma_exog(new_model.endog,
+                                                new_model.data.exog, trend)
+        new_model.exog_names = _make_arma_names(new_model.data,
+                                                self.k_trend, (k_ar, k_ma))
+
+        params = self.params
+        k = self.k_trend + self.k_exog
+        n_new = len(new_model.endog) - len(model.endog)
+        n_lag = n_new + k_ar
+        y = new_model.endog[-n_lag:].astype(float)
+        if k > 0:
+            y -= dot(new_model.exog[-n_lag:], params[:k])
+
+        kalman_state = None
+        if 'mle' in method:
+            kalman_state = getattr(self, '_kalman_state', None)
+            if kalman_state is None:
+                resid, kalman_state = KalmanFilter.filter_state(params, model)
+            else:
+                resid = self.resid
+            errors, kalman_state = KalmanFilter.update_state(params,
+                                    new_model, y[k_ar:], kalman_state)
+            nobs = kalman_state['nobs']
+            sigma2 = kalman_state['ssr'] / nobs
+            llf = -.5 * (kalman_state['logF'] + nobs * log(sigma2))
+            llf -= nobs / 2. * (log(2 * pi) + 1)
+        else:
+            # conditional residuals, need the last k_ma errors
+            resid = self.resid
+            arparams, maparams = self.arparams, self.maparams
+            errors = zeros(k_ma + n_new)
+            if k_ma:
+                last = resid[-k_ma:]
+                errors[k_ma - len(last):k_ma] = last
+            for i in range(n_new):
+                errors[k_ma + i] = (y[k_ar + i] -
+                                    dot(arparams, y[i:k_ar + i][::-1]) -
+                                    dot(maparams, errors[i:k_ma + i][::-1]))
+            errors = errors[k_ma:]
+            nobs = len(new_model.endog) - k_ar
+            ssr = np.dot(resid, resid) + np.dot(errors, errors)
+            sigma2 = ssr / nobs
+            llf = -nobs / 2. * (log(2 * pi) + log(sigma2)) - ssr / (2 * sigma2)
+        new_model.nobs = nobs
+        new_model.sigma2 = sigma2
+
+        results = self.__class__(new_model, params,
+                                 self.normalized_cov_params)
+        results._cache['resid'] = np.r_[resid, errors]
+        results._cache['llf'] = llf
+        if kalman_state is not None:
+            results._kalman_state = kalman_state
+            results._cache['kalman_steady_state'] = \
+                    kalman_state['steady_state']
+        if isinstance(results, ARIMAResults):
+            results.k_diff = k_diff
+            return ARIMAResultsWrapper(results)
+        return ARMAResultsWrapper(results)
+
     def summary(self, alpha=.05):
         """Summarize the Model
 
@@ -1497,6 +1679,201 @@ class ARIMAResultsWrapper(ARMAResultsWrapper):
 wrap.populate_wrapper(ARIMAResultsWrapper, ARIMAResults)
 
 
+def _make_arma_model(endog, order, exog=None):
+    if len(order) == 3:
+        return ARIMA(endog, order, exog)
+    return ARMA(endog, order, exog)
+
+def _arma_converged(model):
+    mlefit = model.mlefit
+    if isinstance(mlefit, tuple): # fmin_l_bfgs_b
+        return mlefit[2]['warnflag'] == 0
+    return mlefit.mle_retvals.get('converged', True)
+
+def _fit_arma_series(endog, order, exog, kwargs):
+    """
+    Fits a single series. Failures are returned, not raised.
+    """
+    # allow series of different length padded with nans
+    valid = np.nonzero(~np.isnan(endog))[0]
+    if len(valid):
+        endog = endog[valid[0]:valid[-1]+1]
+        if exog is not None:
+            exog = exog[valid[0]:valid[-1]+1]
+    try:
+        mod = _make_arma_model(endog, order, exog)
+        res = mod.fit(**kwargs)
+        return (res.params, res.sigma2, res.llf, res.aic, res.bic,
+                res.nobs, _arma_converged(mod), None)
+    except Exception, err:
+        return (None, np.nan, np.nan, np.nan, np.nan, np.nan, False,
+                "%s: %s" % (err.__class__.__name__, err))
+
+def _fit_arma_block(endog, order, exog, kwargs):
+    return [_fit_arma_series(endog[:, i], order, exog, kwargs)
+            for i in range(endog.shape[1])]
+
+def arma_fit_batch(endog, order, exog=None, n_jobs=1, verbose=0, **kwargs):
+    """
+    Fit the same ARMA or ARIMA model to many series.
+
+    Parameters
+    ----------
+    endog : array-like
+        nobs x n_series array or DataFrame. Each column is a series. Series
+        of different length can be padded with NaN at the start and the end.
+    order : iterable
+        The (p,q) order of an ARMA or the (p,d,q) order of an ARIMA model.
+    exog : array-like, optional
+        nobs x k array of exogenous variables shared by all series.
+    n_jobs : int
+        Number of processes. -1 uses all CPUs. Running in parallel requires
+        joblib, see `statsmodels.tools.parallel.parallel_func`.
+    verbose : int
+        Verbosity level of joblib.
+    kwargs
+        Keyword arguments for `ARMA.fit` or `ARIMA.fit`, for example `trend`,
+        `method` and `solver`. The default for `disp` is -1.
+
+    Returns
+    -------
+    ARMABatchResults instance
+
+    Notes
+    -----
+    An exception in the fit of a series is stored in `errors` and does not
+    stop the other fits. The series are sent to the processes in blocks to
+    keep the communication overhead low.
+
+    Examples
+    --------
+    >>> res = arma_fit_batch(sales, (1,1,1), n_jobs=-1, method='css')
+    >>> res.params[res.converged]
+    >>> arima_res = res.get_result(0)
+    """
+    from statsmodels.tools.parallel import parallel_func, split_jobs
+    if hasattr(endog, 'columns'):
+        names = list(endog.columns)
+    else:
+        names = None
+    endog = np.asarray(endog, dtype=float)
+    if endog.ndim == 1:
+        endog = endog[:,None]
+    if exog is not None:
+        exog = np.asarray(exog, dtype=float)
+    kwargs.setdefault('disp', -1)
+    n_series = endog.shape[1]
+
+    parallel, p_func, n_jobs = parallel_func(_fit_arma_block, n_jobs,
+                                             verbose=verbose)
+    blocks = split_jobs(np.arange(n_series), n_jobs)
+    fits = parallel(p_func(endog[:, idx], order, exog, kwargs)
+                    for idx in blocks)
+    fits = [fit for block in fits for fit in block]
+    return ARMABatchResults(endog, order, exog, fits, kwargs, names)
+
+
+class ARMABatchResults(object):
+    """
+    Results of `arma_fit_batch`, one row for each series.
+
+    Attributes
+    ----------
+    params : array
+        n_series x k_params array of parameters, NaN if the fit failed.
+    sigma2 : array
+        Variance of the residuals.
+    llf : array
+        Value of the loglikelihood function.
+    aic : array
+        Akaike Information Criterion.
+    bic : array
+        Bayes Information Criterion.
+    nobs : array
+        Number of observations used in each fit.
+    converged : array
+        Boolean, True if the optimizer converged.
+    errors : list
+        None or the error message if the fit of the series failed.
+    failed : array
+        Boolean, True if the fit of the series failed.
+    names : list or None
+        Column names if endog was a DataFrame.
+    """
+    def __init__(self, endog, order, exog, fits, fit_kwargs, names=None):
+        self.endog = endog
+        self.exog = exog
+        self.order = order
+        self.fit_kwargs = fit_kwargs
+        self.names = names
+        n_series = len(fits)
+        k_params = max([len(fit[0]) for fit in fits if fit[0] is not None]
+                       or [0])
+        params = np.empty((n_series, k_params))
+        params.fill(np.nan)
+        for i, fit in enumerate(fits):
+            if fit[0] is not None:
+                params[i] = fit[0]
+        self.params = params
+        (self.sigma2, self.llf, self.aic, self.bic,
+         self.nobs) = map(np.array, zip(*[fit[1:6] for fit in fits]))
+        self.converged = np.array([fit[6] for fit in fits], dtype=bool)
+        self.errors = [fit[7] for fit in fits]
+        self.failed = np.array([err is not None for err in self.errors])
+
+    def get_result(self, idx):
+        """
+        Full results instance for a single series.
+
+        Parameters
+        ----------
+        idx : int
+            Column index of the series in endog.
+
+        Returns
+        -------
+        ARMAResults or ARIMAResults instance.
+
+        Notes
+        -----
+        The results are built from the stored parameters without fitting
+        the model again. The optimizer output `mlefit` is not available on
+        the model.
+        """
+        if self.failed[idx]:
+            raise ValueError("The fit of series %d failed: %s" %
+                             (idx, self.errors[idx]))
+        endog = self.endog[:, idx]
+        exog = self.exog
+        valid = np.nonzero(~np.isnan(endog))[0]
+        endog = endog[valid[0]:valid[-1]+1]
+        if exog is not None:
+            exog = exog[valid[0]:valid[-1]+1]
+        kwargs = self.fit_kwargs
+        model = _make_arma_model(endog, self.order, exog)
+        params = self.params[idx]
+
+        # set up the model like fit does
+        model.method = kwargs.get('method', 'css-mle').lower()
+        model.transparams = False
+        model.kalman_tol = kwargs.get('kalman_tol', 0)
+        model.k_trend, model.exog = _make_arma_exog(model.endog,
+                                        model.data.exog,
+                                        kwargs.get('trend', 'c'))
+        model.exog_names = _make_arma_names(model.data, model.k_trend,
+                                            (model.k_ar, model.k_ma))
+        model.nobs = len(model.endog)
+        if model.method == 'css':
+            model.nobs -= model.k_ar
+        model.loglike(params) # sets sigma2
+
+        if isinstance(model, ARIMA) and model.k_diff > 0:
+            results = ARIMAResults(model, params, None)
+            results.k_diff = model.k_diff
+            return ARIMAResultsWrapper(results)
+        return ARMAResultsWrapper(ARMAResults(model, params, None))
+
+
 if __name__ == "__main__":
     import numpy as np
     import statsmodels.api as sm
@@ -1,4 +1,4 @@
-from .bk_filter import bkfilter
+from .bk_filter import bkfilter, BKFilterStream
 from .hp_filter import hpfilter
-from .cf_filter import cffilter
+from .cf_filter import cffilter, CFFilterStream
 from .filtertools import miso_lfilter, arfilter
@@ -1,6 +1,36 @@
 import numpy as np
 from scipy.signal import fftconvolve
 
+# weights for recently used (low, high, K)
+_weights_cache = {}
+
+def _bk_weights(low, high, K):
+    # symmetric Baxter-King weights, see bkfilter
+    key = (low, high, K)
+    if key in _weights_cache:
+        return _weights_cache[key]
+    if low < 2:
+        raise ValueError("low cannot be less than 2")
+    omega_1 = 2.*np.pi/high # convert from freq. to periodicity
+    omega_2 = 2.*np.pi/low
+    bweights = np.zeros(2*K+1)
+    bweights[K] = (omega_2 - omega_1)/np.pi # weight at zero freq.
+    j = np.arange(1,int(K)+1)
+    weights = 1/(np.pi*j)*(np.sin(omega_2*j)-np.sin(omega_1*j))
+    bweights[K+j] = weights # j is an idx
+    bweights[:K] = weights[::-1] # make symmetric weights
+    bweights -= bweights.mean() # make sure weights sum to zero
+    if len(_weights_cache) >= 32:
+        _weights_cache.clear()
+    _weights_cache[key] = bweights
+    return bweights
+
+def _bk_apply(bweights, X):
+    if X.ndim == 2:
+        bweights = bweights[:,None]
+    return fftconvolve(bweights, X, mode='valid') # get a centered moving avg/
+                                                  # convolution
+
 def bkfilter(X, low=6, high=32, K=12):
     """
     Baxter-King bandpass filter
@@ -25,6 +55,10 @@ def bkfilter(X, low=6, high=32, K=12):
     Y : array
         Cyclical component of X
 
+    See Also
+    --------
+    BKFilterStream : cycle for observations that are appended
+
     References
     ---------- ::
     Baxter, M. and R. G. King. "Measuring Business Cycles: Approximate
@@ -55,19 +89,61 @@ def bkfilter(X, low=6, high=32, K=12):
 #TODO: allow windowing functions to correct for Gibb's Phenomenon?
 # adjust bweights (symmetrically) by below before demeaning
 # Lancosz Sigma Factors np.sinc(2*j/(2.*K+1))
-    if low < 2:
-        raise ValueError("low cannot be less than 2")
-    X = np.asarray(X)
-    omega_1 = 2.*np.pi/high # convert from freq. to periodicity
-    omega_2 = 2.*np.pi/low
-    bweights = np.zeros(2*K+1)
-    bweights[K] = (omega_2 - omega_1)/np.pi # weight at zero freq.
-    j = np.arange(1,int(K)+1)
-    weights = 1/(np.pi*j)*(np.sin(omega_2*j)-np.sin(omega_1*j))
-    bweights[K+j] = weights # j is an idx
-    bweights[:K] = weights[::-1] # make symmetric weights
-    bweights -= bweights.mean() # make sure weights sum to zero
-    if X.ndim == 2:
-        bweights = bweights[:,None]
-    return fftconvolve(bweights, X, mode='valid') # get a centered moving avg/
-                                                  # convolution
+    bweights = _bk_weights(low, high, K)
+    return _bk_apply(bweights, np.asarray(X))
+
+
+class BKFilterStream(object):
+    """
+    Baxter-King bandpass filter for appended observations
+
+    Parameters
+    ----------
+    low : float
+        Minimum period for oscillations, see bkfilter.
+    high : float
+        Maximum period for oscillations, see bkfilter.
+    K : int
+        Lead-lag length of the filter, see bkfilter.
+
+    Notes
+    -----
+    The cycle at time t needs the observations up to t + K. Each call to
+    update returns the cycle for the observations that became available
+    with the new data, so that the concatenated results are equal to bkfilter
+    applied to all observations. Only the last 2*K observations are kept.
+
+    Examples
+    --------
+    >>> stream = BKFilterStream(6, 32, 12)
+    >>> cycle = stream.update(X[:100])  # cycle of X[12:88]
+    >>> cycle_new = stream.update(X[100:104])  # cycle of X[88:92]
+    """
+    def __init__(self, low=6, high=32, K=12):
+        self.K = K
+        self.bweights = _bk_weights(low, high, K)
+        self._buffer = None
+
+    def update(self, X):
+        """
+        Append observations and return the cycle that became available
+
+        Parameters
+        ----------
+        X : array-like
+            new observations, 1d or 2d with one series per column as in the
+            first call
+
+        Returns
+        -------
+        cycle : array
+            cycle for the observations that have K leads since the last
+            call, can have length zero
+        """
+        X = np.asarray(X, float)
+        if self._buffer is not None:
+            X = np.concatenate((self._buffer, X))
+        self._buffer = X[max(len(X) - 2*self.K, 0):]
+        if len(X) < 2*self.K + 1:
+            return np.zeros((0,) + X.shape[1:])
+        return _bk_apply(self.bweights, X)
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.signal import fftconvolve
 
 # the data is sampled quarterly, so cut-off frequency of 18
 
@@ -8,7 +9,45 @@ import numpy as np
 # number between  0 and 1, where 1 corresponds to the Nyquist frequency, p
 # radians per sample.
 
-#NOTE: uses a loop, could probably be sped-up for very large datasets
+# weights for recently used (low, high, nobs)
+_weights_cache = {}
+
+def _cf_weights(low, high, nobs):
+    """
+    Weights of the random walk CF filter for a sample of length nobs
+
+    Returns
+    -------
+    B0 : float
+        weight of the current observation
+    Bj : ndarray (nobs,)
+        ideal band-pass weights B_j for j = 0, ..., nobs - 1 with B_0 set
+        to zero, the kernel for the leads and the lags
+    B : ndarray (nobs,)
+        weight of the last observation for each time point
+    A : ndarray (nobs,)
+        weight of the first observation for each time point
+    """
+    key = (low, high, nobs)
+    if key in _weights_cache:
+        return _weights_cache[key]
+    a = 2*np.pi/high
+    b = 2*np.pi/low
+    J = np.arange(1, nobs)
+    Bj = (np.sin(b*J)-np.sin(a*J))/(np.pi*J)
+    B0 = (b-a)/np.pi
+    # csum[k] = Bj[1] + ... + Bj[k]
+    csum = np.r_[0, np.cumsum(Bj)]
+    t = np.arange(nobs)
+    sum_leads = csum[np.maximum(nobs - t - 2, 0)]
+    sum_lags = csum[np.maximum(t - 1, 0)]
+    B = -.5*B0 - sum_leads
+    A = -B0 - sum_leads - sum_lags - B
+    if len(_weights_cache) >= 32:
+        _weights_cache.clear()
+    weights = _weights_cache[key] = (B0, np.r_[0, Bj], B, A)
+    return weights
+
 def cffilter(X, low=6, high=32, drift=True):
     """
     Christiano Fitzgerald asymmetric, random walk filter
@@ -35,8 +74,23 @@ def cffilter(X, low=6, high=32, drift=True):
         The features of `X` between periodicities given by low and high
     trend : array
         The trend in the data with the cycles removed.
+
+    See Also
+    --------
+    CFFilterStream : real-time estimates for observations that are appended
+
+    Notes
+    -----
+    The filtered value at time t is
+
+    B0*X[t] + sum_j B_j*X[t+j] + sum_j B_j*X[t-j] + B[t]*X[-1] + A[t]*X[0]
+
+    where the leads run over the interior observations after t and the lags
+    over the interior observations before t. Both sums are computed for all
+    t and all columns with two fft convolutions. The weights only depend on
+    low, high and nobs and are cached.
     """
-#TODO: cythonize/vectorize loop?, add ability for symmetric filter,
+#TODO: add ability for symmetric filter,
 #      and estimates of theta other than random walk.
     if low < 2:
         raise ValueError("low must be >= 2")
@@ -44,27 +98,107 @@ def cffilter(X, low=6, high=32, drift=True):
     if X.ndim == 1:
         X = X[:,None]
     nobs, nseries = X.shape
-    a = 2*np.pi/high
-    b = 2*np.pi/low
 
     if drift: # get drift adjusted series
         X = X - np.arange(nobs)[:,None]*(X[-1] - X[0])/(nobs-1)
 
-    J = np.arange(1,nobs+1)
-    Bj = (np.sin(b*J)-np.sin(a*J))/(np.pi*J)
-    B0 = (b-a)/np.pi
-    Bj = np.r_[B0,Bj][:,None]
-    y = np.zeros((nobs,nseries))
-
-    for i in xrange(nobs):
-
-        B = -.5*Bj[0] -np.sum(Bj[1:-i-2])
-        A = -Bj[0] - np.sum(Bj[1:-i-2]) - np.sum(Bj[1:i]) - B
-        y[i] = Bj[0] * X[i] + np.dot(Bj[1:-i-2].T,X[i+1:-1]) + B*X[-1] + \
-                np.dot(Bj[1:i].T, X[1:i][::-1]) + A*X[0]
+    B0, Bj, B, A = _cf_weights(low, high, nobs)
+    Bj = Bj[:,None]
+    # the first and last observation only enter through A and B
+    X_lags = X.copy()
+    X_lags[0] = 0
+    X_leads = X[::-1].copy()
+    X_leads[0] = 0
+    lags = fftconvolve(Bj, X_lags)[:nobs]
+    leads = fftconvolve(Bj, X_leads)[:nobs][::-1]
+    y = B0*X + leads + B[:,None]*X[-1] + lags + A[:,None]*X[0]
     y = y.squeeze()
     return y, X.squeeze()-y
 
+
+class CFFilterStream(object):
+    """
+    Real-time Christiano Fitzgerald filter for appended observations
+
+    Parameters
+    ----------
+    low : float
+        Minimum period of oscillations, see cffilter.
+    high : float
+        Maximum period of oscillations, see cffilter.
+    drift : bool
+        Whether or not to remove a trend from the data, see cffilter.
+
+    Notes
+    -----
+    The cycle at the end of the sample is the last value of cffilter applied
+    to all observations so far. It only uses the lags and costs O(nobs) for
+    each new observation. The cycle of the earlier observations is revised
+    with every new observation, use cffilter for the full sample.
+
+    Examples
+    --------
+    >>> stream = CFFilterStream(6, 32)
+    >>> cycle = stream.update(X[:100])
+    >>> cycle_new = stream.update(X[100:104])
+    """
+    def __init__(self, low=6, high=32, drift=True):
+        if low < 2:
+            raise ValueError("low must be >= 2")
+        self.low = low
+        self.high = high
+        self.drift = drift
+        self.data = None
+
+    def update(self, X):
+        """
+        Append observations and return their real-time cycle
+
+        Parameters
+        ----------
+        X : array-like
+            new observations, 1d or 2d with one series per column as in the
+            first call
+
+        Returns
+        -------
+        cycle : array
+            cycle at each of the new observations given the observations up
+            to that time, nan for the first observation
+        """
+        X = np.asarray(X, float)
+        squeeze = X.ndim == 1
+        if squeeze:
+            X = X[:,None]
+        n_old = 0
+        if self.data is not None:
+            n_old = len(self.data)
+            X = np.concatenate((self.data, X))
+        self.data = X
+        nobs = len(X)
+        a = 2*np.pi/self.high
+        b = 2*np.pi/self.low
+        B0 = (b-a)/np.pi
+        J = np.arange(1, nobs)
+        Bj = ((np.sin(b*J)-np.sin(a*J))/(np.pi*J))[:,None]
+        cycle = np.empty((nobs - n_old, X.shape[1]))
+        for i, n in enumerate(range(n_old + 1, nobs + 1)):
+            if n == 1:
+                cycle[i] = np.nan
+                continue
+            x = X[:n]
+            x0, xn = x[0], x[-1]
+            if self.drift:
+                x = x - np.arange(n)[:,None]*(xn - x0)/(n - 1)
+                xn = x[-1]
+            # lags B_1..B_{n-2} of the interior observations, see cffilter
+            sum_lags = Bj[:n-2].sum(0)
+            cycle[i] = (.5*B0*xn + (Bj[:n-2]*x[n-2:0:-1]).sum(0) +
+                        (-.5*B0 - sum_lags)*x0)
+        if squeeze:
+            cycle = cycle[:,0]
+        return cycle
+
 if __name__ == "__main__":
     import statsmodels as sm
     dta = sm.datasets.macrodata.load().data[['infl','tbilrate']].view((float,2))[1:]
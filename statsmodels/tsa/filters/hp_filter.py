@@ -1,8 +1,34 @@
-from scipy import sparse
-from scipy.sparse import dia_matrix, eye as speye
-from scipy.sparse.linalg import spsolve
+from scipy.linalg import solveh_banded
 import numpy as np
 
+def _penalty_banded(nobs, diff_coefs, lamb):
+    """
+    I + lamb*K'K in upper banded storage for solveh_banded
+
+    K is the (nobs - p) x nobs difference matrix with the p + 1 coefficients
+    diff_coefs in each row. The band of I + lamb*K'K has width p.
+    """
+    diff_coefs = np.asarray(diff_coefs, float)
+    p = len(diff_coefs) - 1
+    ab = np.zeros((p + 1, nobs))
+    ab[p] = 1.
+    nrows = nobs - p
+    if nrows > 0:
+        # row r of K contributes c[i]*c[j] to element (r + i, r + j)
+        for i in range(p + 1):
+            for j in range(i, p + 1):
+                ab[p - (j - i), j:j + nrows] += (lamb * diff_coefs[i] *
+                                                 diff_coefs[j])
+    return ab
+
+def _solve_penalized(X, diff_coefs, lamb):
+    # banded Cholesky solve of (I + lamb*K'K) T = X for all columns of X
+    ab = _penalty_banded(len(X), diff_coefs, lamb)
+    trend = solveh_banded(ab, X)
+    if isinstance(trend, tuple): # scipy < 0.9 also returns the factor
+        trend = trend[1]
+    return trend
+
 def hpfilter(X, lamb=1600):
     """
     Hodrick-Prescott filter
@@ -10,7 +36,8 @@ def hpfilter(X, lamb=1600):
     Parameters
     ----------
     X : array-like
-        The 1d ndarray timeseries to filter of length (nobs,) or (nobs,1)
+        The 1d ndarray timeseries to filter of length (nobs,) or (nobs,1),
+        or a 2d array of shape (nobs, nseries) with one series per column
     lamb : float
         The Hodrick-Prescott smoothing parameter. A value of 1600 is
         suggested for quarterly data. Ravn and Uhlig suggest using a value
@@ -38,10 +65,10 @@ def hpfilter(X, lamb=1600):
     min sum((X[t] - T[t])**2 + lamb*((T[t+1] - T[t]) - (T[t] - T[t-1]))**2)
      T   t
 
-    Here we implemented the HP filter as a ridge-regression rule using
-    scipy.sparse. In this sense, the solution can be written as
+    Here we implemented the HP filter as a ridge-regression rule. In this
+    sense, the solution can be written as
 
-    T = inv(I - lamb*K'K)X
+    T = inv(I + lamb*K'K)X
 
     where I is a nobs x nobs identity matrix, and K is a (nobs-2) x nobs matrix
     such that
@@ -50,6 +77,10 @@ def hpfilter(X, lamb=1600):
     K[i,j] = -2 if i == j + 1
     K[i,j] = 0 otherwise
 
+    I + lamb*K'K is symmetric positive definite with two off-diagonals. It is
+    solved with a banded Cholesky decomposition, scipy.linalg.solveh_banded,
+    in O(nobs) time and memory, for all columns of X at once.
+
     References
     ----------
     Hodrick, R.J, and E. C. Prescott. 1980. "Postwar U.S. Business Cycles: An
@@ -60,27 +91,8 @@ def hpfilter(X, lamb=1600):
         Statistics`, 84(2), 371-80.
     """
     X = np.asarray(X, float)
-    if X.ndim > 1:
+    if X.ndim > 1 and X.shape[1] == 1:
         X = X.squeeze()
-    nobs = len(X)
-    I = speye(nobs,nobs)
-    offsets = np.array([0,1,2])
-    data = np.repeat([[1.],[-2.],[1.]], nobs, axis=1)
-    K = dia_matrix((data, offsets), shape=(nobs-2,nobs))
-
-    import scipy
-    if (X.dtype != np.dtype('<f8') and
-            int(scipy.__version__[:3].split('.')[1]) < 11):
-        #scipy umfpack bug on Big Endian machines, will be fixed in 0.11
-        use_umfpack = False
-    else:
-        use_umfpack = True
-
-    if scipy.__version__[:3] == '0.7':
-        #doesn't have use_umfpack option
-        #will be broken on big-endian machines with scipy 0.7 and umfpack
-        trend = spsolve(I+lamb*K.T.dot(K), X)
-    else:
-        trend = spsolve(I+lamb*K.T.dot(K), X, use_umfpack=use_umfpack)
+    trend = _solve_penalized(X, [1., -2., 1.], lamb)
     cycle = X-trend
     return cycle, trend
@@ -1,7 +1,9 @@
+import numpy as np
 from numpy.testing import assert_almost_equal
 from numpy import array, column_stack
 from statsmodels.datasets import macrodata
-from statsmodels.tsa.filters import bkfilter, hpfilter, cffilter
+from statsmodels.tsa.filters import (bkfilter, hpfilter, cffilter,
+                                    BKFilterStream, CFFilterStream)
 
 def test_bking1d():
     """
@@ -327,6 +329,22 @@ def test_hpfilter():
     res = column_stack((hpfilter(dta,1600)))
     assert_almost_equal(res,hpfilt_res,6)
 
+def test_hpfilter_2d():
+    dta = macrodata.load().data
+    x = column_stack((dta['realgdp'], dta['realcons'], dta['realinv']))
+    cycle, trend = hpfilter(x, 1600)
+    for i in range(3):
+        cycle1, trend1 = hpfilter(x[:, i], 1600)
+        assert_almost_equal(cycle[:, i], cycle1, 8)
+        assert_almost_equal(trend[:, i], trend1, 8)
+    # dense version of the normal equations
+    nobs = len(x)
+    K = np.zeros((nobs - 2, nobs))
+    for i in range(nobs - 2):
+        K[i, i:i+3] = [1., -2., 1.]
+    trend_dense = np.linalg.solve(np.eye(nobs) + 1600 * np.dot(K.T, K), x)
+    assert_almost_equal(trend, trend_dense, 6)
+
 def test_cfitz_filter():
     """
     Test Christiano-Fitzgerald Filter. Results taken from R.
@@ -541,6 +559,24 @@ def test_cfitz_filter():
     cyc, trend = cffilter(dta[:,1])
     assert_almost_equal(cyc, cfilt_res[:,1], 8)
 
+def test_bkfilter_stream():
+    dta = macrodata.load().data[['realinv','cpi']].view((float,2))
+    stream = BKFilterStream(6, 32, 12)
+    cycles = [stream.update(dta[:20]), stream.update(dta[20:30]),
+              stream.update(dta[30:31]), stream.update(dta[31:])]
+    assert_almost_equal(np.concatenate(cycles), bkfilter(dta, 6, 32, 12), 8)
+
+def test_cffilter_stream():
+    dta = macrodata.load().data[['tbilrate','infl']].view((float,2))[1:41]
+    stream = CFFilterStream(6, 32)
+    cycle = np.concatenate([stream.update(dta[:10]), stream.update(dta[10:])])
+    assert np.isnan(cycle[0]).all()
+    for t in range(1, len(dta)):
+        assert_almost_equal(cycle[t], cffilter(dta[:t+1])[0][-1], 8)
+    stream = CFFilterStream(6, 32, drift=False)
+    cycle = stream.update(dta[:, 0])
+    assert_almost_equal(cycle[-1], cffilter(dta[:, 0], drift=False)[0][-1], 8)
+
 if __name__ == "__main__":
     import nose
     nose.runmodule(argv=[__file__, '-vvs', '-x', '--pdb'], exit=False)
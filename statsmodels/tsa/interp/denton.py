@@ -5,6 +5,7 @@ from numpy import (dot, eye, diag_indices, zeros, column_stack, ones, diag,
 from numpy.linalg import inv, solve
 #from scipy.linalg import block_diag
 from scipy import linalg
+from scipy.linalg import solve_banded
 
 #def denton(indicator, benchmark, freq="aq", **kwarg):
 #    """
@@ -84,6 +85,45 @@ from scipy import linalg
 #TODO: take code in the string at the end and implement Denton's original
 # method with a few of the penalty functions.
 
+def _denton_banded(z, k):
+    """
+    System matrix of dentonm in general banded storage for solve_banded
+
+    The unknowns are ordered so that the Lagrange multiplier of each
+    low-frequency period follows its k high-frequency observations. The
+    matrix then has u = max(k, 2) sub- and super-diagonals.
+
+    Returns
+    -------
+    ab : ndarray (2*u+1, n+m)
+    u : int
+        number of sub- and super-diagonals
+    pos : ndarray
+        positions of the high-frequency observations
+    lam : ndarray
+        positions of the Lagrange multipliers
+    """
+    n = len(z)
+    m = n // k
+    period = np.arange(n) // k
+    pos = np.arange(n) + period
+    lam = (np.arange(m) + 1) * (k + 1) - 1
+    u = max(k, 2)
+    ab = zeros((2*u + 1, n + m))
+    # a[i, j] is stored in ab[u + i - j, j]
+    zinv = 1. / z
+    # diagonal of Zinv H'H Zinv with H the first difference matrix
+    hth = 2 * ones(n)
+    hth[0] = hth[-1] = 1
+    ab[u, pos] = hth * zinv**2
+    offdiag = -zinv[:-1] * zinv[1:]
+    ab[u + pos[:-1] - pos[1:], pos[1:]] = offdiag
+    ab[u + pos[1:] - pos[:-1], pos[:-1]] = offdiag
+    # adding up constraints
+    ab[u + pos - lam[period], lam[period]] = 1
+    ab[u + lam[period] - pos, pos] = 1
+    return ab, u, pos, lam
+
 
 def dentonm(indicator, benchmark, freq="aq", **kwargs):
     """
@@ -96,10 +136,12 @@ def dentonm(indicator, benchmark, freq="aq", **kwargs):
     indicator
         A low-frequency indicator series.  It is assumed that there are no
         pre-sample indicators.  Ie., the first indicators line up with
-        the first benchmark.
+        the first benchmark. If 2d, then each column is the indicator of the
+        corresponding benchmark column.
     benchmark : array-like
         The higher frequency benchmark.  A 1d or 2d data series in columns.
-        If 2d, then M series are assumed.
+        If 2d, then M series are assumed. A 1d indicator is used for all
+        columns.
     freq : str {"aq","qm", "other"}
         "aq" - Benchmarking an annual series to quarterly.
         "mq" - Benchmarking a quarterly series to monthly.
@@ -140,6 +182,9 @@ def dentonm(indicator, benchmark, freq="aq", **kwargs):
     sum(X) = A, for each period.  Where X is the benchmarked series, I is
     the indicator, and A is the benchmark.
 
+    The first order conditions are solved as a banded linear system, so time
+    and memory are linear in the number of observations.
+
 
     References
     ----------
@@ -196,39 +241,29 @@ def dentonm(indicator, benchmark, freq="aq", **kwargs):
     else:
         q = 0
 
-    # make the aggregator matrix
-    #B = block_diag(*(ones((k,1)),)*m)
-    B = np.kron(np.eye(m), ones((k,1)))
-
-    # following the IMF paper, we can do
-    Zinv = diag(1./indicator.squeeze()[:n])
-    # this is D in Denton's notation (not using initial value correction)
-#    D = eye(n)
-    # make off-diagonal = -1
-#    D[((np.diag_indices(n)[0])[:-1]+1,(np.diag_indices(n)[1])[:-1])] = -1
-    # account for starting conditions
-#    H = D[1:,:]
-#    HTH = dot(H.T,H)
-    # just make HTH
-    HTH = eye(n)
-    diag_idx0, diag_idx1 = diag_indices(n)
-    HTH[diag_idx0[1:-1], diag_idx1[1:-1]] += 1
-    HTH[diag_idx0[:-1]+1, diag_idx1[:-1]] = -1
-    HTH[diag_idx0[:-1], diag_idx1[:-1]+1] = -1
-
-    W = dot(dot(Zinv,HTH),Zinv)
-
-    # make partitioned matrices
-    #TODO: break this out so that we can simplify the linalg?
-    I = zeros((n+m,n+m))
-    I[:n,:n] = W
-    I[:n,n:] = B
-    I[n:,:n] = B.T
-
-    A = zeros((m+n,1)) # zero first-order constraints
-    A[-m:] = benchmark # adding up constraints
-    X = solve(I,A)
-    X = X[:-m]  # drop the lagrange multipliers
+    # The first order conditions are, with W = Zinv H'H Zinv,
+    #
+    #     [W   B] [X     ]   [0]
+    #     [B'  0] [lambda] = [A]
+    #
+    # where B is the kron(eye(m), ones((k,1))) aggregator matrix. After
+    # interleaving the multipliers the system is banded and each column
+    # is solved in O(n) with a banded LU decomposition.
+    if indicator.shape[1] == 1:
+        ab, u, pos, lam = _denton_banded(indicator[:n, 0], k)
+        rhs = zeros((n+m, benchmark.shape[1]))
+        rhs[lam] = benchmark
+        X = solve_banded((u, u), ab, rhs)[pos]
+    else:
+        if benchmark.shape[1] != indicator.shape[1]:
+            raise ValueError("indicator and benchmark need the same number "
+                             "of columns")
+        X = zeros((n, indicator.shape[1]))
+        for i in range(indicator.shape[1]):
+            ab, u, pos, lam = _denton_banded(indicator[:n, i], k)
+            rhs = zeros(n+m)
+            rhs[lam] = benchmark[:, i]
+            X[:, i] = solve_banded((u, u), ab, rhs)[pos]
 
     # handle extrapolation
     if q > 0:
@@ -22,6 +22,22 @@ def test_denton_quarterly2():
                     109.67405,58.290761,122.62556,190.41409,128.66959])
     np.testing.assert_almost_equal(x_denton, x_stata, 5)
 
+def test_denton_2d():
+    # columns are benchmarked separately, with a shared or own indicator
+    zQ = np.array([50,100,150,100] * 5 + [80, 120])
+    Y = np.array([[500,400,300,400,500], [450,420,390,360,330]]).T
+    x_shared = dentonm(zQ, Y, freq="aq")
+    zQ2 = np.column_stack((zQ, zQ[::-1]))
+    x_own = dentonm(zQ2, Y, freq="aq")
+    for i in range(2):
+        np.testing.assert_almost_equal(x_shared[:, i],
+                                       dentonm(zQ, Y[:, i], freq="aq"), 8)
+        np.testing.assert_almost_equal(x_own[:, i],
+                                       dentonm(zQ2[:, i], Y[:, i],
+                                               freq="aq"), 8)
+    np.testing.assert_almost_equal(x_shared[:20].reshape(5, 4, 2).sum(1), Y,
+                                   8)
+
 if __name__ == "__main__":
     import nose
     nose.runmodule(argv=[__file__,'-vvs','-x', '--pdb'], exit=False)
@@ -0,0 +1,398 @@
+#cython: boundscheck = False
+#cython: wraparound = False
+#cython: cdivision = True
+"""
+Compiled Kalman filter and smoother for general linear Gaussian state space
+models, used by kalmanfilter.statespace_filter.
+
+The model is
+
+    y[t] = Z[t] alpha[t] + epsilon[t],        epsilon[t] ~ N(0, H[t])
+    alpha[t+1] = T[t] alpha[t] + R[t] eta[t],  eta[t] ~ N(0, Q[t])
+
+The system matrices are passed as C contiguous 3d arrays with time in the
+first axis. If the first axis has length one, then the matrix is time
+invariant. Missing observations are nan, only the observed elements of y[t]
+enter the update step.
+
+All matrices are small and stored row major, the products are computed with
+plain loops, so there is no Python overhead in the recursions.
+"""
+
+cimport cython
+cimport numpy as np
+import numpy as np
+from libc.math cimport log
+
+ctypedef np.float64_t DOUBLE
+
+cdef double LOG2PI = 1.8378770664093453
+
+
+cdef inline void matmul(double *A, double *B, double *C, Py_ssize_t n,
+                        Py_ssize_t k, Py_ssize_t m, bint trans_a,
+                        bint trans_b, double alpha, double beta):
+    # C = alpha * op(A) op(B) + beta * C with op(A) n x k and op(B) k x m
+    cdef:
+        Py_ssize_t i, j, l
+        double s, a, b
+    for i in range(n):
+        for j in range(m):
+            s = 0
+            for l in range(k):
+                if trans_a:
+                    a = A[l * n + i]
+                else:
+                    a = A[i * k + l]
+                if trans_b:
+                    b = B[j * k + l]
+                else:
+                    b = B[l * m + j]
+                s += a * b
+            if beta == 0:
+                C[i * m + j] = alpha * s
+            else:
+                C[i * m + j] = beta * C[i * m + j] + alpha * s
+
+
+cdef inline int cholesky(double *A, Py_ssize_t n):
+    # lower triangular Cholesky factor in place, returns -1 if A is not
+    # positive definite
+    cdef:
+        Py_ssize_t i, j, l
+        double s
+    for j in range(n):
+        s = A[j * n + j]
+        for l in range(j):
+            s -= A[j * n + l] * A[j * n + l]
+        if s <= 0:
+            return -1
+        s = s ** 0.5
+        A[j * n + j] = s
+        for i in range(j + 1, n):
+            for l in range(j):
+                A[i * n + j] -= A[i * n + l] * A[j * n + l]
+            A[i * n + j] /= s
+    return 0
+
+
+cdef inline void cho_solve(double *L, double *B, Py_ssize_t n, Py_ssize_t m):
+    # solves L L' X = B in place, B is n x m
+    cdef Py_ssize_t i, j, l
+    for j in range(m):
+        for i in range(n):
+            for l in range(i):
+                B[i * m + j] -= L[i * n + l] * B[l * m + j]
+            B[i * m + j] /= L[i * n + i]
+        for i in range(n - 1, -1, -1):
+            for l in range(i + 1, n):
+                B[i * m + j] -= L[l * n + i] * B[l * m + j]
+            B[i * m + j] /= L[i * n + i]
+
+
+cdef inline Py_ssize_t observed(double *y, Py_ssize_t p, Py_ssize_t *idx):
+    # indices of the non-missing elements of y, returns their number
+    cdef Py_ssize_t i, n_obs = 0
+    for i in range(p):
+        if y[i] == y[i]:
+            idx[n_obs] = i
+            n_obs += 1
+    return n_obs
+
+
+cdef inline void select(double *Z, double *Zo, Py_ssize_t *idx,
+                        Py_ssize_t n_obs, Py_ssize_t m):
+    # rows idx of the p x m matrix Z
+    cdef Py_ssize_t i, j
+    for i in range(n_obs):
+        for j in range(m):
+            Zo[i * m + j] = Z[idx[i] * m + j]
+
+
+cdef inline void symmetrize(double *P, Py_ssize_t m):
+    cdef:
+        Py_ssize_t i, j
+        double s
+    for i in range(m):
+        for j in range(i):
+            s = 0.5 * (P[i * m + j] + P[j * m + i])
+            P[i * m + j] = s
+            P[j * m + i] = s
+
+
+def kalman_filter(np.ndarray[DOUBLE, ndim=2, mode='c'] y,
+                  np.ndarray[DOUBLE, ndim=3, mode='c'] Z,
+                  np.ndarray[DOUBLE, ndim=3, mode='c'] T,
+                  np.ndarray[DOUBLE, ndim=3, mode='c'] R,
+                  np.ndarray[DOUBLE, ndim=3, mode='c'] H,
+                  np.ndarray[DOUBLE, ndim=3, mode='c'] Q,
+                  np.ndarray[DOUBLE, ndim=1, mode='c'] init_state,
+                  np.ndarray[DOUBLE, ndim=2, mode='c'] init_cov):
+    """
+    Kalman filter with time varying system matrices and missing data.
+
+    Parameters
+    ----------
+    y : ndarray
+        nobs x p observations, nan for missing, C contiguous.
+    Z, T, R, H, Q : ndarray
+        System matrices, C contiguous with shapes (n, p, m), (n, m, m),
+        (n, m, r), (n, p, p) and (n, r, r) where n is either nobs or one.
+    init_state : ndarray
+        Mean of the initial state alpha[0].
+    init_cov : ndarray
+        Covariance of the initial state alpha[0], C contiguous.
+
+    Returns
+    -------
+    loglike_obs : ndarray
+        nobs loglikelihood contributions, zero if y[t] is missing.
+    forecast_error : ndarray
+        nobs x p one step ahead forecast errors, nan if missing.
+    forecast_error_cov : ndarray
+        nobs x p x p covariance of the forecast errors, nan for missing
+        rows and columns.
+    predicted_state, predicted_state_cov : ndarray
+        a[t] and P[t] for t = 0, ..., nobs, the mean and covariance of
+        alpha[t] given y[0], ..., y[t-1].
+    filtered_state, filtered_state_cov : ndarray
+        The mean and covariance of alpha[t] given y[0], ..., y[t].
+    """
+    cdef:
+        Py_ssize_t nobs = y.shape[0], p = y.shape[1]
+        Py_ssize_t m = T.shape[1], r = R.shape[2]
+        Py_ssize_t t, i, j, n_obs
+        Py_ssize_t tZ, tT, tR, tH, tQ
+        double logdet, quad
+        double *Zt
+        double *Ht
+        double *a
+        double *P
+        double *af
+        double *Pf
+        np.ndarray[DOUBLE, ndim=1] loglike_obs = np.zeros(nobs)
+        np.ndarray[DOUBLE, ndim=2] v = np.empty((nobs, p)) * np.nan
+        np.ndarray[DOUBLE, ndim=3] F = np.empty((nobs, p, p)) * np.nan
+        np.ndarray[DOUBLE, ndim=2] a_pred = np.empty((nobs + 1, m))
+        np.ndarray[DOUBLE, ndim=3] P_pred = np.empty((nobs + 1, m, m))
+        np.ndarray[DOUBLE, ndim=2] a_filt = np.empty((nobs, m))
+        np.ndarray[DOUBLE, ndim=3] P_filt = np.empty((nobs, m, m))
+        # work arrays
+        np.ndarray[np.intp_t, ndim=1] idx_arr = np.empty(p, dtype=np.intp)
+        np.ndarray[DOUBLE, ndim=1] Zo_arr = np.empty(p * m)
+        np.ndarray[DOUBLE, ndim=1] Fo_arr = np.empty(p * p)
+        np.ndarray[DOUBLE, ndim=1] vo_arr = np.empty(p)
+        np.ndarray[DOUBLE, ndim=1] Fv_arr = np.empty(p)
+        np.ndarray[DOUBLE, ndim=1] M_arr = np.empty(m * p)
+        np.ndarray[DOUBLE, ndim=1] X_arr = np.empty(p * m)
+        np.ndarray[DOUBLE, ndim=1] TP_arr = np.empty(m * m)
+        np.ndarray[DOUBLE, ndim=1] RQ_arr = np.empty(m * r)
+        Py_ssize_t *idx = <Py_ssize_t *>idx_arr.data
+        double *Zo = <double *>Zo_arr.data
+        double *Fo = <double *>Fo_arr.data
+        double *vo = <double *>vo_arr.data
+        double *Fv = <double *>Fv_arr.data
+        double *M = <double *>M_arr.data
+        double *X = <double *>X_arr.data
+        double *TP = <double *>TP_arr.data
+        double *RQ = <double *>RQ_arr.data
+
+    a_pred[0] = init_state
+    P_pred[0] = init_cov
+    for t in range(nobs):
+        tZ = t if Z.shape[0] > 1 else 0
+        tT = t if T.shape[0] > 1 else 0
+        tR = t if R.shape[0] > 1 else 0
+        tH = t if H.shape[0] > 1 else 0
+        tQ = t if Q.shape[0] > 1 else 0
+        Zt = &Z[tZ, 0, 0]
+        Ht = &H[tH, 0, 0]
+        a = &a_pred[t, 0]
+        P = &P_pred[t, 0, 0]
+        af = &a_filt[t, 0]
+        Pf = &P_filt[t, 0, 0]
+
+        n_obs = observed(&y[t, 0], p, idx)
+        for i in range(m):
+            af[i] = a[i]
+        for i in range(m * m):
+            Pf[i] = P[i]
+        if n_obs > 0:
+            select(Zt, Zo, idx, n_obs, m)
+            # v = y - Z a
+            for i in range(n_obs):
+                vo[i] = y[t, idx[i]]
+                for j in range(m):
+                    vo[i] -= Zo[i * m + j] * a[j]
+                v[t, idx[i]] = vo[i]
+            # M = P Z', F = Z P Z' + H
+            matmul(P, Zo, M, m, m, n_obs, 0, 1, 1, 0)
+            for i in range(n_obs):
+                for j in range(n_obs):
+                    Fo[i * n_obs + j] = Ht[idx[i] * p + idx[j]]
+            matmul(Zo, M, Fo, n_obs, m, n_obs, 0, 0, 1, 1)
+            for i in range(n_obs):
+                for j in range(n_obs):
+                    F[t, idx[i], idx[j]] = Fo[i * n_obs + j]
+            if cholesky(Fo, n_obs) != 0:
+                raise np.linalg.LinAlgError("forecast error covariance is "
+                                            "not positive definite at "
+                                            "observation %d" % t)
+            logdet = 0
+            quad = 0
+            for i in range(n_obs):
+                logdet += 2 * log(Fo[i * n_obs + i])
+                Fv[i] = vo[i]
+            cho_solve(Fo, Fv, n_obs, 1)
+            for i in range(n_obs):
+                quad += vo[i] * Fv[i]
+            loglike_obs[t] = -0.5 * (n_obs * LOG2PI + logdet + quad)
+            # a_filt = a + M F^-1 v, P_filt = P - M F^-1 M'
+            for i in range(n_obs):
+                for j in range(m):
+                    X[i * m + j] = M[j * n_obs + i]
+            cho_solve(Fo, X, n_obs, m)
+            matmul(M, Fv, af, m, n_obs, 1, 0, 0, 1, 1)
+            matmul(M, X, Pf, m, n_obs, m, 0, 0, -1, 1)
+            symmetrize(Pf, m)
+
+        # a[t+1] = T a_filt, P[t+1] = T P_filt T' + R Q R'
+        matmul(&T[tT, 0, 0], af, &a_pred[t + 1, 0], m, m, 1, 0, 0, 1, 0)
+        matmul(&T[tT, 0, 0], Pf, TP, m, m, m, 0, 0, 1, 0)
+        matmul(TP, &T[tT, 0, 0], &P_pred[t + 1, 0, 0], m, m, m, 0, 1, 1, 0)
+        matmul(&R[tR, 0, 0], &Q[tQ, 0, 0], RQ, m, r, r, 0, 0, 1, 0)
+        matmul(RQ, &R[tR, 0, 0], &P_pred[t + 1, 0, 0], m, r, m, 0, 1, 1, 1)
+        symmetrize(&P_pred[t + 1, 0, 0], m)
+
+    return loglike_obs, v, F, a_pred, P_pred, a_filt, P_filt
+
+
+def kalman_smoother(np.ndarray[DOUBLE, ndim=3, mode='c'] Z,
+                    np.ndarray[DOUBLE, ndim=3, mode='c'] T,
+                    np.ndarray[DOUBLE, ndim=2, mode='c'] v,
+                    np.ndarray[DOUBLE, ndim=3, mode='c'] F,
+                    np.ndarray[DOUBLE, ndim=2, mode='c'] a_pred,
+                    np.ndarray[DOUBLE, ndim=3, mode='c'] P_pred):
+    """
+    Fixed interval smoother for the output of kalman_filter.
+
+    The backward recursions for r[t] and N[t] of Durbin and Koopman (2001,
+    section 4.3) give the same smoothed states and covariances as the
+    Rauch-Tung-Striebel smoother but do not require the inverse of the
+    predicted state covariance, which is singular for ARMA models.
+
+    Parameters
+    ----------
+    Z, T : ndarray
+        System matrices as in kalman_filter.
+    v, F : ndarray
+        Forecast errors and their covariance from kalman_filter.
+    a_pred, P_pred : ndarray
+        Predicted states and their covariance from kalman_filter.
+
+    Returns
+    -------
+    smoothed_state : ndarray
+        nobs x m mean of alpha[t] given all observations.
+    smoothed_state_cov : ndarray
+        nobs x m x m covariance of alpha[t] given all observations.
+    """
+    cdef:
+        Py_ssize_t nobs = v.shape[0], p = v.shape[1], m = T.shape[1]
+        Py_ssize_t t, i, j, n_obs, tZ, tT
+        double *Tt
+        double *a
+        double *P
+        double *tmp
+        np.ndarray[DOUBLE, ndim=2] a_smooth = np.empty((nobs, m))
+        np.ndarray[DOUBLE, ndim=3] P_smooth = np.empty((nobs, m, m))
+        # work arrays
+        np.ndarray[np.intp_t, ndim=1] idx_arr = np.empty(p, dtype=np.intp)
+        np.ndarray[DOUBLE, ndim=1] Zo_arr = np.empty(p * m)
+        np.ndarray[DOUBLE, ndim=1] Fo_arr = np.empty(p * p)
+        np.ndarray[DOUBLE, ndim=1] u_arr = np.empty(p)
+        np.ndarray[DOUBLE, ndim=1] M_arr = np.empty(m * p)
+        np.ndarray[DOUBLE, ndim=1] X_arr = np.empty(p * m)
+        np.ndarray[DOUBLE, ndim=1] K_arr = np.empty(m * p)
+        np.ndarray[DOUBLE, ndim=1] L_arr = np.empty(m * m)
+        np.ndarray[DOUBLE, ndim=1] NL_arr = np.empty(m * m)
+        np.ndarray[DOUBLE, ndim=1] r_arr = np.zeros(m)
+        np.ndarray[DOUBLE, ndim=1] r_new_arr = np.empty(m)
+        np.ndarray[DOUBLE, ndim=1] N_arr = np.zeros(m * m)
+        np.ndarray[DOUBLE, ndim=1] N_new_arr = np.empty(m * m)
+        Py_ssize_t *idx = <Py_ssize_t *>idx_arr.data
+        double *Zo = <double *>Zo_arr.data
+        double *Fo = <double *>Fo_arr.data
+        double *u = <double *>u_arr.data
+        double *M = <double *>M_arr.data
+        double *X = <double *>X_arr.data
+        double *K = <double *>K_arr.data
+        double *L = <double *>L_arr.data
+        double *NL = <double *>NL_arr.data
+        double *r = <double *>r_arr.data
+        double *r_new = <double *>r_new_arr.data
+        double *N = <double *>N_arr.data
+        double *N_new = <double *>N_new_arr.data
+
+    for t in range(nobs - 1, -1, -1):
+        tZ = t if Z.shape[0] > 1 else 0
+        tT = t if T.shape[0] > 1 else 0
+        Tt = &T[tT, 0, 0]
+        a = &a_pred[t, 0]
+        P = &P_pred[t, 0, 0]
+
+        n_obs = observed(&v[t, 0], p, idx)
+        # r[t-1] = T' r[t], N[t-1] = T' N[t] T without observations
+        for i in range(m * m):
+            L[i] = Tt[i]
+        matmul(Tt, r, r_new, m, m, 1, 1, 0, 1, 0)
+        if n_obs > 0:
+            select(&Z[tZ, 0, 0], Zo, idx, n_obs, m)
+            for i in range(n_obs):
+                for j in range(n_obs):
+                    Fo[i * n_obs + j] = F[t, idx[i], idx[j]]
+            cholesky(Fo, n_obs)
+            # K = T P Z' F^-1, L = T - K Z
+            matmul(P, Zo, M, m, m, n_obs, 0, 1, 1, 0)
+            for i in range(n_obs):
+                for j in range(m):
+                    X[i * m + j] = M[j * n_obs + i]
+            cho_solve(Fo, X, n_obs, m)
+            matmul(Tt, X, K, m, m, n_obs, 0, 1, 1, 0)
+            matmul(K, Zo, L, m, n_obs, m, 0, 0, -1, 1)
+            # r[t-1] = Z' (F^-1 v - K' r[t]) + T' r[t]
+            for i in range(n_obs):
+                u[i] = v[t, idx[i]]
+            cho_solve(Fo, u, n_obs, 1)
+            matmul(K, r, u, n_obs, m, 1, 1, 0, -1, 1)
+            matmul(Zo, u, r_new, m, n_obs, 1, 1, 0, 1, 1)
+            # N[t-1] = Z' F^-1 Z + L' N[t] L, X is reused for F^-1 Z
+            for i in range(n_obs * m):
+                X[i] = Zo[i]
+            cho_solve(Fo, X, n_obs, m)
+            matmul(Zo, X, N_new, m, n_obs, m, 1, 0, 1, 0)
+            matmul(N, L, NL, m, m, m, 0, 0, 1, 0)
+            matmul(L, NL, N_new, m, m, m, 1, 0, 1, 1)
+        else:
+            matmul(N, L, NL, m, m, m, 0, 0, 1, 0)
+            matmul(L, NL, N_new, m, m, m, 1, 0, 1, 0)
+        symmetrize(N_new, m)
+
+        # smoothed state a + P r[t-1] and covariance P - P N[t-1] P
+        matmul(P, r_new, &a_smooth[t, 0], m, m, 1, 0, 0, 1, 0)
+        for i in range(m):
+            a_smooth[t, i] += a[i]
+        matmul(N_new, P, NL, m, m, m, 0, 0, 1, 0)
+        for i in range(m * m):
+            P_smooth[t, i // m, i % m] = P[i]
+        matmul(P, NL, &P_smooth[t, 0, 0], m, m, m, 0, 0, -1, 1)
+        symmetrize(&P_smooth[t, 0, 0], m)
+
+        tmp = r
+        r = r_new
+        r_new = tmp
+        tmp = N
+        N = N_new
+        N_new = tmp
+
+    return a_smooth, P_smooth
@@ -2,7 +2,7 @@
 from numpy cimport float64_t, ndarray, complex128_t, complex64_t
 from numpy import log as nplog
 from numpy import identity, dot, kron, zeros, pi, exp, eye, sum, empty, ones
-from numpy.linalg import pinv
+from statsmodels.tsa.tsatools import solve_discrete_lyapunov
 cimport cython
 
 ctypedef float64_t DOUBLE
@@ -20,9 +20,16 @@ def kalman_filter_double(ndarray[DOUBLE, ndim=1] y,
                   unsigned int r, unsigned int nobs,
                    ndarray[DOUBLE, ndim=2] Z_mat,
                    ndarray[DOUBLE, ndim=2] R_mat,
-                   ndarray[DOUBLE, ndim=2] T_mat):
+                   ndarray[DOUBLE, ndim=2] T_mat,
+                   double tol=0):
     """
     Cython version of the Kalman filter recursions for an ARMA process.
+
+    The variance recursions stop once the largest change in P is at most
+    `tol`. From then on only the state and the forecast errors are updated,
+    using the last Kalman gain. Also returns the number of observations after
+    which the filter reached this steady state, nobs if it did not, and the
+    predicted state and its variance after the last observation.
     """
     m = Z_mat.shape[1]
     # store forecast-errors
@@ -31,14 +38,14 @@ def kalman_filter_double(ndarray[DOUBLE, ndim=1] y,
     F = ones((nobs,1))
     loglikelihood = zeros((1,1))
     cdef int i = 0
+    cdef unsigned int steady_state = nobs
     # initial state
 #    cdef np.ndarray[DOUBLE, ndim=2] alpha = zeros((m,1))
     alpha = zeros((m,1))
     # initial variance
-    P = dot(pinv(identity(m**2)-kron(T_mat, T_mat)),dot(R_mat,
-            R_mat.T).ravel('F')).reshape(r,r, order='F')
-    F_mat = 0
-    while not F_mat == 1 and i < nobs:
+    P = solve_discrete_lyapunov(T_mat, dot(R_mat, R_mat.T))
+    RR = dot(R_mat, R_mat.T)
+    while i < nobs:
         # Predict
         v_mat = y[i] - dot(Z_mat,alpha) # one-step forecast error
         v[i] = v_mat
@@ -49,14 +56,22 @@ def kalman_filter_double(ndarray[DOUBLE, ndim=1] y,
         # update state
         alpha = dot(T_mat, alpha) + dot(K,v_mat)
         L = T_mat - dot(K,Z_mat)
-        P = dot(dot(T_mat, P), L.T) + dot(R_mat, R_mat.T)
+        P_new = dot(dot(T_mat, P), L.T) + RR
         loglikelihood += log(F_mat)
         i+=1
+        if abs(P_new - P).max() <= tol:
+            steady_state = i
+            P = P_new
+            break
+        P = P_new
+    # steady state, F and K do not change anymore
+    F[i:] = F_mat
+    loglikelihood += (nobs - i) * log(F_mat)
     for i in xrange(i,nobs):
         v_mat = y[i] - dot(Z_mat,alpha)
         v[i] = v_mat
         alpha = dot(T_mat, alpha) + dot(K, v_mat)
-    return v, F, loglikelihood
+    return v, F, loglikelihood, steady_state, alpha, P
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -66,9 +81,16 @@ def kalman_filter_complex(ndarray[COMPLEX128, ndim=1] y,
                   unsigned int r, unsigned int nobs,
                    ndarray[DOUBLE, ndim=2] Z_mat,
                    ndarray[COMPLEX128, ndim=2] R_mat,
-                   ndarray[COMPLEX128, ndim=2] T_mat):
+                   ndarray[COMPLEX128, ndim=2] T_mat,
+                   double tol=0):
     """
     Cython version of the Kalman filter recursions for an ARMA process.
+
+    The variance recursions stop once the largest change in P is at most
+    `tol`. From then on only the state and the forecast errors are updated,
+    using the last Kalman gain. Also returns the number of observations after
+    which the filter reached this steady state, nobs if it did not, and the
+    predicted state and its variance after the last observation.
     """
     m = Z_mat.shape[1]
     # store forecast-errors
@@ -77,14 +99,14 @@ def kalman_filter_complex(ndarray[COMPLEX128, ndim=1] y,
     F = ones((nobs,1), dtype=complex)
     loglikelihood = zeros((1,1), dtype=complex)
     cdef int i = 0
+    cdef unsigned int steady_state = nobs
     # initial state
 #    cdef np.ndarray[DOUBLE, ndim=2] alpha = zeros((m,1))
     alpha = zeros((m,1))
     # initial variance
-    P = dot(pinv(identity(m**2)-kron(T_mat, T_mat)),dot(R_mat,
-            R_mat.T).ravel('F')).reshape(r,r, order='F')
-    F_mat = 0
-    while not F_mat == 1 and i < nobs:
+    P = solve_discrete_lyapunov(T_mat, dot(R_mat, R_mat.T))
+    RR = dot(R_mat, R_mat.T)
+    while i < nobs:
         # Predict
         v_mat = y[i] - dot(Z_mat,alpha) # one-step forecast error
         v[i] = v_mat
@@ -95,14 +117,22 @@ def kalman_filter_complex(ndarray[COMPLEX128, ndim=1] y,
         # update state
         alpha = dot(T_mat, alpha) + dot(K,v_mat)
         L = T_mat - dot(K,Z_mat)
-        P = dot(dot(T_mat, P), L.T) + dot(R_mat, R_mat.T)
+        P_new = dot(dot(T_mat, P), L.T) + RR
         loglikelihood += nplog(F_mat)
         i+=1
+        if abs(P_new - P).max() <= tol:
+            steady_state = i
+            P = P_new
+            break
+        P = P_new
+    # steady state, F and K do not change anymore
+    F[i:] = F_mat
+    loglikelihood += (nobs - i) * nplog(F_mat)
     for i in xrange(i,nobs):
         v_mat = y[i] - dot(Z_mat,alpha)
         v[i] = v_mat
         alpha = dot(T_mat, alpha) + dot(K, v_mat)
-    return v,F,loglikelihood
+    return v, F, loglikelihood, steady_state, alpha, P
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -112,15 +142,20 @@ def kalman_loglike_double(ndarray[DOUBLE, ndim=1] y,
                   unsigned int r, unsigned int nobs,
                    ndarray[DOUBLE, ndim=2] Z_mat,
                    ndarray[DOUBLE, ndim=2] R_mat,
-                   ndarray[DOUBLE, ndim=2] T_mat):
+                   ndarray[DOUBLE, ndim=2] T_mat,
+                   double tol=0):
     """
-    Cython version of the Kalman filter recursions for an ARMA process.
+    Cython version of the Kalman filter loglikelihood for an ARMA process.
+
+    Returns the loglikelihood, sigma2 and the steady state observation of
+    kalman_filter_double.
     """
-    v, F, loglikelihood = kalman_filter_double(y,k,p,q,r,nobs,Z_mat,R_mat,T_mat)
+    v, F, loglikelihood, steady_state = kalman_filter_double(y, k, p, q, r,
+                                        nobs, Z_mat, R_mat, T_mat, tol)[:4]
     sigma2 = 1./nobs * sum(v**2 / F)
     loglike = -.5 *(loglikelihood + nobs*log(sigma2))
     loglike -= nobs/2. * (log(2*pi) + 1)
-    return loglike, sigma2
+    return loglike, sigma2, steady_state
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -130,12 +165,133 @@ def kalman_loglike_complex(ndarray[COMPLEX128, ndim=1] y,
                   unsigned int r, unsigned int nobs,
                    ndarray[DOUBLE, ndim=2] Z_mat,
                    ndarray[COMPLEX128, ndim=2] R_mat,
-                   ndarray[COMPLEX128, ndim=2] T_mat):
+                   ndarray[COMPLEX128, ndim=2] T_mat,
+                   double tol=0):
     """
-    Cython version of the Kalman filter recursions for an ARMA process.
+    Cython version of the Kalman filter loglikelihood for an ARMA process.
+
+    Returns the loglikelihood, sigma2 and the steady state observation of
+    kalman_filter_complex.
     """
-    v,F,loglikelihood = kalman_filter_complex(y,k,p,q,r,nobs,Z_mat,R_mat,T_mat)
+    v, F, loglikelihood, steady_state = kalman_filter_complex(y, k, p, q, r,
+                                        nobs, Z_mat, R_mat, T_mat, tol)[:4]
     sigma2 = 1./nobs * sum(v**2 / F)
     loglike = -.5 *(loglikelihood + nobs*nplog(sigma2))
     loglike -= nobs/2. * (log(2*pi) + 1)
-    return loglike, sigma2
+    return loglike, sigma2, steady_state
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def kalman_loglike_score_double(ndarray[DOUBLE, ndim=1] y,
+                   ndarray[DOUBLE, ndim=2] X,
+                   unsigned int k, unsigned int p, unsigned int q,
+                   unsigned int r, unsigned int nobs,
+                   ndarray[DOUBLE, ndim=2] Z_mat,
+                   ndarray[DOUBLE, ndim=2] R_mat,
+                   ndarray[DOUBLE, ndim=2] T_mat,
+                   double tol=0):
+    """
+    Cython version of the Kalman filter loglikelihood for an ARMA process
+    together with its gradient.
+
+    The derivatives of the forecast errors and their variances are computed
+    with recursions that run alongside the filter, see Harvey (1989) section
+    3.4.6. The gradient is with respect to the exogenous coefficients, given
+    by the columns of X, the AR and then the MA coefficients.
+    """
+    cdef unsigned int n_params = k + p + q
+    cdef unsigned int m = Z_mat.shape[1]
+    cdef unsigned int i = 0
+    cdef unsigned int j
+    cdef double v_mat, F_mat, Finv
+    cdef double loglikelihood = 0
+    cdef double ssr_scaled = 0
+    cdef unsigned int steady_state = nobs
+
+    # derivatives of the system matrices
+    dT = zeros((n_params, m, m))
+    for j in range(p):
+        dT[k+j, j, 0] = 1.
+    dR = zeros((n_params, m, 1))
+    for j in range(q):
+        dR[k+p+j, j+1, 0] = 1.
+    RR = dot(R_mat, R_mat.T)
+    dRR = dot(dR, R_mat.T)
+    dRR = dRR + dRR.transpose(0, 2, 1)
+
+    # stationary initial variance and its derivatives, both solve
+    # P = T P T' + Q for the corresponding Q
+    P = solve_discrete_lyapunov(T_mat, RR)
+    TP = dot(T_mat, P)
+    dP = zeros((n_params, m, m))
+    for j in range(k, n_params):
+        dQ = dot(dot(dT[j], P), T_mat.T)
+        dQ = dQ + dQ.T + dRR[j]
+        dP[j] = solve_discrete_lyapunov(T_mat, dQ)
+
+    alpha = zeros(m)
+    dalpha = zeros((n_params, m))
+    dv = empty(n_params)
+    dF = empty(n_params)
+    dlogF = zeros(n_params)
+    dssr_scaled = zeros(n_params)
+    X_coef = X[:, :k]
+
+    while i < nobs:
+        v_mat = y[i] - alpha[0]
+        F_mat = P[0, 0]
+        Finv = 1. / F_mat
+        dv[:] = -dalpha[:, 0]
+        dv[:k] -= X_coef[i]
+        dF[:] = dP[:, 0, 0]
+
+        loglikelihood += log(F_mat)
+        ssr_scaled += v_mat**2 * Finv
+        dlogF += dF * Finv
+        dssr_scaled += 2 * v_mat * dv * Finv - v_mat**2 * dF * Finv**2
+
+        # Kalman gain K = T P Z' / F and its derivatives
+        K = TP[:, 0] * Finv
+        dK = ((dot(dT, P[:, 0]) + dot(dP[:, :, 0], T_mat.T)) * Finv -
+              dF[:, None] * K * Finv)
+
+        # update state
+        dalpha = (dot(dT, alpha) + dot(dalpha, T_mat.T) + dK * v_mat +
+                  K * dv[:, None])
+        alpha = dot(T_mat, alpha) + K * v_mat
+
+        # update state variance, P = T P L' + R R' with L = T - K Z
+        L = T_mat.copy()
+        L[:, 0] -= K
+        dL = dT.copy()
+        dL[:, :, 0] -= dK
+        dTP = (dot(dT, P) +
+               dot(dP.transpose(0, 2, 1), T_mat.T).transpose(0, 2, 1))
+        dP = dot(dTP, L.T) + dot(dL, TP.T).transpose(0, 2, 1) + dRR
+        P_new = dot(TP, L.T) + RR
+        i += 1
+        if abs(P_new - P).max() <= tol:
+            steady_state = i
+            break
+        P = P_new
+        TP = dot(T_mat, P)
+
+    # the variance has converged, only the state and its derivatives change
+    loglikelihood += (nobs - i) * log(F_mat)
+    dlogF += (nobs - i) * dF * Finv
+    for i in xrange(i, nobs):
+        v_mat = y[i] - alpha[0]
+        dv[:] = -dalpha[:, 0]
+        dv[:k] -= X_coef[i]
+        ssr_scaled += v_mat**2 * Finv
+        dssr_scaled += 2 * v_mat * dv * Finv - v_mat**2 * dF * Finv**2
+        dalpha = (dot(dT, alpha) + dot(dalpha, T_mat.T) + dK * v_mat +
+                  K * dv[:, None])
+        alpha = dot(T_mat, alpha) + K * v_mat
+
+    sigma2 = ssr_scaled / nobs
+    loglike = -.5 * (loglikelihood + nobs * log(sigma2))
+    loglike -= nobs / 2. * (log(2 * pi) + 1)
+    score = -.5 * (dlogF + dssr_scaled / sigma2)
+    return loglike, sigma2, score, steady_state
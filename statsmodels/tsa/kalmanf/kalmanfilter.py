@@ -29,11 +29,18 @@ import numpy as np
 from numpy import dot, identity, kron, log, zeros, pi, exp, eye, issubdtype, ones
 from numpy.linalg import inv, pinv
 from statsmodels.tools.tools import chain_dot
+from statsmodels.tools.numdiff import approx_fprime_cs
+from statsmodels.tsa.tsatools import solve_discrete_lyapunov
 try:
     from . import kalman_loglike
     fast_kalman = 1
 except:
     fast_kalman = 0
+try:
+    from . import _statespace
+    fast_statespace = 1
+except:
+    fast_statespace = 0
 #TODO: change to use only Cython when we switch
 
 #Fast filtering and smoothing for multivariate state space models
@@ -43,14 +50,137 @@ except:
 
 def _init_diffuse(T,R):
     m = T.shape[1] # number of states
-    r = R.shape[1] # should also be the number of states?
-    Q_0 = dot(inv(identity(m**2)-kron(T,T)),dot(R,R.T).ravel('F'))
-    return zeros((m,1)), Q_0.reshape(r,r,order='F')
+    return zeros((m,1)), solve_discrete_lyapunov(T, dot(R,R.T))
 
 
 def kalmansmooth(F, A, H, Q, R, y, X, xi10):
     pass
 
+def _system_array(x, nobs):
+    """
+    Returns x as a C contiguous 3d array with time in the first axis.
+
+    A 2d array is time invariant and gets a first axis of length one.
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim < 2:
+        x = np.atleast_2d(x)
+    if x.ndim == 2:
+        x = x[None]
+    if x.shape[0] not in (1, nobs):
+        raise ValueError("time varying system matrices need nobs = %d "
+                         "entries in the first axis, got %d" % (nobs,
+                                                                x.shape[0]))
+    return np.ascontiguousarray(x)
+
+
+def _statespace_init(y, Z, T, R, H, Q, init_state, init_cov):
+    if not fast_statespace:
+        raise ImportError("The compiled state space filter _statespace is "
+                          "not built")
+    y = np.asarray(y, dtype=float)
+    if y.ndim == 1:
+        y = y[:,None]
+    y = np.ascontiguousarray(y)
+    nobs, p = y.shape
+    Z, T, R, H, Q = [_system_array(x, nobs) for x in (Z, T, R, H, Q)]
+    m = T.shape[1]
+    if init_state is None:
+        init_state = zeros(m)
+    init_state = np.ascontiguousarray(init_state, dtype=float).ravel()
+    if init_cov is None:
+        # stationary covariance of alpha[0] from the first T, R and Q
+        RQR = chain_dot(R[0], Q[0], R[0].T)
+        init_cov = solve_discrete_lyapunov(T[0], RQR)
+    init_cov = np.ascontiguousarray(init_cov, dtype=float)
+    if (Z.shape[1:] != (p, m) or T.shape[1:] != (m, m) or
+            R.shape[1] != m or H.shape[1:] != (p, p) or
+            Q.shape[1:] != (R.shape[2], R.shape[2]) or
+            init_state.shape != (m,) or init_cov.shape != (m, m)):
+        raise ValueError("The shapes of the system matrices do not match "
+                         "p = %d observed variables and m = %d states" %
+                         (p, m))
+    return y, Z, T, R, H, Q, init_state, init_cov
+
+
+def statespace_filter(y, Z, T, R, H, Q, init_state=None, init_cov=None):
+    """
+    Kalman filter for a general linear Gaussian state space model.
+
+    Parameters
+    ----------
+    y : array-like
+        The `nobs` x `p` observations. Missing values are nan.
+    Z, T, R, H, Q : array-like
+        The system matrices with shapes (p, m), (m, m), (m, r), (p, p) and
+        (r, r). Time varying matrices have an additional first axis of
+        length `nobs`.
+    init_state : array-like, optional
+        The mean of the initial state alpha[0]. The default is zero.
+    init_cov : array-like, optional
+        The covariance of the initial state alpha[0]. The default is the
+        unconditional covariance of a stationary state using the first
+        T, R and Q.
+
+    Returns
+    -------
+    loglike_obs : ndarray
+        The `nobs` loglikelihood contributions.
+    forecast_error : ndarray
+        The `nobs` x `p` one step ahead forecast errors.
+    forecast_error_cov : ndarray
+        The `nobs` x `p` x `p` covariance of the forecast errors.
+    predicted_state, predicted_state_cov : ndarray
+        a[t] and P[t], the mean and covariance of alpha[t] given the
+        observations up to t-1, for t = 0, ..., nobs.
+    filtered_state, filtered_state_cov : ndarray
+        The mean and covariance of alpha[t] given the observations up to t.
+
+    Notes
+    -----
+    The model is
+
+    y[t] = Z[t].dot(alpha[t]) + epsilon[t],  epsilon[t] ~ N(0, H[t])
+    alpha[t+1] = T[t].dot(alpha[t]) + R[t].dot(eta[t]),  eta[t] ~ N(0, Q[t])
+
+    The recursions run in the compiled extension `_statespace`. Only the
+    observed elements of y[t] enter the update, so rows with some or all
+    values missing are handled without imputation.
+    """
+    return _statespace.kalman_filter(*_statespace_init(y, Z, T, R, H, Q,
+                                                       init_state, init_cov))
+
+
+def statespace_smoother(y, Z, T, R, H, Q, init_state=None, init_cov=None):
+    """
+    Fixed interval smoother for a general linear Gaussian state space model.
+
+    Parameters are the same as for `statespace_filter`.
+
+    Returns
+    -------
+    smoothed_state : ndarray
+        The `nobs` x `m` mean of alpha[t] given all observations.
+    smoothed_state_cov : ndarray
+        The `nobs` x `m` x `m` covariance of alpha[t] given all observations.
+    loglike : float
+        The loglikelihood of y.
+
+    Notes
+    -----
+    The smoother uses the backward recursions of Durbin and Koopman (2001,
+    section 4.3). They give the Rauch-Tung-Striebel smoothed states without
+    inverting the predicted state covariance.
+    """
+    y, Z, T, R, H, Q, init_state, init_cov = _statespace_init(y, Z, T, R, H,
+                                                Q, init_state, init_cov)
+    llf_obs, v, F, a_pred, P_pred = _statespace.kalman_filter(y, Z, T, R, H,
+                                        Q, init_state, init_cov)[:5]
+    a_smooth, P_smooth = _statespace.kalman_smoother(Z, T, v, F,
+                                        np.ascontiguousarray(a_pred),
+                                        np.ascontiguousarray(P_pred))
+    return a_smooth, P_smooth, llf_obs.sum()
+
 def kalmanfilter(F, A, H, Q, R, y, X, xi10, ntrain, history=False):
     """
     Returns the negative log-likelihood of y conditional on the information set
@@ -280,17 +410,15 @@ class StateSpaceModel(object):
         Methods.` Oxford.
     """
     def __init__(self, endog, exog=None, **kwargs):
-        dict.__init__(self, kwargs)
-        self.__dict__ = self
+        self.__dict__.update(kwargs)
 
         endog = np.asarray(endog)
         if endog.ndim == 1:
             endog = endog[:,None]
         self.endog = endog
-        p = endog.shape[1]
-        self.p = nobs
+        self.p = endog.shape[1]
         self.nobs = endog.shape[0]
-        if exog:
+        if exog is not None:
             self.exog = exog
 
     def T(self, params):
@@ -308,37 +436,35 @@ class StateSpaceModel(object):
     def Q(self, params):
         pass
 
-    def _univariatefilter(self, params, init_state, init_var):
-        """
-        Implements the Kalman Filter recursions. Optimized for univariate case.
-        """
-        y = self.endog
-        nobs = self.nobs
-
-        R = self.R
-        T = self.T
-        Z = self.Z
-        H = self.H
-        Q = self.Q
-        if not init_state and not init_var:
-            alpha, P = _init_diffuse(T,R)
-        #NOTE: stopped here
-
-    def _univariatefilter_update(self):
-        pass
-        # does the KF but calls _update after each loop to update the matrices
-        # for time-varying coefficients
+    def _system_matrices(self, params):
+        return (self.Z(params), self.T(params), self.R(params),
+                self.H(params), self.Q(params))
 
     def kalmanfilter(self, params, init_state=None, init_var=None):
         """
         Runs the Kalman Filter
+
+        Returns the output of `statespace_filter` for the system matrices
+        given by `params`. Time varying matrices are returned by the system
+        matrix methods with time in the first axis.
         """
-        # determine if
-        if self.p == 1:
-            return _univariatefilter(init_state, init_var)
-        else:
-            raise ValueError("No multivariate filter written yet")
+        return statespace_filter(self.endog, *self._system_matrices(params),
+                                 init_state=init_state, init_cov=init_var)
+
+    def kalmansmooth(self, params, init_state=None, init_var=None):
+        """
+        Runs the Kalman Filter and the fixed interval smoother
+
+        Returns the output of `statespace_smoother`.
+        """
+        return statespace_smoother(self.endog, *self._system_matrices(params),
+                                   init_state=init_state, init_cov=init_var)
 
+    def loglike(self, params, init_state=None, init_var=None):
+        """
+        The loglikelihood of endog given by the Kalman Filter
+        """
+        return self.kalmanfilter(params, init_state, init_var)[0].sum()
 
     def _updateloglike(self, params, xi10, ntrain, penalty, upperbounds, lowerbounds,
             F,A,H,Q,R, history):
@@ -571,34 +697,34 @@ class KalmanFilter(object):
 
     @classmethod
     def geterrors(cls, y, k, k_ar, k_ma, k_lags, nobs, Z_mat, m, R_mat, T_mat,
-                  paramsdtype):
+                  paramsdtype, tol=0):
         """
         Returns just the errors of the Kalman Filter
 
         Note that if fast_kalman isn't available this returns the errors,
-        F, and loglikelihood for use in loglike.
+        F, loglikelihood, the steady state observation and the final state
+        and its variance for use in loglike. The variance recursions stop
+        once the largest change in P is at most `tol`.
         """
         if fast_kalman:
             if issubdtype(paramsdtype, float):
                 return kalman_loglike.kalman_filter_double(y, k, k_ar, k_ma,
-                                    k_lags, int(nobs), Z_mat, R_mat, T_mat)[0]
+                                k_lags, int(nobs), Z_mat, R_mat, T_mat, tol)[0]
             elif issubdtype(paramsdtype, complex):
                 return kalman_loglike.kalman_filter_complex(y, k, k_ar, k_ma,
-                                    k_lags, int(nobs), Z_mat, R_mat, T_mat)[0]
+                                k_lags, int(nobs), Z_mat, R_mat, T_mat, tol)[0]
             else:
                 raise TypeError("dtype %s is not supported "
                                 "Please file a bug report" % paramsdtype)
         else:
             # initial state and its variance
             alpha = zeros((m,1)) # if constant (I-T)**-1 * c
-            Q_0 = dot(inv(identity(m**2)-kron(T_mat,T_mat)),
-                                dot(R_mat,R_mat.T).ravel('F'))
+            Q_0 = solve_discrete_lyapunov(T_mat, dot(R_mat,R_mat.T))
             #TODO: above is only valid if Eigenvalues of T_mat are inside the
             # unit circle, if not then Q_0 = kappa * eye(m**2)
            # w/ kappa some large value say 1e7, but DK recommends not doing this
             # for a diffuse prior
             # Note that we enforce stationarity
-            Q_0 = Q_0.reshape(k_lags,k_lags,order='F')
             P = Q_0
             sigma2 = 0
             loglikelihood = 0
@@ -607,9 +733,10 @@ class KalmanFilter(object):
             #NOTE: can only do quick recursions if Z is time-invariant
             #so could have recursions for pure ARMA vs ARMAX
 #            for i in xrange(int(nobs)):
-            F_mat = 0
+            RR = dot(R_mat, R_mat.T)
             i = 0
-            while not F_mat == 1 and i < nobs:
+            steady_state = int(nobs)
+            while i < nobs:
                 # Predict
                 v_mat = y[i] - dot(Z_mat,alpha) # one-step forecast error
                 v[i] = v_mat
@@ -620,14 +747,22 @@ class KalmanFilter(object):
                 # update state
                 alpha = dot(T_mat, alpha) + dot(K,v_mat)
                 L = T_mat - dot(K,Z_mat)
-                P = dot(dot(T_mat, P), L.T) + dot(R_mat, R_mat.T)
+                P_new = dot(dot(T_mat, P), L.T) + RR
                 loglikelihood += log(F_mat)
                 i += 1
+                if abs(P_new - P).max() <= tol:
+                    steady_state = i
+                    P = P_new
+                    break
+                P = P_new
+            # steady state, F and K do not change anymore
+            F[i:] = F_mat
+            loglikelihood += (nobs - i) * log(F_mat)
             for i in xrange(i,int(nobs)):
                 v_mat = y[i] - dot(Z_mat, alpha)
                 v[i] = v_mat
                 alpha = dot(T_mat, alpha) + dot(K, v_mat)
-        return v, F, loglikelihood
+        return v, F, loglikelihood, steady_state, alpha, P
 
     @classmethod
     def _init_kalman_state(cls, params, arma_model):
@@ -685,27 +820,179 @@ class KalmanFilter(object):
         (y, k, nobs, k_ar, k_ma, k_lags, newparams, Z_mat, m, R_mat, T_mat,
                 paramsdtype) = cls._init_kalman_state(params, arma_model)
 
+        tol = getattr(arma_model, 'kalman_tol', 0)
         if fast_kalman:
             if issubdtype(paramsdtype, float):
-                loglike, sigma2 =  kalman_loglike.kalman_loglike_double(y, k,
-                                        k_ar, k_ma, k_lags, int(nobs), Z_mat,
-                                        R_mat, T_mat)
+                loglike, sigma2, steady_state = \
+                        kalman_loglike.kalman_loglike_double(y, k, k_ar, k_ma,
+                                    k_lags, int(nobs), Z_mat, R_mat, T_mat,
+                                    tol)
             elif issubdtype(paramsdtype, complex):
-                loglike, sigma2 =  kalman_loglike.kalman_loglike_complex(y, k,
-                                        k_ar, k_ma, k_lags, int(nobs), Z_mat,
-                                        R_mat, T_mat)
+                loglike, sigma2, steady_state = \
+                        kalman_loglike.kalman_loglike_complex(y, k, k_ar, k_ma,
+                                    k_lags, int(nobs), Z_mat, R_mat, T_mat,
+                                    tol)
             else:
                 raise TypeError("This dtype %s is not supported "
                                 " Please files a bug report." % paramsdtype)
         else:
-            v,F, loglikelihood = cls.geterrors(y, k, k_ar, k_ma, k_lags, nobs,
-                Z_mat, m, R_mat, T_mat, paramsdtype)
+            v, F, loglikelihood, steady_state = cls.geterrors(y, k, k_ar,
+                k_ma, k_lags, nobs, Z_mat, m, R_mat, T_mat, paramsdtype,
+                tol)[:4]
             sigma2 = 1./nobs * np.sum(v**2 / F)
             loglike = -.5 *(loglikelihood + nobs*log(sigma2))
             loglike -= nobs/2. * (log(2*pi) + 1)
         arma_model.sigma2 = sigma2
+        arma_model.kalman_steady_state = steady_state
         return loglike.item() # return a scalar not a 0d array
 
+    @classmethod
+    def score(cls, params, arma_model):
+        """
+        The gradient of the loglikelihood for an ARMA model.
+
+        Parameters
+        ----------
+        params : array
+            The coefficients of the ARMA model, assumed to be in the order of
+            trend variables and `k` exogenous coefficients, the `p` AR
+            coefficients, then the `q` MA coefficients.
+        arma_model : `statsmodels.tsa.arima.ARMA` instance
+            A reference to the ARMA model instance.
+
+        Notes
+        -----
+        The derivatives are computed with recursions that run alongside the
+        Kalman filter, so a single pass over the data is needed. Requires
+        the Cython version of the Kalman Filter and real valued parameters.
+        If the parameters are transformed, then the gradient is with respect
+        to the untransformed parameters.
+        """
+        (y, k, nobs, k_ar, k_ma, k_lags, newparams, Z_mat, m, R_mat, T_mat,
+                paramsdtype) = cls._init_kalman_state(params, arma_model)
+        if k > 0:
+            exog = np.asarray(arma_model.exog, dtype=float)
+        else:
+            exog = zeros((int(nobs), 0))
+        loglike, sigma2, score, steady_state = \
+                kalman_loglike.kalman_loglike_score_double(y, exog, k, k_ar,
+                                    k_ma, k_lags, int(nobs), Z_mat, R_mat,
+                                    T_mat, getattr(arma_model, 'kalman_tol', 0))
+        arma_model.sigma2 = sigma2
+        arma_model.kalman_steady_state = steady_state
+        if arma_model.transparams:
+            # chain rule, the Jacobian of the transformation is cheap
+            jac = approx_fprime_cs(params, arma_model._transparams,
+                                   epsilon=1e-20)
+            score = dot(score, jac)
+        return score
+
+    @classmethod
+    def filter_state(cls, params, arma_model):
+        """
+        Runs the Kalman filter and returns the errors and the final state
+
+        Parameters
+        ----------
+        params : array
+            The coefficients of the ARMA model, see `loglike`.
+        arma_model : `statsmodels.tsa.arima.ARMA` instance
+            A reference to the ARMA model instance.
+
+        Returns
+        -------
+        errors : array
+            The one-step forecast errors.
+        state : dict
+            The predicted state `alpha` and its variance `P` after the last
+            observation, `steady` which is True if the variance recursions
+            reached the steady state, the sum of the log forecast error
+            variances `logF`, the sum of the scaled squared forecast errors
+            `ssr`, `nobs` and `steady_state`, the observation at which the
+            steady state was reached. This can be passed to `update_state`.
+        """
+        (y, k, nobs, k_ar, k_ma, k_lags, newparams, Z_mat, m, R_mat, T_mat,
+                paramsdtype) = cls._init_kalman_state(params, arma_model)
+        tol = getattr(arma_model, 'kalman_tol', 0)
+        if fast_kalman:
+            v, F, loglikelihood, steady_state, alpha, P = \
+                    kalman_loglike.kalman_filter_double(y, k, k_ar, k_ma,
+                            k_lags, int(nobs), Z_mat, R_mat, T_mat, tol)
+        else:
+            v, F, loglikelihood, steady_state, alpha, P = cls.geterrors(y, k,
+                    k_ar, k_ma, k_lags, nobs, Z_mat, m, R_mat, T_mat,
+                    paramsdtype, tol)
+        v = v.squeeze()
+        state = dict(alpha=alpha, P=P, steady=steady_state < nobs,
+                     steady_state=steady_state,
+                     logF=float(np.sum(loglikelihood)),
+                     ssr=np.sum(v**2 / F.squeeze()), nobs=int(nobs))
+        return v, state
+
+    @classmethod
+    def update_state(cls, params, arma_model, y, state):
+        """
+        Continues the Kalman filter recursions for new observations
+
+        Parameters
+        ----------
+        params : array
+            The coefficients of the ARMA model, see `loglike`.
+        arma_model : `statsmodels.tsa.arima.ARMA` instance
+            The model, only the system matrices are taken from it.
+        y : array
+            The new observations, net of the exogenous variables.
+        state : dict
+            The state after the last observation as returned by
+            `filter_state` or `update_state`.
+
+        Returns
+        -------
+        errors : array
+            The one-step forecast errors of the new observations.
+        state : dict
+            The state after the last new observation.
+
+        Notes
+        -----
+        The work is proportional to the number of new observations. Once
+        the steady state is reached only the state is updated.
+        """
+        k = arma_model.k_exog + arma_model.k_trend
+        k_ar, k_ma, k_lags = arma_model.k_ar, arma_model.k_ma, arma_model.k_lags
+        if arma_model.transparams:
+            params = arma_model._transparams(params)
+        Z_mat = cls.Z(k_lags)
+        R_mat = cls.R(params, k_lags, k, k_ma, k_ar)
+        T_mat = cls.T(params, k_lags, k, k_ar)
+        tol = getattr(arma_model, 'kalman_tol', 0)
+        RR = dot(R_mat, R_mat.T)
+        alpha, P = state['alpha'], state['P']
+        steady, steady_state = state['steady'], state['steady_state']
+        logF, ssr, n = state['logF'], state['ssr'], state['nobs']
+        v = np.empty(len(y))
+        for i in range(len(y)):
+            v_mat = y[i] - dot(Z_mat, alpha)
+            F_mat = dot(dot(Z_mat, P), Z_mat.T)
+            K = dot(dot(T_mat, P), Z_mat.T) / F_mat
+            alpha = dot(T_mat, alpha) + dot(K, v_mat)
+            if not steady:
+                L = T_mat - dot(K, Z_mat)
+                P_new = dot(dot(T_mat, P), L.T) + RR
+                if abs(P_new - P).max() <= tol:
+                    steady = True
+                    steady_state = n + i + 1
+                P = P_new
+            v[i] = v_mat
+            logF += log(F_mat).item()
+            ssr += (v_mat**2 / F_mat).item()
+        if not steady:
+            steady_state = n + len(y)
+        state = dict(alpha=alpha, P=P, steady=steady,
+                     steady_state=steady_state, logF=logF, ssr=ssr,
+                     nobs=n + len(y))
+        return v, state
+
 
 if __name__ == "__main__":
     import numpy as np
@@ -21,10 +21,14 @@ def configuration(parent_package='', top_path=None):
     # it fails, we build the checked-in .c files.
     if has_c_compiler():
         cython(['kalman_loglike.pyx'], working_path=cur_dir)
+        cython(['_statespace.pyx'], working_path=cur_dir)
 
         config.add_extension('kalman_loglike',
                          sources=['kalman_loglike.c'],
                          include_dirs=[get_numpy_include_dirs()])
+        config.add_extension('_statespace',
+                         sources=['_statespace.c'],
+                         include_dirs=[get_numpy_include_dirs()])
 
     return config
 
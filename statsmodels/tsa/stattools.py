@@ -17,6 +17,62 @@ class ResultsStore(object):
     def __str__(self):
         return self._str
 
+def _nested_ols(endog, exog, k_exog):
+    """
+    Least squares of endog on the first k columns of exog for several k
+
+    Parameters
+    ----------
+    endog : ndarray
+        nobs or nobs x neqs dependent variables.
+    exog : ndarray
+        nobs x K regressors, ordered such that the regressors of the smaller
+        models come first.
+    k_exog : array-like
+        The numbers of leading columns of exog in each regression.
+
+    Returns
+    -------
+    ssr : ndarray
+        The sum of squared residuals for each k in k_exog. If endog is 2d,
+        then this is the cross product of the residuals with shape
+        len(k_exog) x neqs x neqs.
+    tvalues : ndarray
+        The t-value of the coefficient on the last of the k columns, for 1d
+        endog only, None otherwise.
+
+    Notes
+    -----
+    Uses a single QR decomposition X = QR of the largest design matrix. The
+    fit with the first k columns only depends on the first k columns of Q
+    and on R[:k,:k]. With c = Q'y the sum of squared residuals is
+    ssr_K + sum(c[k:]**2), which is a sum of positive terms and does not
+    lose precision. The t-value of the last coefficient is c[k-1] divided
+    by the residual standard deviation, up to the sign of R[k-1,k-1].
+    """
+    k_exog = np.asarray(k_exog, dtype=int)
+    nobs, k_max = exog.shape
+    q, r = np.linalg.qr(exog)
+    qy = np.dot(q.T, endog)
+    resid = endog - np.dot(q, qy)
+    if endog.ndim == 1:
+        terms = qy**2
+        ssr_full = np.dot(resid, resid)
+    else:
+        terms = qy[:,:,None] * qy[:,None,:]
+        ssr_full = np.dot(resid.T, resid)
+    # cumulative sums of the terms from the end, tail[k] = sum(terms[k:])
+    tail = np.cumsum(terms[::-1], axis=0)[::-1]
+    tail = np.concatenate((tail, np.zeros_like(tail[:1])))
+    ssr = ssr_full + tail[k_exog]
+    if endog.ndim > 1:
+        return ssr, None
+    last = np.maximum(k_exog - 1, 0)
+    tvalues = (np.sign(np.diag(r)[last]) * qy[last] /
+               np.sqrt(ssr / (nobs - k_exog)))
+    tvalues[k_exog == 0] = np.nan
+    return ssr, tvalues
+
 def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
         fitargs=(), regresults=False):
     """
@@ -58,8 +114,30 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
 #TODO: This could be changed to laggedRHS and exog keyword arguments if this
 #    will be more general.
 
-    results = {}
     method = method.lower()
+    if (mod is OLS and not modargs and not fitargs and not regresults and
+            method in ["aic", "bic", "t-stat"]):
+        # all nested regressions from one QR, same criteria as OLSResults,
+        # if no lag is significant for t-stat, then startlag is used
+        lags = np.arange(startlag, startlag+maxlag+1)
+        nobs = exog.shape[0]
+        ssr, tvalues = _nested_ols(endog, exog[:,:lags[-1]], lags)
+        llf = -nobs/2. * (np.log(2*np.pi*ssr/nobs) + 1)
+        if method == "aic":
+            ics = -2*llf + 2*lags
+        elif method == "bic":
+            ics = -2*llf + np.log(nobs)*lags
+        if method in ["aic", "bic"]:
+            best = ics.argmin()
+            return ics[best], lags[best]
+        stop = 1.6448536269514722
+        for lag in range(startlag + maxlag, startlag - 1, -1):
+            icbest = np.abs(tvalues[lag - startlag])
+            if icbest >= stop:
+                break
+        return icbest, lag
+
+    results = {}
     for lag in range(startlag, startlag+maxlag+1):
         mod_instance = mod(endog, exog[:,:lag], *modargs)
         results[lag] = mod_instance.fit()
@@ -72,11 +150,11 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
         lags = sorted(results.keys())[::-1]
 #        stop = stats.norm.ppf(.95)
         stop = 1.6448536269514722
+        # if no lag is significant, then the smallest model is used
         for lag in range(startlag + maxlag, startlag - 1, -1):
             icbest = np.abs(results[lag].tvalues[-1])
+            bestlag = lag
             if np.abs(icbest) >= stop:
-                bestlag = lag
-                icbest = icbest
                 break
     else:
         raise ValueError("Information Criterion %s not understood.") % method
@@ -198,10 +276,11 @@ def adfuller(x, maxlag=None, regression="c", autolag='AIC',
         maxlag = int(np.ceil(12. * np.power(nobs/100., 1/4.)))
 
     xdiff = np.diff(x)
-    xdall = lagmat(xdiff[:,None], maxlag, trim='both', original='in')
-    nobs = xdall.shape[0]
+    xdlags = lagmat(xdiff, maxlag, trim='both', view=True)
+    nobs = xdlags.shape[0]
 
-    xdall[:,0] = x[-nobs-1:-1] # replace 0 xdiff with level of x
+    # level of x in place of the 0 lag of xdiff, the only copy of the lags
+    xdall = np.column_stack((x[-nobs-1:-1], xdlags))
     xdshort = xdiff[-nobs:]
 
     if store:
@@ -227,9 +306,9 @@ def adfuller(x, maxlag=None, regression="c", autolag='AIC',
         bestlag -= startlag  #convert to lag not column index
 
         #rerun ols with best autolag
-        xdall = lagmat(xdiff[:,None], bestlag, trim='both', original='in')
-        nobs = xdall.shape[0]
-        xdall[:,0] = x[-nobs-1:-1] # replace 0 xdiff with level of x
+        xdlags = lagmat(xdiff, bestlag, trim='both', view=True)
+        nobs = xdlags.shape[0]
+        xdall = np.column_stack((x[-nobs-1:-1], xdlags))
         xdshort = xdiff[-nobs:]
         usedlag = bestlag
     else:
@@ -269,46 +348,58 @@ def adfuller(x, maxlag=None, regression="c", autolag='AIC',
         else:
             return adfstat, pvalue, usedlag, nobs, critvalues, icbest
 
+def _acovf_fft(xo, d):
+    # autocovariances along axis 0 from the zero padded real fft
+    nobs = xo.shape[0]
+    # a power of two of at least 2*nobs - 1 avoids circular overlap
+    nfft = 2 ** int(np.ceil(np.log2(2 * nobs - 1)))
+    Frf = np.fft.rfft(xo, n=nfft, axis=0)
+    acov = np.fft.irfft(Frf.real**2 + Frf.imag**2, n=nfft, axis=0)[:nobs]
+    return acov / d
+
 def acovf(x, unbiased=False, demean=True, fft=False):
     '''
-    Autocovariance for 1D
+    Autocovariance for 1D, or for each column of 2D
 
     Parameters
     ----------
     x : array
-        time series data
+        time series data, 1d or 2d with observations in rows and series in
+        columns
     unbiased : bool
         if True, then denominators is n-k, otherwise n
     demean : bool
         if True, then subtract the mean x from each element of x
     fft : bool
         If True, use FFT convolution.  This method should be preferred
-        for long time series.
+        for long time series and for many series.
 
     Returns
     -------
     acovf : array
-        autocovariance function
+        autocovariance function, same number of dimensions as x
     '''
+    x = np.asarray(x)
+    if x.ndim > 2:
+        raise ValueError("x needs to be 1d or 2d")
     n = len(x)
     if demean:
-        xo = x - x.mean();
+        xo = x - x.mean(0)
     else:
         xo = x
     if unbiased:
-#        xi = np.ones(n);
-#        d = np.correlate(xi, xi, 'full')
-        xi = np.arange(1,n+1)
-        d = np.hstack((xi,xi[:-1][::-1])) # faster, is correlate more general?
+        d = n - np.arange(n)
+        if x.ndim == 2:
+            d = d[:, None]
     else:
         d = n
     if fft:
-        nobs = len(xo)
-        Frf = np.fft.fft(xo, n=nobs*2)
-        acov = np.fft.ifft(Frf*np.conjugate(Frf))[:nobs]/d
-        return acov.real
+        return _acovf_fft(xo, d)
+    elif xo.ndim == 1:
+        return np.correlate(xo, xo, 'full')[n-1:] / d
     else:
-        return (np.correlate(xo, xo, 'full')/d)[n-1:]
+        return np.column_stack([np.correlate(xi, xi, 'full')[n-1:]
+                                for xi in xo.T]) / d
 
 def q_stat(x,nobs, type="ljungbox"):
     """
@@ -316,6 +407,7 @@ def q_stat(x,nobs, type="ljungbox"):
 
     x : array-like
         Array of autocorrelation coefficients.  Can be obtained from acf.
+        If 2d, then each column contains the autocorrelations of one series.
     nobs : int
         Number of observations in the entire sample (ie., not just the length
         of the autocorrelation function results.
@@ -332,24 +424,32 @@ def q_stat(x,nobs, type="ljungbox"):
     Written to be used with acf.
     """
     x = np.asarray(x)
+    lags = np.arange(1, len(x)+1)
+    if x.ndim == 2:
+        lags = lags[:, None]
     if type=="ljungbox":
-        ret = nobs*(nobs+2)*np.cumsum((1./(nobs-np.arange(1,
-            len(x)+1)))*x**2)
-    chi2 = stats.chi2.sf(ret,np.arange(1,len(x)+1))
+        ret = nobs*(nobs+2)*np.cumsum((1./(nobs-lags))*x**2, axis=0)
+    chi2 = stats.chi2.sf(ret, lags)
     return ret,chi2
 
+def _confint(x, interval):
+    # stack lower and upper bounds in a new last axis
+    return np.concatenate(((x - interval)[..., None],
+                           (x + interval)[..., None]), axis=-1)
+
 #NOTE: Changed unbiased to False
 #see for example
 # http://www.itl.nist.gov/div898/handbook/eda/section3/autocopl.htm
 def acf(x, unbiased=False, nlags=40, confint=None, qstat=False, fft=False,
         alpha=None):
     '''
-    Autocorrelation function for 1d arrays.
+    Autocorrelation function for 1d arrays, or for each column of 2d arrays.
 
     Parameters
     ----------
     x : array
-       Time series data
+       Time series data, 1d or 2d with observations in rows and series in
+       columns
     unbiased : bool
        If True, then denominators for autocovariance are n-k, otherwise n
     nlags: int, optional
@@ -374,9 +474,10 @@ def acf(x, unbiased=False, nlags=40, confint=None, qstat=False, fft=False,
     Returns
     -------
     acf : array
-        autocorrelation function
+        autocorrelation function, nlags+1 rows
     confint : array, optional
         Confidence intervals for the ACF. Returned if confint is not None.
+        The last axis holds the lower and upper bound.
     qstat : array, optional
         The Ljung-Box Q-Statistic.  Returned if q_stat is True.
     pvalues : array, optional
@@ -388,56 +489,38 @@ def acf(x, unbiased=False, nlags=40, confint=None, qstat=False, fft=False,
     The acf at lag 0 (ie., 1) is returned.
 
     This is based np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
+    series it is recommended to use fft convolution instead. For 2d x, fft
+    computes all columns at once while np.correlate loops over the columns.
 
     If unbiased is true, the denominator for the autocovariance is adjusted
     but the autocorrelation is not an unbiased estimtor.
     '''
+    x = np.asarray(x)
     nobs = len(x)
-    d = nobs # changes if unbiased
-    if not fft:
-        avf = acovf(x, unbiased=unbiased, demean=True)
-        #acf = np.take(avf/avf[0], range(1,nlags+1))
-        acf = avf[:nlags+1]/avf[0]
-    else:
-        #JP: move to acovf
-        x0 = x - x.mean()
-        Frf = np.fft.fft(x0, n=nobs*2) # zero-pad for separability
-        if unbiased:
-            d = nobs - np.arange(nobs)
-        acf = np.fft.ifft(Frf * np.conjugate(Frf))[:nobs]/d
-        acf /= acf[0]
-        #acf = np.take(np.real(acf), range(1,nlags+1))
-        acf = np.real(acf[:nlags+1])   #keep lag 0
+    avf = acovf(x, unbiased=unbiased, demean=True, fft=fft)
+    acf = avf[:nlags+1]/avf[0]
     if not (confint or qstat or alpha):
         return acf
     if not confint is None:
         import warnings
         warnings.warn("confint is deprecated. Please use the alpha keyword",
                       FutureWarning)
-        varacf = np.ones(nlags+1)/nobs
-        varacf[0] = 0
-        varacf[1] = 1./nobs
-        varacf[2:] *= 1 + 2*np.cumsum(acf[1:-1]**2)
-        interval = stats.norm.ppf(1-(100-confint)/200.)*np.sqrt(varacf)
-        confint = np.array(zip(acf-interval, acf+interval))
-        if not qstat:
-            return acf, confint
+        if alpha is None:
+            alpha = (100 - confint) / 100.
     if alpha is not None:
-        varacf = np.ones(nlags+1)/nobs
+        varacf = np.ones(acf.shape)/nobs
         varacf[0] = 0
         varacf[1] = 1./nobs
-        varacf[2:] *= 1 + 2*np.cumsum(acf[1:-1]**2)
+        varacf[2:] *= 1 + 2*np.cumsum(acf[1:-1]**2, axis=0)
         interval = stats.norm.ppf(1-alpha/2.)*np.sqrt(varacf)
-        confint = np.array(zip(acf-interval, acf+interval))
+        confint = _confint(acf, interval)
         if not qstat:
             return acf, confint
-    if qstat:
-        qstat, pvalue = q_stat(acf[1:], nobs=nobs)  #drop lag 0
-        if (confint is not None or alpha is not None):
-            return acf, confint, qstat, pvalue
-        else:
-            return acf, qstat, pvalue
+    qstat, pvalue = q_stat(acf[1:], nobs=nobs)  #drop lag 0
+    if alpha is not None:
+        return acf, confint, qstat, pvalue
+    else:
+        return acf, qstat, pvalue
 
 def pacf_yw(x, nlags=40, method='unbiased'):
     '''Partial autocorrelation estimated with non-recursive yule_walker
@@ -502,13 +585,32 @@ def pacf_ols(x, nlags=40):
         pacf.append(res.params[-1])
     return np.array(pacf)
 
+def _pacf_levinson(acov, nlags):
+    # Levinson-Durbin recursion for each column of acov, only the current AR
+    # coefficients are kept, nlags x nseries
+    nseries = acov.shape[1]
+    pacf_ = np.ones((nlags + 1, nseries))
+    phi = np.zeros((nlags + 1, nseries))
+    if nlags == 0:
+        return pacf_
+    phi[1] = acov[1] / acov[0]
+    sig = acov[0] - phi[1] * acov[1]
+    pacf_[1] = phi[1]
+    for k in xrange(2, nlags + 1):
+        phikk = (acov[k] - (phi[1:k] * acov[k-1:0:-1]).sum(0)) / sig
+        phi[1:k] = phi[1:k] - phikk * phi[k-1:0:-1]
+        phi[k] = pacf_[k] = phikk
+        sig = sig * (1 - phikk**2)
+    return pacf_
+
 def pacf(x, nlags=40, method='ywunbiased', alpha=None):
     '''Partial autocorrelation estimated
 
     Parameters
     ----------
-    x : 1d array
-        observations of time series for which pacf is calculated
+    x : 1d or 2d array
+        observations of time series for which pacf is calculated. If 2d,
+        then the pacf is calculated for each column.
     nlags : int
         largest lag for which pacf is returned
     method : 'ywunbiased' (default) or 'ywmle' or 'ols'
@@ -529,18 +631,37 @@ def pacf(x, nlags=40, method='ywunbiased', alpha=None):
 
     Returns
     -------
-    pacf : 1d array
+    pacf : array
         partial autocorrelations, nlags elements, including lag zero
     confint : array, optional
         Confidence intervals for the PACF. Returned if confint is not None.
+        The last axis holds the lower and upper bound.
 
     Notes
     -----
     This solves yule_walker equations or ols for each desired lag
     and contains currently duplicate calculations.
-    '''
 
-    if method == 'ols':
+    For 2d x, the Yule-Walker and Levinson-Durbin methods use the fft
+    autocovariances of all columns and one Levinson-Durbin recursion that
+    is vectorized over the columns. The Levinson-Durbin recursion solves the
+    same Yule-Walker equations. The ols method loops over the columns.
+    '''
+    x = np.asarray(x)
+    if x.ndim == 2:
+        if method == 'ols':
+            ret = np.column_stack([pacf_ols(xi, nlags=nlags) for xi in x.T])
+        elif method in ['yw', 'ywu', 'ywunbiased', 'yw_unbiased',
+                        'ld', 'ldu', 'ldunbiase', 'ld_unbiased']:
+            acv = acovf(x, unbiased=True, fft=True)
+            ret = _pacf_levinson(acv, nlags)
+        elif method in ['ywm', 'ywmle', 'yw_mle',
+                        'ldb', 'ldbiased', 'ld_biased']:
+            acv = acovf(x, unbiased=False, fft=True)
+            ret = _pacf_levinson(acv, nlags)
+        else:
+            raise ValueError('method not available')
+    elif method == 'ols':
         ret = pacf_ols(x, nlags=nlags)
     elif method in ['yw', 'ywu', 'ywunbiased', 'yw_unbiased']:
         ret = pacf_yw(x, nlags=nlags, method='unbiased')
@@ -560,7 +681,7 @@ def pacf(x, nlags=40, method='ywunbiased', alpha=None):
     if alpha is not None:
         varacf = 1./len(x)
         interval = stats.norm.ppf(1. - alpha/2.) * np.sqrt(varacf)
-        confint = np.array(zip(ret-interval, ret+interval))
+        confint = _confint(ret, interval)
         return ret, confint
     else:
         return ret
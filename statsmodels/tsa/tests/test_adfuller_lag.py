@@ -47,3 +47,27 @@ def test_adf_autolag():
     adf3 = tsast.adfuller(x, maxlag=0, autolag='aic',
                           regression=tr, store=True, regresults=True)
     assert_equal(len(adf3[-1].autolag_results), 0 + 1)
+
+
+def test_adf_autolag_nested():
+    #one QR for all lags gives the same as one OLS per lag
+    x = np.log(macrodata.load().data['realgdp'])
+    for tr in ['nc', 'c', 'ct']:
+        for autolag in ['aic', 'bic', 't-stat']:
+            adf_fast = tsast.adfuller(x, maxlag=8, autolag=autolag,
+                                      regression=tr, store=True)
+            adf_ols = tsast.adfuller(x, maxlag=8, autolag=autolag,
+                                     regression=tr, store=True,
+                                     regresults=True)
+            assert_equal(adf_fast[-1].usedlag, adf_ols[-1].usedlag)
+            assert_almost_equal(adf_fast[-1].icbest, adf_ols[-1].icbest, 8)
+            assert_almost_equal(adf_fast[0], adf_ols[0], 12)
+
+    # ssr and t-values against OLS
+    exog = np.column_stack((np.ones(len(x) - 1), x[:-1], x[1:]**2))
+    endog = np.diff(x)
+    ssr, tvalues = tsast._nested_ols(endog, exog, [1, 2, 3])
+    for i, k in enumerate([1, 2, 3]):
+        res = tsast.OLS(endog, exog[:,:k]).fit()
+        assert_almost_equal(ssr[i], res.ssr, 12)
+        assert_almost_equal(tvalues[i], res.tvalues[-1], 8)
@@ -219,6 +219,12 @@ class TestAutolagAR(object):
     def test_ic(self):
         npt.assert_almost_equal(self.res1, self.res2, DECIMAL_6)
 
+    def test_select_order(self):
+        endog = sm.datasets.sunspots.load().endog
+        for i, ic in enumerate(['aic', 'hqic', 'bic']):
+            bestlag = AR(endog).select_order(16, ic, method='cmle')
+            assert_equal(bestlag, self.res1[i].argmin() + 1)
+
 def test_ar_dates():
     # just make sure they work
     data = sm.datasets.sunspots.load()
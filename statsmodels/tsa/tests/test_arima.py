@@ -4,7 +4,8 @@ from numpy.testing import (assert_almost_equal, assert_equal, assert_,
 import statsmodels.sandbox.tsa.fftarma as fa
 from statsmodels.tsa.descriptivestats import TsaDescriptive
 from statsmodels.tsa.arma_mle import Arma
-from statsmodels.tsa.arima_model import ARMA, ARIMA
+from statsmodels.tsa.arima_model import (ARMA, ARIMA, ARIMAResults,
+                                         _arma_predict_out_of_sample)
 from statsmodels.tsa.base.datetools import dates_from_range
 from results import results_arma, results_arima
 import os
@@ -1596,6 +1597,123 @@ def test_arima_predict_q2():
                         [7.306320, 7.313825, 7.321749, 7.329827, 7.337962],
                         5)
 
+@dec.skipif(not fast_kalman)
+def test_arma_analytic_score():
+    from statsmodels.tools.numdiff import approx_fprime_cs, approx_hess_cs
+    from statsmodels.datasets import macrodata
+    dta = macrodata.load().data
+    endog = np.diff(np.log(dta['realinv']))
+    exog = np.diff(np.log(dta['realgdp']))
+    mod = ARMA(endog, (2,2), exog)
+    res = mod.fit(method='mle', disp=-1)
+    params = res.params + .01
+    assert_almost_equal(mod.score(params),
+                        approx_fprime_cs(params, mod.loglike), 6)
+    hess = approx_hess_cs(params, mod.loglike)
+    assert_almost_equal(mod.hessian(params) / hess, np.ones_like(hess), 5)
+    # gradient with respect to the transformed parameters used in fit
+    mod.transparams = True
+    params = mod._invtransparams(params)
+    assert_almost_equal(mod.score(params),
+                        approx_fprime_cs(params, mod.loglike), 6)
+    mod.transparams = False
+
+def test_arma_fit_batch():
+    from statsmodels.tsa.arima_model import arma_fit_batch
+    from statsmodels.datasets import macrodata
+    dta = macrodata.load_pandas().data
+    endog = np.log(dta[['realinv', 'realcons', 'realgdp']]).diff()[1:]
+    endog = endog.reset_index(drop=True)
+    endog.ix[:9, 'realcons'] = np.nan # shorter series
+    endog['bad'] = np.nan # no observations, fit fails
+    res = arma_fit_batch(endog, (1,1), method='css')
+    assert_equal(res.names, list(endog.columns))
+    assert_equal(res.failed, [False, False, False, True])
+    assert_(res.errors[3] is not None)
+    assert_(np.isnan(res.params[3]).all())
+    for i, name in enumerate(endog.columns[:3]):
+        y = endog[name].dropna().values
+        res_i = ARMA(y, (1,1)).fit(method='css', disp=-1)
+        assert_almost_equal(res.params[i], res_i.params, 6)
+        assert_almost_equal(res.llf[i], res_i.llf, 6)
+        assert_almost_equal(res.aic[i], res_i.aic, 6)
+        assert_equal(res.nobs[i], res_i.nobs)
+    res_1 = res.get_result(1)
+    assert_equal(res_1.params, res.params[1])
+    y = endog['realcons'].dropna().values
+    res_i = ARMA(y, (1,1)).fit(method='css', disp=-1)
+    assert_almost_equal(res_1.llf, res_i.llf, 6)
+    assert_almost_equal(res_1.sigma2, res_i.sigma2, 6)
+    assert_almost_equal(res_1.bse, res_i.bse, 4)
+    assert_equal(res_1.nobs, res_i.nobs)
+    res_2 = arma_fit_batch(endog, (1,1,1), trend='nc').get_result(0)
+    res_i = ARIMA(endog['realinv'].values, (1,1,1)).fit(trend='nc', disp=-1)
+    assert_almost_equal(res_2.params, res_i.params, 4)
+    assert_almost_equal(res_2.llf, res_i.llf, 4)
+    assert_equal(res_2.k_diff, 1)
+    assert_raises(ValueError, res.get_result, 3)
+
+    try:
+        import joblib
+    except ImportError:
+        return
+    res2 = arma_fit_batch(endog.values, (1,1), n_jobs=2, method='css')
+    assert_equal(res2.failed, res.failed)
+    assert_almost_equal(res2.params[:3], res.params[:3], 6)
+
+def test_arma_kalman_steady_state():
+    endog = y_arma[:,4]
+    res = ARMA(endog, (1,1)).fit(method='mle', disp=-1)
+    res_tol = ARMA(endog, (1,1)).fit(method='mle', disp=-1, kalman_tol=1e-8)
+    assert_(res_tol.kalman_steady_state < res.nobs / 2)
+    assert_(res_tol.kalman_steady_state <= res.kalman_steady_state)
+    assert_almost_equal(res_tol.llf, res.llf, 4)
+    assert_almost_equal(res_tol.params, res.params, 4)
+    assert_almost_equal(res_tol.sigma2, res.sigma2, 4)
+    res_css = ARMA(endog, (1,1)).fit(method='css', disp=-1)
+    assert_(res_css.kalman_steady_state is None)
+
+
+def _check_append(res, res_app, mod_full):
+    params = res.params
+    llf = mod_full.loglike(params)
+    assert_almost_equal(res_app.llf, llf, 6)
+    assert_almost_equal(res_app.sigma2, mod_full.sigma2, 8)
+    assert_almost_equal(res_app.resid, mod_full.geterrors(params), 8)
+    assert_equal(res_app.nobs, mod_full.nobs)
+    assert_almost_equal(res_app.params, params, 12)
+
+def test_arma_append():
+    endog = y_arma[:,4]
+    for method in ['mle', 'css']:
+        res = ARMA(endog[:200], (1,1)).fit(method=method, disp=-1)
+        res_full = ARMA(endog, (1,1)).fit(method=method, disp=-1)
+        res_app = res.append(endog[200:])
+        _check_append(res, res_app, res_full.model)
+        assert_almost_equal(res_app.forecast(5)[0],
+            _arma_predict_out_of_sample(res.params, 5,
+                res_full.model.geterrors(res.params), 1, 1, 1, 0, endog,
+                method=method), 8)
+        # in pieces
+        res_app2 = res.append(endog[200:230]).append(endog[230:])
+        assert_almost_equal(res_app2.llf, res_app.llf, 8)
+        assert_almost_equal(res_app2.resid, res_app.resid, 8)
+        # warm started refit
+        res_refit = res.append(endog[200:], refit=True, disp=-1)
+        assert_almost_equal(res_refit.params, res_full.params, 4)
+
+def test_arima_append():
+    from statsmodels.datasets.macrodata import load
+    cpi = load().data['cpi']
+    res = ARIMA(cpi[:150], (1,1,1)).fit(disp=-1)
+    res_full = ARIMA(cpi, (1,1,1)).fit(disp=-1)
+    res_app = res.append(cpi[150:])
+    _check_append(res, res_app, res_full.model)
+    assert_(isinstance(res_app._results, ARIMAResults))
+    assert_equal(res_app.k_diff, 1)
+    assert_raises(ValueError, res.append, cpi[150:], np.ones(10))
+
+
 
 if __name__ == "__main__":
     import nose
@@ -0,0 +1,171 @@
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_raises, dec
+from scipy import linalg
+from statsmodels.tsa.kalmanf.kalmanfilter import (statespace_filter,
+                                                  statespace_smoother,
+                                                  fast_statespace,
+                                                  StateSpaceModel)
+
+
+def _naive_filter(y, Z, T, R, H, Q, a, P):
+    # textbook recursions, time invariant, drops missing elements of y[t]
+    llf = 0
+    a_filt, P_filt, a_pred, P_pred = [], [], [], []
+    for t in range(len(y)):
+        a_pred.append(a)
+        P_pred.append(P)
+        obs = ~np.isnan(y[t])
+        if obs.any():
+            Zo = Z[obs]
+            v = y[t, obs] - np.dot(Zo, a)
+            F = np.dot(np.dot(Zo, P), Zo.T) + H[obs][:, obs]
+            Finv = linalg.inv(F)
+            K = np.dot(np.dot(P, Zo.T), Finv)
+            llf += -.5 * (obs.sum() * np.log(2 * np.pi) +
+                          np.log(linalg.det(F)) + np.dot(v, np.dot(Finv, v)))
+            a = a + np.dot(K, v)
+            P = P - np.dot(np.dot(K, Zo), P)
+        a_filt.append(a)
+        P_filt.append(P)
+        a = np.dot(T, a)
+        P = np.dot(np.dot(T, P), T.T) + np.dot(np.dot(R, Q), R.T)
+    return (llf, np.array(a_filt), np.array(P_filt), np.array(a_pred),
+            np.array(P_pred))
+
+
+def _naive_rts(T, a_filt, P_filt, a_pred, P_pred):
+    nobs = len(a_filt)
+    a_smooth = a_filt.copy()
+    P_smooth = P_filt.copy()
+    for t in range(nobs - 2, -1, -1):
+        J = np.dot(np.dot(P_filt[t], T.T), linalg.inv(P_pred[t + 1]))
+        a_smooth[t] = a_filt[t] + np.dot(J, a_smooth[t + 1] - a_pred[t + 1])
+        P_smooth[t] = P_filt[t] + np.dot(np.dot(J, P_smooth[t + 1] -
+                                                P_pred[t + 1]), J.T)
+    return a_smooth, P_smooth
+
+
+class TestLocalLinearTrend(object):
+    @classmethod
+    def setupClass(cls):
+        # two noisy measurements of a local linear trend, with gaps
+        np.random.seed(12345)
+        nobs = 80
+        level = np.cumsum(np.cumsum(.1 * np.random.randn(nobs)) +
+                          np.random.randn(nobs))
+        y = level[:, None] + np.random.randn(nobs, 2) * [1., 2.]
+        y[10, 0] = np.nan
+        y[20:23] = np.nan
+        cls.y = y
+        cls.Z = np.array([[1., 0], [1, 0]])
+        cls.T = np.array([[1., 1], [0, 1]])
+        cls.R = np.eye(2)
+        cls.H = np.array([[1., .3], [.3, 4]])
+        cls.Q = np.diag([1., .01])
+        cls.a0 = np.zeros(2)
+        cls.P0 = 1e4 * np.eye(2)
+
+    @dec.skipif(not fast_statespace)
+    def test_filter(self):
+        res = statespace_filter(self.y, self.Z, self.T, self.R, self.H,
+                                self.Q, self.a0, self.P0)
+        llf, a_filt, P_filt, a_pred, P_pred = _naive_filter(self.y, self.Z,
+                                self.T, self.R, self.H, self.Q, self.a0,
+                                self.P0)
+        assert_almost_equal(res[0].sum(), llf, 8)
+        assert_almost_equal(res[0][20:23], 0)
+        assert_almost_equal(res[3][:-1], a_pred, 8)
+        assert_almost_equal(res[4][:-1], P_pred, 6)
+        assert_almost_equal(res[5], a_filt, 8)
+        assert_almost_equal(res[6], P_filt, 6)
+        assert np.isnan(res[1][10, 0]) and not np.isnan(res[1][10, 1])
+
+    @dec.skipif(not fast_statespace)
+    def test_smoother(self):
+        a_smooth, P_smooth, llf = statespace_smoother(self.y, self.Z, self.T,
+                                        self.R, self.H, self.Q, self.a0,
+                                        self.P0)
+        naive = _naive_filter(self.y, self.Z, self.T, self.R, self.H, self.Q,
+                              self.a0, self.P0)
+        a_rts, P_rts = _naive_rts(self.T, *naive[1:])
+        assert_almost_equal(llf, naive[0], 8)
+        assert_almost_equal(a_smooth, a_rts, 6)
+        assert_almost_equal(P_smooth, P_rts, 6)
+
+    @dec.skipif(not fast_statespace)
+    def test_time_varying(self):
+        nobs = len(self.y)
+        tile = lambda x: np.tile(x, (nobs, 1, 1))
+        res = statespace_filter(self.y, self.Z, self.T, self.R, self.H,
+                                self.Q, self.a0, self.P0)
+        res_tv = statespace_filter(self.y, tile(self.Z), tile(self.T),
+                                   tile(self.R), tile(self.H), tile(self.Q),
+                                   self.a0, self.P0)
+        for x, x_tv in zip(res, res_tv):
+            assert_almost_equal(x, x_tv, 12)
+        # a break in the measurement loadings changes only later entries
+        Z_tv = tile(self.Z)
+        Z_tv[40:] *= 2
+        res_tv = statespace_filter(self.y, Z_tv, self.T, self.R, self.H,
+                                   self.Q, self.a0, self.P0)
+        assert_almost_equal(res_tv[0][:40], res[0][:40], 12)
+        assert_raises(ValueError, statespace_filter, self.y, Z_tv[:10],
+                      self.T, self.R, self.H, self.Q)
+
+
+@dec.skipif(not fast_statespace)
+def test_ar1_exact_loglike():
+    # the default initial covariance is the stationary one
+    np.random.seed(54321)
+    nobs, phi, sigma2 = 50, .6, 2.
+    y = np.random.randn(nobs)
+    llf_obs = statespace_filter(y, [[1.]], [[phi]], [[1.]], [[0.]],
+                                [[sigma2]])[0]
+    cov = sigma2 / (1 - phi**2) * phi**np.abs(np.subtract.outer(
+                                        np.arange(nobs), np.arange(nobs)))
+    llf = -.5 * (nobs * np.log(2 * np.pi) + np.linalg.slogdet(cov)[1] +
+                 np.dot(y, linalg.solve(cov, y)))
+    assert_almost_equal(llf_obs.sum(), llf, 8)
+
+
+class _LocalLevel(StateSpaceModel):
+    # params are the variances of the measurement and level disturbances
+    def Z(self, params):
+        return np.ones((1, 1))
+
+    def T(self, params):
+        return np.ones((1, 1))
+
+    def R(self, params):
+        return np.ones((1, 1))
+
+    def H(self, params):
+        return np.array([[params[0]]])
+
+    def Q(self, params):
+        return np.array([[params[1]]])
+
+
+@dec.skipif(not fast_statespace)
+def test_statespace_model():
+    np.random.seed(98765)
+    nobs = 60
+    y = np.cumsum(.5 * np.random.randn(nobs)) + np.random.randn(nobs)
+    y[15] = np.nan
+    mod = _LocalLevel(y)
+    params = np.array([1.2, .3])
+    a0, P0 = np.zeros(1), 1e4 * np.ones((1, 1))
+    ones = np.ones((1, 1))
+    naive = _naive_filter(y[:, None], ones, ones, ones, params[0] * ones,
+                          params[1] * ones, a0, P0)
+    a_rts, P_rts = _naive_rts(ones, *naive[1:])
+
+    res = mod.kalmanfilter(params, a0, P0)
+    assert_almost_equal(res[0].sum(), naive[0], 8)
+    assert_almost_equal(res[5], naive[1], 8)
+    assert_almost_equal(res[6], naive[2], 8)
+    assert_almost_equal(mod.loglike(params, a0, P0), naive[0], 8)
+    a_smooth, P_smooth, llf = mod.kalmansmooth(params, a0, P0)
+    assert_almost_equal(llf, naive[0], 8)
+    assert_almost_equal(a_smooth, a_rts, 8)
+    assert_almost_equal(P_smooth, P_rts, 8)
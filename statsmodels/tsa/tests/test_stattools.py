@@ -1,5 +1,6 @@
 from statsmodels.tsa.stattools import (adfuller, acf, pacf_ols, pacf_yw,
-                                               pacf, grangercausalitytests, coint)
+                                               pacf, grangercausalitytests, coint,
+                                               acovf)
 
 import numpy as np
 from numpy.testing import assert_almost_equal
@@ -189,6 +190,42 @@ class TestPACF(CheckCorrGram):
         pacfld = pacf(self.x, nlags=40, method="ldu")
         assert_almost_equal(pacfyw, pacfld, DECIMAL_8)
 
+class TestCorrGram2d(object):
+    # columns of a 2d array give the same results as one series at a time
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(9876)
+        e = np.random.randn(300, 5)
+        x = e.copy()
+        for t in range(2, 300):
+            x[t] += np.array([.5, -.3, 0, .8, .1]) * x[t-1] + .1 * x[t-2]
+        cls.x = x
+
+    def test_acovf(self):
+        for unbiased in [False, True]:
+            res = acovf(self.x, unbiased=unbiased, fft=True)
+            res_nofft = acovf(self.x, unbiased=unbiased)
+            for i in range(5):
+                res1 = acovf(self.x[:, i], unbiased=unbiased)
+                assert_almost_equal(res[:, i], res1, DECIMAL_8)
+                assert_almost_equal(res_nofft[:, i], res1, DECIMAL_8)
+
+    def test_acf(self):
+        res = acf(self.x, nlags=20, qstat=True, alpha=.05, fft=True)
+        for i in range(5):
+            res1 = acf(self.x[:, i], nlags=20, qstat=True, alpha=.05)
+            for r, r1 in zip(res, res1):
+                assert_almost_equal(r[:, i], r1, DECIMAL_8)
+
+    def test_pacf(self):
+        for method in ['ols', 'yw', 'ywm', 'ldu', 'ldb']:
+            res, confint = pacf(self.x, nlags=20, method=method, alpha=.05)
+            for i in range(5):
+                res1, confint1 = pacf(self.x[:, i], nlags=20, method=method,
+                                      alpha=.05)
+                assert_almost_equal(res[:, i], res1, DECIMAL_8)
+                assert_almost_equal(confint[:, i], confint1, DECIMAL_8)
+
 class CheckCoint(object):
     """
     Test Cointegration Test Results for 2-variable system
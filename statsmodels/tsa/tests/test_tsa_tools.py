@@ -3,7 +3,8 @@
 '''
 
 import numpy as np
-from numpy.testing import assert_array_almost_equal, assert_equal
+from numpy.testing import (assert_array_almost_equal, assert_equal,
+                           assert_raises, assert_allclose)
 import statsmodels.api as sm
 import statsmodels.tsa.stattools as tsa
 import statsmodels.tsa.tsatools as tools
@@ -77,6 +78,56 @@ def test_vech():
                     [7, 8, 9]])
     assert(np.array_equal(vech(arr), [1, 4, 7, 5, 8, 9]))
 
+def test_solve_discrete_lyapunov():
+    np.random.seed(1234)
+    k = 6
+    a = np.random.randn(k, k)
+    a *= .98 / np.abs(np.linalg.eigvals(a)).max()
+    q = np.dot(*(2 * [np.random.randn(k, k)]))
+    x = tools.solve_discrete_lyapunov(a, q)
+    assert_array_almost_equal(x, np.dot(np.dot(a, x), a.T) + q, 8)
+    x_kron = np.linalg.solve(np.eye(k**2) - np.kron(a, a), vec(q))
+    assert_array_almost_equal(x, tools.unvec(x_kron), 8)
+    # complex step derivative with respect to a[0, 0]
+    da = np.zeros((k, k))
+    da[0, 0] = 1
+    dx = tools.solve_discrete_lyapunov(a + 1e-20j * da, q).imag / 1e-20
+    x_h = tools.solve_discrete_lyapunov(a + 1e-6 * da, q)
+    x_mh = tools.solve_discrete_lyapunov(a - 1e-6 * da, q)
+    # the entries of x are large, compare relative to them
+    assert_allclose(dx, (x_h - x_mh) / 2e-6, rtol=1e-6)
+    # non-stationary a falls back to the Kronecker product solution
+    a[0, 0] = 5.
+    x = tools.solve_discrete_lyapunov(a, q)
+    assert_array_almost_equal(x, np.dot(np.dot(a, x), a.T) + q, 6)
+
+
+def test_lagmat_both():
+    x = np.arange(30.).reshape(10, 3)
+    for original in ['ex', 'in', 'sep']:
+        res = tools.lagmat(x, 3, trim='both', original=original)
+        res_none = tools.lagmat(x, 3, trim='none', original=original)
+        if original == 'sep':
+            assert_equal(res[1], x[3:])
+            res, res_none = res[0], res_none[0]
+        assert_equal(res, res_none[3:10])
+        # a view for a single series
+        res_view = tools.lagmat(x[:, 1], 3, trim='both', original=original,
+                                view=True)
+        res = tools.lagmat(x[:, 1], 3, trim='both', original=original)
+        if original == 'sep':
+            assert_equal(res_view[1], res[1])
+            res_view, res = res_view[0], res[0]
+        assert_equal(res_view, res)
+        assert not res_view.flags.writeable
+        assert not res_view.flags.owndata
+    assert_raises(ValueError, tools.lagmat, x, 3, trim='both', view=True)
+    assert_raises(ValueError, tools.lagmat, x[:, 0], 3, view=True)
+    # the copy does not share memory with x
+    res = tools.lagmat(x[:, 0], 2, trim='both', original='in')
+    res[:] = 0
+    assert_equal(x[:, 0], np.arange(0, 30, 3))
+
 
 def test_add_lag_insert():
     data = sm.datasets.macrodata.load().data[['year','quarter','realgdp','cpi']]
@@ -1,5 +1,6 @@
 import numpy as np
 import numpy.lib.recfunctions as nprf
+from numpy.lib.stride_tricks import as_strided
 from statsmodels.tools.tools import add_constant
 
 def add_trend(X, trend="c", prepend=False):
@@ -120,7 +121,7 @@ def add_lag(x, col=None, lags=1, drop=False, insert=True):
 
         # make names for lags
         tmp_names = [col + '_'+'L(%i)' % i for i in range(1,lags+1)]
-        ndlags = lagmat(contemp, maxlag=lags, trim='Both')
+        ndlags = lagmat(contemp, maxlag=lags, trim='Both', view=True)
 
         # get index for return
         if insert is True:
@@ -182,7 +183,7 @@ def add_lag(x, col=None, lags=1, drop=False, insert=True):
                               " last position")
             ins_idx = insert
 
-        ndlags = lagmat(contemp, lags, trim='Both')
+        ndlags = lagmat(contemp, lags, trim='Both', view=True)
         first_cols = range(ins_idx)
         last_cols = range(ins_idx,x.shape[1])
         if drop:
@@ -234,7 +235,7 @@ def detrend(x, order=1, axis=0):
         return resid
 
 
-def lagmat(x, maxlag, trim='forward', original='ex'):
+def lagmat(x, maxlag, trim='forward', original='ex', view=False):
     '''create 2d array of lags
 
     Parameters
@@ -255,6 +256,10 @@ def lagmat(x, maxlag, trim='forward', original='ex'):
         * 'sep' : returns a tuple (original array, lagged values). The original
                   array is truncated to have the same number of rows as
                   the returned lagmat.
+    view : bool
+        If True, then a read-only view of x is returned instead of a copy,
+        which needs no memory for the lagged values. Requires trim='both'
+        and a single series. The dtype of x is not converted to float.
 
     Returns
     -------
@@ -288,6 +293,12 @@ def lagmat(x, maxlag, trim='forward', original='ex'):
        [ 0.,  0.,  5.,  6.,  3.,  4.],
        [ 0.,  0.,  0.,  0.,  5.,  6.]])
 
+    With trim='both' there is no zero padding, and row t of the lag matrix
+    is a strided view of x[t + maxlag - k] for lags k. The copy is made from
+    this view, and with view=True the view itself is returned. The view is a
+    2d array only for a single series, because the columns are ordered by lag
+    and then by variable.
+
     Notes
     -----
     TODO:
@@ -303,22 +314,40 @@ def lagmat(x, maxlag, trim='forward', original='ex'):
         dropidx = nvar
     if maxlag >= nobs:
         raise ValueError("maxlag should be < nobs")
-    lm = np.zeros((nobs+maxlag, nvar*(maxlag+1)))
-    for k in range(0, int(maxlag+1)):
-        lm[maxlag-k:nobs+maxlag-k, nvar*(maxlag-k):nvar*(maxlag-k+1)] = x
     if trim:
         trimlower = trim.lower()
     else:
         trimlower = trim
+    if trimlower == 'both':
+        maxlag = int(maxlag)
+        s0, s1 = x.strides
+        # lv[t, k, i] is x[t + maxlag - k, i]
+        lv = as_strided(x[maxlag:], shape=(nobs - maxlag, maxlag + 1, nvar),
+                        strides=(s0, -s0, s1))
+        lv = lv[:, dropidx // nvar:]
+        if view:
+            if nvar != 1:
+                raise ValueError("view=True requires a single series")
+            lm = lv[:, :, 0]
+            lm.flags.writeable = False
+        else:
+            lm = np.empty((len(lv), lv.shape[1] * nvar))
+            lm.reshape(lv.shape)[...] = lv
+        if original == 'sep':
+            return lm, x[maxlag:]
+        else:
+            return lm
+    elif view:
+        raise ValueError("view=True requires trim='both'")
+    lm = np.zeros((nobs+maxlag, nvar*(maxlag+1)))
+    for k in range(0, int(maxlag+1)):
+        lm[maxlag-k:nobs+maxlag-k, nvar*(maxlag-k):nvar*(maxlag-k+1)] = x
     if trimlower == 'none' or not trimlower:
         startobs = 0
         stopobs = len(lm)
     elif trimlower == 'forward':
         startobs = 0
         stopobs = nobs+maxlag-k
-    elif trimlower == 'both':
-        startobs = maxlag
-        stopobs = nobs+maxlag-k
     elif trimlower == 'backward':
         startobs = maxlag
         stopobs = len(lm)
@@ -359,14 +388,20 @@ def lagmat2ds(x, maxlag0, maxlagex=None, dropex=0, trim='forward'):
     Notes
     -----
     very inefficient for unequal lags, just done for convenience
+
+    With trim='both' the lags of each variable are views of x, and the only
+    copy is the returned array.
     '''
     if maxlagex is None:
         maxlagex = maxlag0
     maxlag = max(maxlag0, maxlagex)
     nobs, nvar = x.shape
-    lagsli = [lagmat(x[:,0], maxlag, trim=trim, original='in')[:,:maxlag0+1]]
+    view = bool(trim) and trim.lower() == 'both'
+    lagsli = [lagmat(x[:,0], maxlag, trim=trim, original='in',
+                     view=view)[:,:maxlag0+1]]
     for k in range(1,nvar):
-        lagsli.append(lagmat(x[:,k], maxlag, trim=trim, original='in')[:,dropex:maxlagex+1])
+        lagsli.append(lagmat(x[:,k], maxlag, trim=trim, original='in',
+                             view=view)[:,dropex:maxlagex+1])
     return np.column_stack(lagsli)
 
 def vec(mat):
@@ -453,6 +488,55 @@ def commutation_matrix(p, q):
     indices = np.arange(p * q).reshape((p, q), order='F')
     return K.take(indices.ravel(), axis=0)
 
+def solve_discrete_lyapunov(a, q, maxiter=100):
+    """
+    Solves the discrete Lyapunov equation x = a x a' + q
+
+    Parameters
+    ----------
+    a : ndarray
+        Square matrix with all eigenvalues inside the unit circle.
+    q : ndarray
+        Square matrix of the same shape as `a`.
+    maxiter : int, optional
+        The maximum number of doubling steps.
+
+    Returns
+    -------
+    x : ndarray
+        The solution, for example the unconditional covariance of a
+        stationary state vector with transition matrix `a` and innovation
+        covariance `q`.
+
+    Notes
+    -----
+    Uses the doubling algorithm, x = sum_k a^k q a'^k, where each step
+    doubles the number of terms, x_{j+1} = x_j + a_j x_j a_j' and
+    a_{j+1} = a_j a_j. Each step costs two matrix products, O(m^3), instead
+    of the O(m^6) solve with I - kron(a, a). Only the transpose and no
+    complex conjugate is used, so complex step derivatives work.
+
+    If the iterations do not converge, then the eigenvalues of `a` are not
+    inside the unit circle and the solution from the Kronecker product with
+    a pseudoinverse is returned.
+    """
+    a = np.asarray(a)
+    q = np.asarray(q)
+    a_j = a
+    x = q
+    for i in range(maxiter):
+        x = x + np.dot(np.dot(a_j, x), a_j.T)
+        a_j = np.dot(a_j, a_j)
+        # the remaining terms are of the order of a_j**2
+        amax = np.abs(a_j).max()
+        if amax <= 1e-8:
+            return x
+        elif not np.isfinite(amax):
+            break
+    m = a.shape[0]
+    x = np.dot(np.linalg.pinv(np.eye(m**2) - np.kron(a, a)), q.ravel('F'))
+    return x.reshape(m, m, order='F')
+
 def _ar_transparams(params):
     """
     Transforms params to induce stationarity/invertability.
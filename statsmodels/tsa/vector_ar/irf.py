@@ -266,9 +266,11 @@ class IRAnalysis(BaseIRAnalysis):
         return covs
 
     def errband_mc(self, orth=False, svar=False, repl=1000,
-                   signif=0.05, seed=None, burn=100):
+                   signif=0.05, seed=None, burn=100, n_jobs=1):
         """
         IRF Monte Carlo integrated error bands
+
+        n_jobs is only used for the VAR irfs, not with svar.
         """
         model = self.model
         periods = self.periods
@@ -279,7 +281,7 @@ class IRAnalysis(BaseIRAnalysis):
         else:
             return model.irf_errband_mc(orth=orth, repl=repl, T=periods,
                                         signif=signif, seed=seed,
-                                        burn=burn, cum=False)
+                                        burn=burn, cum=False, n_jobs=n_jobs)
     def err_band_sz1(self, orth=False, svar=False, repl=1000,
                      signif=0.05, seed=None, burn=100, component=None):
         """
@@ -625,14 +627,15 @@ class IRAnalysis(BaseIRAnalysis):
         return covs
 
     def cum_errband_mc(self, orth=False, repl=1000,
-                          signif=0.05, seed=None, burn=100):
+                          signif=0.05, seed=None, burn=100, n_jobs=1):
         """
         IRF Monte Carlo integrated error bands of cumulative effect
         """
         model = self.model
         periods = self.periods
         return model.irf_errband_mc(orth=orth, repl=repl,
-                                    T=periods, signif=signif, seed=seed, burn=burn, cum=True)
+                                    T=periods, signif=signif, seed=seed, burn=burn, cum=True,
+                                    n_jobs=n_jobs)
 
     def lr_effect_cov(self, orth=False):
         """
@@ -371,6 +371,45 @@ class TestVARResults(CheckIRF, CheckFEVD):
         model = VAR(self.model.endog)
         model.select_order()
 
+    def test_select_order_nested(self):
+        # one QR for all lag orders, same as one fit per lag order
+        selected = self.model.select_order(6, verbose=False)
+        ics = dict((k, []) for k in selected)
+        for p in range(7):
+            result = self.model._estimate_var(p, offset=6-p)
+            for k, v in result.info_criteria.iteritems():
+                ics[k].append(v)
+        for k, v in ics.iteritems():
+            assert_equal(selected[k], np.argmin(v))
+
+    def test_var_fit_batch(self):
+        sims = util.varsim_batch(self.res.coefs, self.res.intercept,
+                                 self.res.sigma_u, steps=150, repl=3,
+                                 random_state=987)
+        assert_equal(sims.shape, (3, 150, self.res.neqs))
+        coefs, sigma_u = model._var_fit_batch(sims, self.p)
+        for i in range(3):
+            res = VAR(sims[i]).fit(maxlags=self.p)
+            assert_almost_equal(coefs[i], res.coefs, DECIMAL_6)
+            assert_almost_equal(sigma_u[i], res.sigma_u, DECIMAL_6)
+        assert_almost_equal(model._ma_rep_batch(coefs, 5)[-1],
+                            res.ma_rep(5), DECIMAL_12)
+
+    def test_irf_errband_mc(self):
+        # reproducible from the seed, independent of the global random state
+        resim = self.res.irf_resim(orth=True, repl=150, T=5, seed=123)
+        assert_equal(resim.shape, (150, 6, self.res.neqs, self.res.neqs))
+        np.random.seed(0)
+        resim2 = self.res.irf_resim(orth=True, repl=150, T=5, seed=123)
+        assert_equal(resim, resim2)
+        lower, upper = self.res.irf_errband_mc(orth=True, repl=150, T=5,
+                                               seed=123)
+        resim.sort(axis=0)
+        assert_equal(lower, resim[3])
+        assert_equal(upper, resim[145])
+        irfs = self.res.orth_ma_rep(5)
+        assert_(((lower <= irfs) & (irfs <= upper)).mean() > .8)
+
     def test_is_stable(self):
         # may not necessarily be true for other datasets
         assert(self.res.is_stable(verbose=True))
@@ -21,9 +21,8 @@ def get_var_endog(y, lags, trend='c'):
 
     Ref: Lutkepohl p.70 (transposed)
     """
-    nobs = len(y)
-    # Ravel C order, need to put in descending order
-    Z = np.array([y[t-lags : t][::-1].ravel() for t in xrange(lags, nobs)])
+    # rows are [y_{t-1} ... y_{t-p}], one copy from a strided view of y
+    Z = tsa.lagmat(y, lags, trim='both')
 
     # Add constant, trend, etc.
     if trend != 'nc':
@@ -199,6 +198,51 @@ def varsim(coefs, intercept, sig_u, steps=100, initvalues=None, seed=None):
 
     return result
 
+def varsim_batch(coefs, intercept, sig_u, steps=100, repl=1,
+                 random_state=None):
+    """
+    Simulate repl independent paths of a VAR(p) process at once
+
+    Parameters
+    ----------
+    coefs : ndarray (p x k x k)
+    intercept : ndarray (k)
+    sig_u : ndarray (k x k)
+        white noise covariance, needs to be positive definite
+    steps : int
+        number of observations in each path, including the p zero starting
+        values
+    repl : int
+        number of paths
+    random_state : None, int or RandomState instance
+        source of the normal draws
+
+    Returns
+    -------
+    result : ndarray (repl x steps x k)
+
+    Notes
+    -----
+    The recursion loops over time only, each step updates all paths with one
+    matrix product.
+    """
+    if not isinstance(random_state, np.random.RandomState):
+        random_state = np.random.RandomState(random_state)
+    p, k, k = coefs.shape
+    # rows of ugen are u_t' with sig_u = P P'
+    chol_u = np.linalg.cholesky(sig_u)
+    ugen = np.dot(random_state.standard_normal((repl, steps, k)), chol_u.T)
+    result = np.zeros((repl, steps, k))
+    result[:, p:] = intercept + ugen[:, p:]
+
+    # add in AR terms
+    for t in xrange(p, steps):
+        ygen = result[:, t]
+        for j in xrange(p):
+            ygen += np.dot(result[:, t-j-1], coefs[j].T)
+
+    return result
+
 def get_index(lst, name):
     try:
         result = lst.index(name)
@@ -20,6 +20,7 @@ import scipy.linalg as L
 from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools.tools import chain_dot
 from statsmodels.tsa.tsatools import vec, unvec
+from statsmodels.tsa.stattools import _nested_ols
 
 from statsmodels.tsa.vector_ar.irf import IRAnalysis
 from statsmodels.tsa.vector_ar.output import VARSummary
@@ -268,6 +269,83 @@ def var_loglike(resid, omega, nobs):
     part2 = - (nobs / 2) * (logdet + neqs)
     return part1 + part2
 
+#-------------------------------------------------------------------------------
+# Monte Carlo replications of VAR(p) estimates, all replications at once
+
+# number of replications simulated together, bounds the memory of the
+# simulated paths and is the unit of work handed to parallel jobs
+_MC_CHUNK = 100
+
+def _batch_dot(a, b):
+    # stacked matrix product of (r x n x m) and (r x m x q), loops over m
+    out = a[:, :, :1] * b[:, :1, :]
+    for i in xrange(1, a.shape[2]):
+        out += a[:, :, i:i+1] * b[:, i:i+1, :]
+    return out
+
+def _var_fit_batch(y, lags):
+    """
+    OLS estimates of a VAR(p) with constant for stacked samples
+
+    Parameters
+    ----------
+    y : ndarray (r x T x k)
+    lags : int
+
+    Returns
+    -------
+    coefs : ndarray (r x p x k x k)
+    sigma_u : ndarray (r x k x k)
+        residual covariance with the same degrees of freedom correction as
+        VAR.fit
+    """
+    repl, nobs, neqs = y.shape
+    avobs = nobs - lags
+    # same column order as util.get_var_endog
+    z = np.concatenate([np.ones((repl, avobs, 1))] +
+                       [y[:, lags-j:nobs-j] for j in range(1, lags + 1)],
+                       axis=2)
+    y_sample = y[:, lags:]
+    zt = z.swapaxes(1, 2)
+    zz = _batch_dot(zt, z)
+    zy = _batch_dot(zt, y_sample)
+    # the systems are small, (k*p + 1) square
+    params = np.empty(zy.shape)
+    for i in xrange(repl):
+        params[i] = solve(zz[i], zy[i])
+    resid = y_sample - _batch_dot(z, params)
+    df_resid = avobs - (neqs * lags + 1)
+    sigma_u = _batch_dot(resid.swapaxes(1, 2), resid) / df_resid
+    coefs = params[:, 1:].reshape((repl, lags, neqs, neqs)).swapaxes(2, 3)
+    return coefs, sigma_u
+
+def _ma_rep_batch(coefs, maxn=10):
+    # ma_rep for stacked coefs (r x p x k x k)
+    repl, p, k, k = coefs.shape
+    phis = np.zeros((repl, maxn+1, k, k))
+    phis[:, 0] = np.eye(k)
+    for i in xrange(1, maxn + 1):
+        for j in xrange(1, min(i, p) + 1):
+            phis[:, i] += _batch_dot(phis[:, i-j], coefs[:, j-1])
+    return phis
+
+def _irf_mc_chunk(coefs, intercept, sigma_u, nobs, burn, T, orth, cum,
+                  repl, seed):
+    # simulate repl paths, refit the VAR and return the (cumulative) irfs
+    k_ar = len(coefs)
+    sim = util.varsim_batch(coefs, intercept, sigma_u, steps=nobs+burn,
+                            repl=repl, random_state=seed)
+    #discard burn observations to correct for starting bias
+    sim_coefs, sim_sigma_u = _var_fit_batch(sim[:, burn:], k_ar)
+    ma_coll = _ma_rep_batch(sim_coefs, maxn=T)
+    if orth:
+        for i in xrange(repl):
+            P = chol(sim_sigma_u[i])
+            ma_coll[i] = np.dot(ma_coll[i], P)
+    if cum:
+        ma_coll = ma_coll.cumsum(axis=1)
+    return ma_coll
+
 def _reordered(self, order):
     #Create new arrays to hold rearranged results from .fit()
     endog = self.endog
@@ -502,14 +580,28 @@ class VAR(tsbase.TimeSeriesModel):
         if maxlags is None:
             maxlags = int(round(12*(len(self.endog)/100.)**(1/4.)))
 
-        ics = defaultdict(list)
-        for p in range(maxlags + 1):
-            # exclude some periods to same amount of data used for each lag
-            # order
-            result = self._estimate_var(p, offset=maxlags-p)
+        # exclude some periods to same amount of data used for each lag
+        # order, then all lag orders are nested regressions on the columns
+        # of the largest design matrix, see VARResults.info_criteria
+        k_trend = util.get_trendorder('c')
+        neqs = self.neqs
+        z = util.get_var_endog(self.y, maxlags, trend='c')
+        y_sample = self.y[maxlags:]
+        nobs = len(y_sample)
+        lags = np.arange(maxlags + 1)
+        df_model = neqs * lags + k_trend
+        sse = _nested_ols(y_sample, z, df_model)[0]
 
-            for k, v in result.info_criteria.iteritems():
-                ics[k].append(v)
+        ics = defaultdict(list)
+        for p in lags:
+            free_params = p * neqs ** 2 + neqs * k_trend
+            ld = util.get_logdet(sse[p] / nobs)
+            ics['aic'].append(ld + (2. / nobs) * free_params)
+            ics['bic'].append(ld + (np.log(nobs) / nobs) * free_params)
+            ics['hqic'].append(ld + (2. * np.log(np.log(nobs)) / nobs) *
+                               free_params)
+            ics['fpe'].append(((nobs + df_model[p]) /
+                               (nobs - df_model[p])) ** neqs * np.exp(ld))
 
         selected_orders = dict((k, mat(v).argmin())
                                for k, v in ics.iteritems())
@@ -1053,9 +1145,28 @@ class VARResults(VARProcess):
         omegas = self._omega_forc_cov(steps)
         return mse + omegas / self.nobs
 
+    def _irf_mc_sim(self, orth, repl, T, seed, burn, cum, n_jobs):
+        # Monte Carlo replications of the irfs in chunks of _MC_CHUNK
+        # replications, each chunk seeded from seed so that the result does
+        # not depend on n_jobs
+        from statsmodels.tools.parallel import parallel_func
+        if not isinstance(seed, np.random.RandomState):
+            seed = np.random.RandomState(seed)
+        n_chunks = int(np.ceil(repl / float(_MC_CHUNK)))
+        seeds = seed.randint(np.iinfo(np.int32).max, size=n_chunks)
+        sizes = [min(_MC_CHUNK, repl - i * _MC_CHUNK) for i in range(n_chunks)]
+
+        parallel, p_func, n_jobs = parallel_func(_irf_mc_chunk, n_jobs,
+                                                 verbose=0)
+        chunks = parallel(p_func(self.coefs, self.intercept, self.sigma_u,
+                                 self.nobs, burn, T, orth, cum, size, s)
+                          for size, s in zip(sizes, seeds))
+        return np.concatenate(chunks, axis=0)
+
     #Monte Carlo irf standard errors
     def irf_errband_mc(self, orth=False, repl=1000, T=10,
-                       signif=0.05, seed=None, burn=100, cum=False):
+                       signif=0.05, seed=None, burn=100, cum=False,
+                       n_jobs=1):
         """
         Compute Monte Carlo integrated error bands assuming normally
         distributed for impulse response functions
@@ -1070,60 +1181,40 @@ class VARResults(VARProcess):
             number of impulse response periods
         signif: float (0 < signif <1)
             Significance level for error bars, defaults to 95% CI
-        seed: int
-            np.random.seed for replications
+        seed: None, int or RandomState instance
+            seed for the replications, the global numpy random state is not
+            used
         burn: int
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        n_jobs: int, default 1
+            number of jobs for the replications, see
+            `statsmodels.tools.parallel.parallel_func`. The result does not
+            depend on n_jobs.
 
         Notes
         -----
         Lutkepohl (2005) Appendix D
 
+        The replications are simulated and estimated in chunks of stacked
+        arrays instead of one VAR fit per replication.
+
         Returns
         -------
         Tuple of lower and upper arrays of ma_rep monte carlo standard errors
 
         """
-        neqs = self.neqs
-        mean = self.mean()
-        k_ar = self.k_ar
-        coefs = self.coefs
-        sigma_u = self.sigma_u
-        intercept = self.intercept
-        df_model = self.df_model
-        nobs = self.nobs
+        ma_coll = self._irf_mc_sim(orth, repl, T, seed, burn, cum, n_jobs)
 
-        ma_coll = np.zeros((repl, T+1, neqs, neqs))
-
-        if (orth == True and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == True and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T)
-        elif (orth == False and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == False and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T)
-
-        for i in range(repl):
-            #discard first hundred to eliminate correct for starting bias
-            sim = util.varsim(coefs, intercept, sigma_u, steps=nobs+burn)
-            sim = sim[burn:]
-            ma_coll[i,:,:,:] = fill_coll(sim)
-
-        ma_sort = np.sort(ma_coll, axis=0) #sort to get quantiles
+        ma_coll.sort(axis=0) #sort in place to get quantiles
         index = round(signif/2*repl)-1,round((1-signif/2)*repl)-1
-        lower = ma_sort[index[0],:, :, :]
-        upper = ma_sort[index[1],:, :, :]
+        lower = ma_coll[index[0],:, :, :].copy()
+        upper = ma_coll[index[1],:, :, :].copy()
         return lower, upper
 
     def irf_resim(self, orth=False, repl=1000, T=10,
-                      seed=None, burn=100, cum=False):
+                      seed=None, burn=100, cum=False, n_jobs=1):
 
         """
         Simulates impulse response function, returning an array of simulations.
@@ -1137,14 +1228,17 @@ class VARResults(VARProcess):
             number of Monte Carlo replications to perform
         T: int, default 10
             number of impulse response periods
-        signif: float (0 < signif <1)
-            Significance level for error bars, defaults to 95% CI
-        seed: int
-            np.random.seed for replications
+        seed: None, int or RandomState instance
+            seed for the replications, the global numpy random state is not
+            used
         burn: int
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        n_jobs: int, default 1
+            number of jobs for the replications, see
+            `statsmodels.tools.parallel.parallel_func`. The result does not
+            depend on n_jobs.
 
         Notes
         -----
@@ -1155,39 +1249,7 @@ class VARResults(VARProcess):
         Array of simulated impulse response functions
 
         """
-        neqs = self.neqs
-        mean = self.mean()
-        k_ar = self.k_ar
-        coefs = self.coefs
-        sigma_u = self.sigma_u
-        intercept = self.intercept
-        df_model = self.df_model
-        nobs = self.nobs
-        if seed is not None:
-            np.random.seed(seed=seed)
-
-        ma_coll = np.zeros((repl, T+1, neqs, neqs))
-
-        if (orth == True and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == True and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T)
-        elif (orth == False and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == False and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T)
-
-        for i in range(repl):
-            #discard first hundred to eliminate correct for starting bias
-            sim = util.varsim(coefs, intercept, sigma_u, steps=nobs+burn)
-            sim = sim[burn:]
-            ma_coll[i,:,:,:] = fill_coll(sim)
-
-        return ma_coll
+        return self._irf_mc_sim(orth, repl, T, seed, burn, cum, n_jobs)
 
 
     def _omega_forc_cov(self, steps):